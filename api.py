@@ -0,0 +1,186 @@
+"""
+Versioned JSON API (`/api/v1`) for users and their movies, and title
+suggestions for the add-movie form.
+
+Rows are serialized straight from the data manager's column queries,
+without ORM hydration or templates. Listings use the same keyset cursors
+as the HTML pages (`?after=`, `?before=`, `?limit=`) and accept
+`?fields=` to select columns. Bodies are streamed in chunks and encoded
+with orjson when it is installed, falling back to the standard json module.
+"""
+
+import json
+
+from flask import Blueprint, Response, abort, current_app, jsonify, request
+
+from datamanager.pagination import make_page, name_key, parse_page_args
+
+try:
+    import orjson
+
+    def dumps(value) -> bytes:
+        return orjson.dumps(value)
+except ImportError:
+    def dumps(value) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+api = Blueprint("api", __name__, url_prefix="/api/v1")
+
+USER_FIELDS = ("id", "name")
+MOVIE_FIELDS = ("id", "user_id", "name", "status", "director", "year",
+                "rating", "path")
+
+STREAM_CHUNK_ROWS = 500
+
+
+def get_fields(available: tuple) -> tuple:
+    """
+    Reads the `?fields=` selection of the current request.
+
+    Parameter:
+        available (tuple): The fields the resource has.
+
+    Returns:
+        tuple: The selected fields, all of them if none were requested.
+        400: If an unknown field is requested.
+    """
+    requested = request.args.get("fields")
+    if not requested:
+        return available
+
+    fields = tuple(field.strip() for field in requested.split(",")
+                   if field.strip())
+    unknown = set(fields) - set(available)
+    if unknown:
+        abort(400, description=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    return fields
+
+
+def get_page_args() -> tuple:
+    """
+    Reads the keyset pagination arguments of the current request.
+
+    Returns:
+        tuple: The `after` and `before` keys and the page size.
+        400: If a cursor is malformed.
+    """
+    try:
+        return parse_page_args(request.args, current_app.config["PAGE_SIZE"],
+                               current_app.config["API_MAX_PAGE_SIZE"])
+    except ValueError:
+        abort(400, description="Invalid cursor")
+
+
+def stream_page(rows: list, fields: tuple, getter, next_cursor: str | None,
+                prev_cursor: str | None) -> Response:
+    """
+    Streams a page as `{"items": [...], "next": ..., "prev": ...}`.
+
+    Parameters:
+        rows (list): The rows of the page.
+        fields (tuple): The fields to serialize.
+        getter (Callable): Returns a field of a row.
+        next_cursor (str | None): Cursor of the next page.
+        prev_cursor (str | None): Cursor of the previous page.
+
+    Returns:
+        Response: A chunked JSON response.
+    """
+
+    def generate():
+        yield b'{"items":['
+        for start in range(0, len(rows), STREAM_CHUNK_ROWS):
+            chunk = [{field: getter(row, field) for field in fields}
+                     for row in rows[start:start + STREAM_CHUNK_ROWS]]
+            encoded = dumps(chunk)[1:-1]
+            if start and encoded:
+                yield b","
+            yield encoded
+        yield b'],"next":' + dumps(next_cursor) + b',"prev":' \
+            + dumps(prev_cursor) + b"}"
+
+    return Response(generate(), mimetype="application/json")
+
+
+@api.route("/users")
+def list_users():
+    """
+    Lists one page of users.
+
+    Returns:
+        Response: `{"items": [{"id": ..., "name": ...}], "next", "prev"}`.
+    """
+    fields = get_fields(USER_FIELDS)
+    after, before, limit = get_page_args()
+
+    users = current_app.extensions["data_manager"].get_all_users(
+        after=after, before=before, limit=limit + 1)
+    page = make_page(users, limit, name_key,
+                     after=after, before=before)
+
+    return stream_page(page.items, fields, getattr, page.next_cursor,
+                       page.prev_cursor)
+
+
+@api.route("/users/<int:user_id>/movies")
+def list_user_movies(user_id: int):
+    """
+    Lists one page of a user's movies.
+
+    Parameter:
+        user_id (int): ID of the user.
+
+    Returns:
+        Response: `{"items": [{"id": ..., "name": ..., ...}], "next", "prev"}`.
+        404: If the user does not exist.
+    """
+    data_manager = current_app.extensions["data_manager"]
+    fields = get_fields(MOVIE_FIELDS)
+    after, before, limit = get_page_args()
+
+    rows = data_manager.get_user_movies(user_id, after=after, before=before,
+                                        limit=limit + 1)
+    if not rows and data_manager.get_user(user_id) is None:
+        abort(404, description="User not found")
+
+    page = make_page(rows, limit, name_key,
+                     after=after, before=before)
+
+    return stream_page(page.items, fields,
+                       lambda row, field: row._mapping[field],
+                       page.next_cursor, page.prev_cursor)
+
+
+@api.route("/suggest")
+def suggest_titles():
+    """
+    Suggests movie titles starting with `?q=`, from the in-memory title
+    index; never calls the OMDB API.
+
+    Returns:
+        Response: `{"items": ["title", ...]}`, at most `?limit=` titles.
+    """
+    prefix = request.args.get("q", "")
+    limit = request.args.get("limit", current_app.config["SUGGEST_LIMIT"],
+                             type=int)
+    limit = max(1, min(limit, current_app.config["SUGGEST_LIMIT"]))
+
+    titles = current_app.extensions["title_index"].suggest(prefix, limit)
+
+    return Response(dumps({"items": titles}), mimetype="application/json")
+
+
+@api.errorhandler(400)
+@api.errorhandler(404)
+def api_error(error):
+    """
+    Renders API errors as JSON.
+
+    Parameter:
+        error: The HTTP exception.
+
+    Returns:
+        Tuple[Response, int]: `{"error": ...}` and the status code.
+    """
+    return jsonify(error=error.description), error.code
@@ -1,86 +1,73 @@
-from dotenv import load_dotenv
+from models import CatalogMovie, Movie
+from omdb_client import get_default_client
 
-import requests
-import os
 
-from requests import RequestException
+class MovieNotFoundError(Exception):
+    """Raised when the OMDB API answers a title with `Response: False`."""
 
-from models import Movie
 
-MOVIE_API_URL = "https://www.omdbapi.com/"
+def fetch_movie_payload(movie_title: str) -> dict:
+    """
+    Fetches the raw OMDB API response for a movie title through the
+    shared, connection-pooled client.
 
+    Parameter:
+        movie_title (str): The title of the movie to search for.
+
+    Returns:
+        dict: The decoded JSON body returned by the API.
 
-def get_key() -> str:
+    Raises:
+        RequestException: If the request fails or returns a bad status.
+        ValueError: If the JSON response cannot be decoded.
     """
-    Retrieves the API key from the environment variables.
+    return get_default_client().fetch(movie_title)
 
-    Returns:
-        str: The API key for accessing the OMDB API.
+
+def parse_year(year: str) -> int:
     """
-    load_dotenv()
+    Parses the release year of an OMDB API response.
 
-    return os.getenv('key')
+    Parameter:
+        year (str): The `Year` field, e.g. '2010' or '2008–2013' for series.
 
+    Returns:
+        int: The first year, or 0 if the field has none.
+    """
+    digits = year[:4]
+    return int(digits) if digits.isdigit() else 0
 
-def get_parameters(movie_title: str) -> str:
+
+def catalog_movie_from_payload(payload: dict) -> CatalogMovie:
     """
-    Constructs the query parameters for the API request.
+    Maps a successful OMDB API response to a CatalogMovie object.
 
     Parameter:
-        movie_title (str): The title of the movie.
+        payload (dict): The decoded JSON body with `Response` set to 'True'.
 
     Returns:
-        str: The query parameters as a string.
+        CatalogMovie: A transient CatalogMovie containing the retrieved data.
     """
-    return f"?t={movie_title}&apikey="
+    rating_str = payload["imdbRating"]
+
+    return CatalogMovie(
+        imdb_id=payload["imdbID"],
+        title=payload["Title"],
+        director=payload["Director"],
+        year=parse_year(payload["Year"]),
+        rating=0.0 if rating_str == "N/A" else float(rating_str),
+        poster=payload["Poster"])
 
 
-def get_movie_data_from_api(movie_title: str) -> Movie:
+def movie_from_payload(payload: dict) -> Movie:
     """
-    Fetches movie data from the OMDB API and maps it to a Movie object.
+    Maps a successful OMDB API response to a Movie object.
 
     Parameter:
-        movie_title (str): The title of the movie to search for.
+        payload (dict): The decoded JSON body with `Response` set to 'True'.
 
     Returns:
-        Movie: A Movie object containing the retrieved data.
-
-    Raises:
-        RequestException: If the request fails.
-        ValueError: If the JSON response cannot be decoded or is invalid.
-        Exception: If the API response indicates failure or unexpected issues occur.
+        Movie: A transient Movie whose `catalog` holds the retrieved data.
     """
-    try:
-        response = requests.get(
-            MOVIE_API_URL + get_parameters(movie_title) + get_key(),
-            verify=True,  # verify SSL Certificates
-            timeout=5)  # 5 seconds timeout
-
-        response.raise_for_status()  # Raises HTTPError for bad responses
-
-        if response.status_code == 200:
-            if response.json()["Response"] == 'True':
-                movie = Movie()
-                movie.year = response.json()["Year"]
-
-                rating_str = response.json()["imdbRating"]
-
-                if rating_str == "N/A":
-                    movie.rating = 0.0
-                else:
-                    movie.rating = response.json()["imdbRating"]
-                movie.director = response.json()["Director"]
-                movie.path = response.json()["Poster"]
-                return movie
-            else:
-                raise Exception("Response is False")
-        else:
-            raise Exception("Status code is not 200")
-
-    except requests.exceptions.RequestException:
-        raise RequestException
-    except ValueError:
-        raise ValueError
-    except Exception:
-        raise Exception(
-            "Please check if the .env file exists or if the key exists.")
+    return Movie(catalog=catalog_movie_from_payload(payload))
+
@@ -5,34 +5,279 @@ Modules and Libraries Used:
 - pathlib
 - flask
 - flask_migrate
-- SQLiteDataManager
+- SQLiteDataManager, SQLAlchemyDataManager
 - models
 
 Application Configuration:
-- Database: SQLite database located at `instance/moviwebapp.db`.
+- Database: SQLite database at `DATABASE_PATH`, by default
+  `instance/moviwebapp.db`, or any other database at the SQLAlchemy URL
+  `DATABASE_URL`, e.g. PostgreSQL.
+- Read replicas: `DATABASE_REPLICAS` (files for SQLite, otherwise URLs)
+  serve the listings. For `DATABASE_REPLICA_LAG` seconds after a write
+  the writing client reads from the primary (a cookie), as does every
+  read of the written user or user list in the writing process.
+- OMDB cache: `OMDB_CACHE_TTL`, `OMDB_CACHE_NEGATIVE_TTL` (seconds) and
+  `OMDB_CACHE_MAX_ENTRIES`.
+- Connection pool: `DB_POOL_SIZE`, `DB_MAX_OVERFLOW` and `DB_POOL_TIMEOUT`.
+- SQLite PRAGMA profile: `SQLITE_PROFILE` (`performance` or `default`).
+- Listings: `PAGE_SIZE` rows per page by default, `MAX_PAGE_SIZE` at most.
+- OMDB client: `OMDB_API_URL`, `OMDB_TIMEOUT` (seconds) and
+  `OMDB_POOL_MAXSIZE` (keep-alive connections).
+- OMDB rate limit and circuit breaker: `OMDB_RATE_LIMIT_PER_DAY` requests
+  (the API key's quota; None disables the limit) in bursts of at most
+  `OMDB_RATE_BURST`; the circuit opens after `OMDB_BREAKER_THRESHOLD`
+  consecutive errors and probes again after `OMDB_BREAKER_RESET_TIMEOUT`
+  seconds.
+- Bulk import: `IMPORT_MAX_WORKERS` concurrent lookups, `IMPORT_MAX_TITLES`
+  titles per upload.
+- Search: `SEARCH_PAGE_SIZE` movies per result page.
+- Page cache: `PAGE_CACHE_MAX_ENTRIES` rendered pages per process, each
+  served until a write to its user or user list in any process, or for at
+  most `PAGE_CACHE_TTL` seconds.
+- Slow query log: off by default; set `SQL_SLOW_QUERY_MS` to log the
+  statements taking at least that many milliseconds.
+- N+1 detection: requests running more than `SQL_MAX_QUERIES_PER_REQUEST`
+  SQL statements are logged; None disables the check.
+- JSON API: at most `API_MAX_PAGE_SIZE` rows per `/api/v1` page.
+- Title suggestions: at most `SUGGEST_LIMIT` titles per lookup, from an
+  index reloaded after `SUGGEST_INDEX_MAX_AGE` seconds (None never).
+- Enrichment of added movies: `ENRICHMENT_MAX_WORKERS` concurrent lookups,
+  `ENRICHMENT_MAX_ATTEMPTS` attempts, retried after `ENRICHMENT_BACKOFF`
+  seconds doubling each time; due jobs are polled every
+  `ENRICHMENT_POLL_INTERVAL` seconds.
+- Poster thumbnails: cached in `POSTER_CACHE_DIR` up to
+  `POSTER_CACHE_MAX_BYTES`, `POSTER_WIDTH` pixels wide, fetched with a
+  `POSTER_TIMEOUT` (seconds) and cached by browsers for `POSTER_MAX_AGE`
+  seconds.
+- Warm startup: `PRECOMPILE_TEMPLATES` compiles every template when the app
+  is built instead of on its first request.
+
+The app is built by `create_app`. All settings are overridable through
+`FLASK_`-prefixed environment variables and the factory's `config`
+argument. In production it is served by preforked Gunicorn workers; see
+server.py.
 
 """
 
+import math
+import os
+import time
 from pathlib import Path
 
-from flask import request, render_template, Flask, redirect, url_for, abort
+import click
+from flask import request, render_template, Flask, redirect, url_for, abort, \
+    make_response, g, Response, Blueprint, current_app, send_file
+from requests import RequestException
+from werkzeug.local import LocalProxy
 
 from flask_migrate import Migrate
 
+import omdb_client
+from api import api
+from datamanager.data_manager_interface import DataManagerInterface
+from datamanager.pagination import make_page, name_key, parse_page_args, \
+    Page
+from datamanager.query_metrics import start_query_count
+from datamanager.sqlalchemy_data_manager import SQLAlchemyDataManager
 from datamanager.sqlite_data_manager import SQLiteDataManager
-from models import User, Movie
+from enrichment import EnrichmentWorker
+from metrics import REGISTRY, Histogram, CallbackGauge
+from models import db, User, Movie
+from movie_export import EXPORT_FORMATS
+from movie_import import parse_titles, import_titles
+from omdb_client import MOVIE_API_URL
+from page_cache import CachedPage, PageCache
+from poster_cache import PosterCache
+from server import serve
+from title_index import TitleIndex
 from marshmallow import Schema, fields, validate, ValidationError
 
 migrate = Migrate()
 
 db_path = Path(__file__).parent / "instance" / "moviwebapp.db"
+poster_path = Path(__file__).parent / "instance" / "posters"
+
+main = Blueprint("main", __name__, cli_group=None)
+
+# The running app's services, resolved per request or CLI command.
+data_manager = LocalProxy(lambda: current_app.extensions["data_manager"])
+page_cache = LocalProxy(lambda: current_app.extensions["page_cache"])
+enrichment_worker = LocalProxy(
+    lambda: current_app.extensions["enrichment_worker"])
+poster_cache = LocalProxy(lambda: current_app.extensions["poster_cache"])
+title_index = LocalProxy(lambda: current_app.extensions["title_index"])
+
+# Cookie holding until when a client that wrote reads from the primary.
+PRIMARY_COOKIE = "primary_until"
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Duration of HTTP requests, by method, route and status.",
+    labelnames=("method", "route", "status"))
+REQUEST_QUERIES = Histogram(
+    "http_request_queries",
+    "SQL statements run per HTTP request, by route.",
+    labelnames=("route",), buckets=(1, 2, 3, 5, 10, 20, 50, 100))
+CallbackGauge("omdb_cache_events",
+              "OMDB lookup cache counters and current size.",
+              lambda: data_manager.omdb_cache.stats(), labelname="event")
+CallbackGauge("page_cache_events",
+              "Rendered page cache counters and current size.",
+              lambda: page_cache.stats(), labelname="event")
+CallbackGauge("poster_cache_events",
+              "Poster thumbnail cache counters and current size in bytes.",
+              lambda: poster_cache.stats(), labelname="event")
+CallbackGauge("title_index_events",
+              "Title suggestion index counters and current size.",
+              lambda: title_index.stats(), labelname="event")
+
+
+def create_app(config: dict | None = None) -> Flask:
+    """
+    Builds the application: configuration, database, caches, enrichment
+    worker, routes and precompiled templates.
 
-app = Flask(__name__)
+    Parameter:
+        config (dict | None): Settings overriding the defaults and the
+            `FLASK_`-prefixed environment variables.
 
-data_manager = SQLiteDataManager(str(db_path))
+    Returns:
+        Flask: The configured application.
+    """
+    app = Flask(__name__)
+
+    app.config["DATABASE_PATH"] = str(db_path)
+    app.config["DATABASE_URL"] = None
+    app.config["DATABASE_REPLICAS"] = []
+    app.config["DATABASE_REPLICA_LAG"] = 5
+    app.config["OMDB_CACHE_TTL"] = 7 * 24 * 3600
+    app.config["OMDB_CACHE_NEGATIVE_TTL"] = 3600
+    app.config["OMDB_CACHE_MAX_ENTRIES"] = 1024
+    app.config["DB_POOL_SIZE"] = 5
+    app.config["DB_MAX_OVERFLOW"] = 10
+    app.config["DB_POOL_TIMEOUT"] = 30
+    app.config["SQLITE_PROFILE"] = "performance"
+    app.config["PAGE_SIZE"] = 50
+    app.config["MAX_PAGE_SIZE"] = 500
+    app.config["OMDB_API_URL"] = MOVIE_API_URL
+    app.config["OMDB_TIMEOUT"] = 5
+    app.config["OMDB_POOL_MAXSIZE"] = 10
+    app.config["OMDB_RATE_LIMIT_PER_DAY"] = 1000
+    app.config["OMDB_RATE_BURST"] = 10
+    app.config["OMDB_BREAKER_THRESHOLD"] = 5
+    app.config["OMDB_BREAKER_RESET_TIMEOUT"] = 30
+    app.config["IMPORT_MAX_WORKERS"] = 8
+    app.config["IMPORT_MAX_TITLES"] = 1000
+    app.config["SEARCH_PAGE_SIZE"] = 20
+    app.config["PAGE_CACHE_MAX_ENTRIES"] = 512
+    app.config["PAGE_CACHE_TTL"] = 60
+    app.config["SQL_SLOW_QUERY_MS"] = None
+    app.config["SQL_MAX_QUERIES_PER_REQUEST"] = 10
+    app.config["API_MAX_PAGE_SIZE"] = 5000
+    app.config["SUGGEST_LIMIT"] = 10
+    app.config["SUGGEST_INDEX_MAX_AGE"] = 300
+    app.config["ENRICHMENT_MAX_WORKERS"] = 4
+    app.config["ENRICHMENT_MAX_ATTEMPTS"] = 5
+    app.config["ENRICHMENT_BACKOFF"] = 2
+    app.config["ENRICHMENT_POLL_INTERVAL"] = 5
+    app.config["POSTER_CACHE_DIR"] = str(poster_path)
+    app.config["POSTER_CACHE_MAX_BYTES"] = 256 * 1024 * 1024
+    app.config["POSTER_WIDTH"] = 160
+    app.config["POSTER_TIMEOUT"] = 5
+    app.config["POSTER_MAX_AGE"] = 30 * 24 * 3600
+    app.config["PRECOMPILE_TEMPLATES"] = True
+    app.config.from_prefixed_env()
+    app.config.update(config or {})
+
+    app.config["SQLALCHEMY_DATABASE_URI"] = (
+        app.config["DATABASE_URL"]
+        or f"sqlite:///{app.config['DATABASE_PATH']}")
+
+    omdb_client.configure(
+        base_url=app.config["OMDB_API_URL"],
+        timeout=app.config["OMDB_TIMEOUT"],
+        pool_maxsize=app.config["OMDB_POOL_MAXSIZE"],
+        rate_limit_per_day=app.config["OMDB_RATE_LIMIT_PER_DAY"],
+        rate_burst=app.config["OMDB_RATE_BURST"],
+        breaker_threshold=app.config["OMDB_BREAKER_THRESHOLD"],
+        breaker_reset_timeout=app.config["OMDB_BREAKER_RESET_TIMEOUT"])
+
+    db.init_app(app)
+    migrate.init_app(app, db)
+
+    data_manager = create_data_manager(app.config)
+
+    page_cache = PageCache(max_entries=app.config["PAGE_CACHE_MAX_ENTRIES"],
+                           ttl=app.config["PAGE_CACHE_TTL"])
+    data_manager.add_write_listener(page_cache.invalidate)
+
+    app.extensions["data_manager"] = data_manager
+    app.extensions["page_cache"] = page_cache
+    app.extensions["enrichment_worker"] = EnrichmentWorker(
+        data_manager,
+        max_workers=app.config["ENRICHMENT_MAX_WORKERS"],
+        max_attempts=app.config["ENRICHMENT_MAX_ATTEMPTS"],
+        backoff=app.config["ENRICHMENT_BACKOFF"],
+        poll_interval=app.config["ENRICHMENT_POLL_INTERVAL"])
+    title_index = TitleIndex(data_manager.iter_titles,
+                             max_age=app.config["SUGGEST_INDEX_MAX_AGE"])
+    data_manager.add_title_listener(title_index.add)
+    app.extensions["title_index"] = title_index
+    app.extensions["poster_cache"] = PosterCache(
+        app.config["POSTER_CACHE_DIR"],
+        max_bytes=app.config["POSTER_CACHE_MAX_BYTES"],
+        width=app.config["POSTER_WIDTH"],
+        timeout=app.config["POSTER_TIMEOUT"])
+
+    app.register_blueprint(main)
+    app.register_blueprint(api)
+    app.teardown_appcontext(remove_session)
+
+    if app.config["PRECOMPILE_TEMPLATES"]:
+        precompile_templates(app)
+
+    return app
+
+
+def create_data_manager(config) -> DataManagerInterface:
+    """
+    Builds the data manager of the configured database: SQLite at
+    `DATABASE_PATH` unless a `DATABASE_URL` is set.
 
-app.config[
-    "SQLALCHEMY_DATABASE_URI"] = (f"sqlite:///{db_path}")
+    Parameter:
+        config (Config): The application's configuration.
+
+    Returns:
+        DataManagerInterface: The data manager.
+    """
+    options = dict(cache_ttl=config["OMDB_CACHE_TTL"],
+                   cache_negative_ttl=config["OMDB_CACHE_NEGATIVE_TTL"],
+                   cache_max_entries=config["OMDB_CACHE_MAX_ENTRIES"],
+                   pool_size=config["DB_POOL_SIZE"],
+                   max_overflow=config["DB_MAX_OVERFLOW"],
+                   pool_timeout=config["DB_POOL_TIMEOUT"],
+                   slow_query_ms=config["SQL_SLOW_QUERY_MS"],
+                   replicas=config["DATABASE_REPLICAS"],
+                   replica_lag=config["DATABASE_REPLICA_LAG"])
+
+    if config["DATABASE_URL"]:
+        return SQLAlchemyDataManager(config["DATABASE_URL"], **options)
+
+    return SQLiteDataManager(config["DATABASE_PATH"],
+                             sqlite_profile=config["SQLITE_PROFILE"],
+                             **options)
+
+
+def precompile_templates(app: Flask) -> None:
+    """
+    Compiles every template into the Jinja cache, so the first request
+    of a worker does not pay for it.
+
+    Parameter:
+        app (Flask): The application whose templates to compile.
+    """
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
 
 
 class MovieSchemaUpdate(Schema):
@@ -59,7 +304,225 @@ movie_schema_update = MovieSchemaUpdate()
 user_movie_schema = UserMovieSchema()
 
 
-@app.route('/')
+@main.before_app_request
+def start_timer():
+    """Records the start time of the request and counts its queries."""
+    g.request_start = time.perf_counter()
+    g.query_count = start_query_count()
+
+
+@main.before_app_request
+def route_reads():
+    """
+    Sends the reads of a client that wrote within the replica lag to the
+    primary, so it sees its own writes whichever process serves it.
+    """
+    try:
+        g.primary_until = float(request.cookies.get(PRIMARY_COOKIE, 0))
+    except ValueError:
+        g.primary_until = 0.0
+    data_manager.stick_to_primary(g.primary_until)
+
+
+@main.after_app_request
+def remember_writes(response):
+    """
+    Tells the client to read from the primary for a while after the request
+    wrote.
+
+    Parameter:
+        response: The response about to be sent.
+
+    Returns:
+        Response: The response, with the primary cookie if the request wrote.
+    """
+    until = data_manager.primary_until()
+    if data_manager.replica_engines and until > g.get("primary_until", 0):
+        response.set_cookie(
+            PRIMARY_COOKIE, f"{until:.3f}", httponly=True, samesite="Lax",
+            max_age=math.ceil(current_app.config["DATABASE_REPLICA_LAG"]))
+    return response
+
+
+@main.before_app_request
+def start_enrichment_worker():
+    """
+    Starts the enrichment worker with the first request, so CLI commands
+    such as `flask db upgrade` do not run it.
+    """
+    enrichment_worker.start()
+
+
+@main.after_app_request
+def record_latency(response):
+    """
+    Records the request's duration in the latency histogram.
+
+    Parameter:
+        response: The response about to be sent.
+
+    Returns:
+        Response: The unchanged response.
+    """
+    if "request_start" in g:
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        REQUEST_DURATION.observe(time.perf_counter() - g.request_start,
+                                 method=request.method, route=route,
+                                 status=response.status_code)
+        check_query_count(route, g.query_count.value)
+    return response
+
+
+def check_query_count(route: str, queries: int) -> None:
+    """
+    Records how many SQL statements a request ran and warns about likely
+    N+1 query patterns.
+
+    Parameters:
+        route (str): The request's URL rule.
+        queries (int): The statements it ran.
+    """
+    REQUEST_QUERIES.observe(queries, route=route)
+
+    limit = current_app.config["SQL_MAX_QUERIES_PER_REQUEST"]
+    if limit is not None and queries > limit:
+        current_app.logger.warning(
+            "Possible N+1 queries: %s ran %d SQL statements (limit %d)",
+            request.path, queries, limit)
+
+
+def remove_session(exception=None):
+    """
+    Releases the request's database session back to the pool.
+
+    Parameter:
+        exception: The unhandled exception of the request, if any.
+    """
+    data_manager.close()
+
+
+def get_page_args() -> tuple[tuple | None, tuple | None, int]:
+    """
+    Reads the keyset pagination arguments of the current request.
+
+    Returns:
+        tuple: The `after` and `before` keys and the page size.
+        400: If a cursor is malformed.
+    """
+    try:
+        return parse_page_args(request.args, current_app.config["PAGE_SIZE"],
+                               current_app.config["MAX_PAGE_SIZE"])
+    except ValueError:
+        abort(400)
+
+
+def get_users_page() -> Page:
+    """
+    Fetches the page of users selected by the request's query string.
+
+    Returns:
+        Page: The users of the page with its navigation cursors.
+    """
+    after, before, limit = get_page_args()
+
+    users = data_manager.get_all_users(after=after, before=before,
+                                       limit=limit + 1)
+
+    return make_page(users, limit, name_key,
+                     after=after, before=before)
+
+
+def get_page_stats(page: Page) -> dict:
+    """
+    Fetches the statistics of the users on a page.
+
+    Parameter:
+        page (Page): A page of users.
+
+    Returns:
+        dict: UserStatsSummary by user ID.
+    """
+    return data_manager.get_user_stats([user.id for user in page.items])
+
+
+def cached_page(scope: tuple, render):
+    """
+    Serves a page from the page cache, rendering it on a miss, and answers
+    conditional requests with 304 Not Modified. The scope's generation is
+    read from the database, so writes served by other processes count.
+
+    A client that wrote within the replica lag always gets a fresh render
+    from the primary. Pages rendered within the replica lag of their
+    scope's last write may come from a replica missing it, and are not
+    cached.
+
+    Parameters:
+        scope (tuple): The page's cache scope.
+        render (Callable[[], str]): Renders the page.
+
+    Returns:
+        Response: The page, or an empty 304 response.
+    """
+    key = request.full_path
+    generation, modified_at = data_manager.get_page_generation(scope)
+    page = None
+    if g.get("primary_until", 0) <= time.time():
+        page = page_cache.get(scope, key, generation)
+
+    if page is None:
+        page = page_cache.put(scope, key, render(), generation, modified_at,
+                              store=data_manager.replicas_current(modified_at))
+
+    return set_validators(make_response(page.body), page) \
+        .make_conditional(request)
+
+
+def set_validators(response, page: CachedPage):
+    """
+    Sets a cached page's ETag and Last-Modified on its response and makes
+    browsers revalidate it on every use. Shared with the ASGI app.
+
+    Parameters:
+        response: The Flask or Quart response of the page.
+        page (CachedPage): The page.
+
+    Returns:
+        The response.
+    """
+    response.set_etag(page.etag)
+    response.last_modified = page.last_modified
+    response.cache_control.no_cache = True
+    return response
+
+
+def render_users(message: str | None = None) -> str:
+    """
+    Renders the page of users selected by the request's query string.
+
+    Parameter:
+        message (str | None): The notice to show above the list.
+
+    Returns:
+        str: Rendered `users.html` template.
+    """
+    page = get_users_page()
+    return render_template('users.html', users=page.items, page=page,
+                           stats=get_page_stats(page), message=message)
+
+
+@main.route('/metrics')
+def metrics():
+    """
+    Exposes request, SQL, OMDB and cache metrics.
+
+    Returns:
+        Response: The metrics in the Prometheus text exposition format.
+    """
+    return REGISTRY.render(), 200, {
+        "Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+
+@main.route('/')
 def index():
     """
     Renders the home page.
@@ -70,27 +533,27 @@ def index():
     return render_template('index.html')
 
 
-@app.route('/users')
+@main.route('/users')
 def list_users():
     """
-    Lists all users.
+    Lists one page of users, selected with `?after=`/`?before=` cursors
+    and `?limit=`.
 
     Returns:
         str: Rendered `users.html` template with user data.
         500: Error page if data retrieval fails.
     """
     try:
-        users = data_manager.get_all_users()
+        return cached_page(("users",), render_users)
     except IOError as e:
         return "Error getting all users", 500
 
-    return render_template('users.html', users=users)
-
 
-@app.route('/users/<int:user_id>', methods=['GET'])
+@main.route('/users/<int:user_id>', methods=['GET'])
 def get_users_favorite_movies(user_id: int):
     """
-    Displays a user's favorite movies.
+    Displays one page of a user's favorite movies, selected with
+    `?after=`/`?before=` cursors and `?limit=`.
 
     Parameter:
         user_id (int): ID of the user.
@@ -100,26 +563,92 @@ def get_users_favorite_movies(user_id: int):
         404: If user or movies are not found.
         500: If data retrieval fails.
     """
-    try:
-        result = data_manager.get_user_movies(user_id)
+    after, before, limit = get_page_args()
+
+    def render():
+        result = data_manager.get_user_movies(user_id, after=after,
+                                              before=before,
+                                              limit=limit + 1)
+        page = make_page(result, limit, name_key,
+                         after=after, before=before)
 
         user = data_manager.get_user(user_id)
 
-        if not result:
-            return render_template('user-movies.html', result=[],
-                                   username=user)
+        return render_template('user-movies.html', result=page.items,
+                               username=user, page=page)
 
-        return render_template('user-movies.html', result=result,
-                               username=user)
+    try:
+        return cached_page(("user", user_id), render)
     except IOError as e:
-        print(e)
+        current_app.logger.error("Error getting movies of user %s: %s",
+                                 user_id, e)
         abort(500)
     except IndexError as e:
-        print(e)
+        current_app.logger.error("Error getting movies of user %s: %s",
+                                 user_id, e)
         abort(500)
 
 
-@app.route('/add_user', methods=['GET', 'POST'])
+@main.route('/posters/<int:movie_id>')
+def poster(movie_id: int):
+    """
+    Serves a movie's poster as a locally cached thumbnail.
+
+    Parameter:
+        movie_id (int): ID of the movie.
+
+    Returns:
+        Response: The thumbnail, or an empty 304 response if the client
+            has it.
+        Redirect: Redirects to the remote poster if it cannot be cached.
+        404: If the movie does not exist or has no poster.
+    """
+    movie = data_manager.get_movie(movie_id)
+    if movie is None or not movie.path or movie.path == "N/A":
+        abort(404)
+
+    try:
+        cached = poster_cache.get(movie.path)
+    except (RequestException, ValueError, OSError) as e:
+        current_app.logger.warning("Error caching poster of movie %s: %s",
+                                   movie_id, e)
+        return redirect(movie.path)
+
+    response = send_file(cached.path, mimetype=cached.mimetype,
+                         etag=cached.digest, conditional=True,
+                         max_age=current_app.config["POSTER_MAX_AGE"])
+    response.cache_control.public = True
+    return response
+
+
+@main.route('/search')
+def search():
+    """
+    Searches users by name prefix and movies by title and director, with
+    prefix matching on every word of `?q=`. Movies are ranked by relevance
+    and paginated with `?page=`.
+
+    Returns:
+        str: Rendered `search.html` template with the matches.
+        500: If the search fails.
+    """
+    query = request.args.get("q", "").strip()
+    page = max(1, request.args.get("page", 1, type=int))
+    limit = current_app.config["SEARCH_PAGE_SIZE"]
+
+    try:
+        movies = data_manager.search(query, limit=limit + 1,
+                                     offset=(page - 1) * limit)
+        users = data_manager.search_users(query) if page == 1 else []
+    except IOError as e:
+        abort(500)
+
+    return render_template('search.html', query=query, users=users,
+                           movies=movies[:limit], page=page,
+                           has_next=len(movies) > limit)
+
+
+@main.route('/add_user', methods=['GET', 'POST'])
 def add_user():
     """
     Adds a new user.
@@ -151,65 +680,215 @@ def add_user():
 
 def show_all_users(message: str):
     try:
-        users = data_manager.get_all_users()
+        return render_users(message)
     except IOError as e:
         return "Error getting all users", 500
-    return render_template('users.html',
-                           users=users,
-                           message=message)
 
 
-@app.route('/users/<int:user_id>/add_movie', methods=['GET', 'POST'])
+@main.route('/users/<int:user_id>/add_movie', methods=['GET', 'POST'])
 def add_movie(user_id: int):
     """
     Adds a movie to a user's favorite list.
 
+    Films missing from the catalogue are saved as pending and looked up
+    by the enrichment worker, so the request never waits for the OMDB API.
+
     Parameter:
         user_id (int): ID of the user.
 
     Returns:
         str: Rendered `add-movie.html` template for GET request.
-        Redirect: Redirects to home page on successful POST.
+        Redirect: Redirects to the user's movies on successful POST.
         500: If movie addition fails.
     """
     if request.method == 'POST':
         result = user_movie_schema.load(request.form)
         name = result['name']
 
-        try:
-            movie = data_manager.get_user_from_api(name)
-        except IOError as e:
-            return show_all_users("no_exist_movie")
-        except Exception as e:
-            return show_all_users("no_exist_movie")
-
-        if not movie:
-            return show_all_users("no_exist_movie")
-
-        movie.user_id = user_id
-        movie.name = name
+        movie = data_manager.get_catalog_movie(name)
 
         try:
-            data_manager.add_movie(movie)
-            user = data_manager.get_user(user_id)
+            if movie is None:
+                # Unknown film: save it now, look it up in the background.
+                movie = Movie(user_id=user_id, name=name)
+                data_manager.add_pending_movie(movie)
+                enrichment_worker.wake()
+            else:
+                movie.user_id = user_id
+                movie.name = name
+                data_manager.add_movie(movie)
 
             return redirect(
-                url_for('get_users_favorite_movies', user_id=user_id,
-                        username=user))
+                url_for('.get_users_favorite_movies', user_id=user_id))
         except IOError as e:
             return show_all_users("False")
     else:
+        return render_template('add-movie.html', user_id=user_id)
+
+
+@main.route('/users/<int:user_id>/import_movies', methods=['GET', 'POST'])
+def import_movies(user_id: int):
+    """
+    Imports a JSON or CSV list of movie titles into a user's favorite list.
+
+    Parameter:
+        user_id (int): ID of the user.
+
+    Returns:
+        str: Rendered `import-movies.html` template, with the per-title
+        results after a POST.
+        404: If the user does not exist.
+    """
+    user = data_manager.get_user(user_id)
+    if user is None:
+        abort(404)
+
+    if request.method == 'POST':
+        upload = request.files.get("file")
+        if upload is None or not upload.filename:
+            return render_template('import-movies.html', username=user,
+                                   message="no_file")
+
         try:
-            users = data_manager.get_all_users()
-        except IOError as e:
-            abort(500)
+            titles = parse_titles(upload.read().decode("utf-8-sig"),
+                                  upload.filename)
+        except ValueError as e:
+            return render_template('import-movies.html', username=user,
+                                   message="invalid_file")
+
+        # The lookups run on worker threads, outside the app context.
+        results = import_titles(
+            data_manager._get_current_object(), user_id,
+            titles[:current_app.config["IMPORT_MAX_TITLES"]],
+            max_workers=current_app.config["IMPORT_MAX_WORKERS"])
+
+        return render_template('import-movies.html', username=user,
+                               results=results)
+
+    return render_template('import-movies.html', username=user)
+
+
+@main.cli.command("import-movies")
+@click.argument("user_id", type=int)
+@click.argument("file", type=click.File("r", encoding="utf-8-sig"))
+@click.option("--workers", type=int, default=None,
+              help="Concurrent OMDB lookups (default: IMPORT_MAX_WORKERS).")
+def import_movies_command(user_id: int, file, workers: int | None):
+    """
+    Imports a JSON or CSV list of movie titles into a user's favorite list.
+    """
+    if data_manager.get_user(user_id) is None:
+        raise click.BadParameter(f"No user with id {user_id}",
+                                 param_hint="USER_ID")
+
+    results = import_titles(
+        data_manager._get_current_object(), user_id, parse_titles(file.read(), file.name),
+        max_workers=workers or current_app.config["IMPORT_MAX_WORKERS"])
 
-        return render_template('add-movie.html', users=users,
-                               user_id=user_id)
+    for result in results:
+        click.echo(f"{result.status:>9}  {result.title}  {result.detail}")
 
 
-@app.route('/users/<int:user_id>/update_movie/<int:movie_id>',
-           methods=['GET', 'POST'])
+@main.route('/users/<int:user_id>/export')
+def export_movies(user_id: int):
+    """
+    Downloads a user's whole library as `?format=csv` (default) or
+    `?format=jsonl`, streamed with chunked transfer encoding.
+
+    Parameter:
+        user_id (int): ID of the user.
+
+    Returns:
+        Response: The streamed export as an attachment.
+        400: If the format is unknown.
+        404: If the user does not exist.
+    """
+    export_format = request.args.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        abort(400)
+
+    if data_manager.get_user(user_id) is None:
+        abort(404)
+
+    encode, mimetype = EXPORT_FORMATS[export_format]
+
+    return Response(
+        encode(data_manager.iter_user_movies(user_id)), mimetype=mimetype,
+        headers={"Content-Disposition": "attachment; filename="
+                 f"user-{user_id}-movies.{export_format}"})
+
+
+@main.cli.command("export-movies")
+@click.argument("user_id", type=int)
+@click.option("--format", "export_format", default="csv",
+              type=click.Choice(list(EXPORT_FORMATS)))
+@click.option("--output", type=click.File("w", encoding="utf-8"),
+              default="-", help="File to write to (default: stdout).")
+def export_movies_command(user_id: int, export_format: str, output):
+    """
+    Exports a user's whole library as CSV or JSON lines.
+    """
+    if data_manager.get_user(user_id) is None:
+        raise click.BadParameter(f"No user with id {user_id}",
+                                 param_hint="USER_ID")
+
+    encode, _ = EXPORT_FORMATS[export_format]
+    for chunk in encode(data_manager.iter_user_movies(user_id)):
+        output.write(chunk)
+
+
+@main.cli.command("init-db")
+def init_db_command():
+    """
+    Creates the schema of the `DATABASE_URL` database.
+
+    SQLite databases are created with `flask db upgrade` instead, which
+    also sets up full-text search and the statistics triggers.
+    """
+    if not current_app.config["DATABASE_URL"]:
+        raise click.UsageError("Use `flask db upgrade` for SQLite databases.")
+
+    data_manager.create_schema()
+    click.echo("Schema created.")
+
+
+@main.cli.command("rebuild-user-stats")
+@click.option("--check", is_flag=True,
+              help="Only report users with wrong statistics.")
+def rebuild_user_stats_command(check: bool):
+    """
+    Recomputes the user statistics from the movies.
+
+    Exits with status 1 if `--check` finds wrong statistics.
+    """
+    drifted = data_manager.rebuild_user_stats(check_only=check)
+
+    if drifted:
+        click.echo(f"Out of date: {len(drifted)} users "
+                   f"({', '.join(map(str, drifted[:20]))}"
+                   f"{', ...' if len(drifted) > 20 else ''})")
+    else:
+        click.echo("All user statistics are up to date")
+
+    if check and drifted:
+        click.get_current_context().exit(1)
+
+
+@main.cli.command("serve")
+@click.option("--bind", default="0.0.0.0:5000", show_default=True)
+@click.option("--workers", type=int, default=2 * os.cpu_count() + 1,
+              help="Worker processes (default: two per CPU plus one).")
+@click.option("--threads", type=int, default=4, show_default=True,
+              help="Threads per worker process.")
+def serve_command(bind: str, workers: int, threads: int):
+    """
+    Serves the app with preforked Gunicorn workers.
+    """
+    serve(current_app._get_current_object(), bind, workers, threads)
+
+
+@main.route('/users/<int:user_id>/update_movie/<int:movie_id>',
+            methods=['GET', 'POST'])
 def update_movie(user_id: int, movie_id: int):
     """
      Updates a movie's details.
@@ -243,10 +922,10 @@ def update_movie(user_id: int, movie_id: int):
         except IOError as e:
             abort(500)
 
-        return redirect(url_for('get_users_favorite_movies', user_id=user_id))
+        return redirect(url_for('.get_users_favorite_movies', user_id=user_id))
 
     try:
-        return_movie = data_manager.get_movie(movie_id)
+        return_movie = data_manager.get_movie(movie_id, user_id=user_id)
     except IOError as e:
         abort(500)
 
@@ -254,7 +933,7 @@ def update_movie(user_id: int, movie_id: int):
                            user_id=user_id)
 
 
-@app.route('/users/<int:user_id>/delete_movie/<int:movie_id>')
+@main.route('/users/<int:user_id>/delete_movie/<int:movie_id>')
 def delete(user_id: int, movie_id: int):
     """
     Deletes a movie from a user's favorite list.
@@ -268,15 +947,63 @@ def delete(user_id: int, movie_id: int):
         500: If movie deletion fails.
     """
     try:
-        data_manager.delete_movies(movie_id)
+        data_manager.delete_movies(movie_id, user_id=user_id)
     except IOError as e:
         abort(500)
 
     return redirect(
-        url_for('get_users_favorite_movies', user_id=user_id))
+        url_for('.get_users_favorite_movies', user_id=user_id))
+
+
+@main.route('/users/<int:user_id>/delete_movies', methods=['POST'])
+def delete_selected(user_id: int):
+    """
+    Deletes the movies checked on a user's page (`movie_ids`), or the
+    whole library if `all` is set, with one DELETE statement.
+
+    Parameter:
+        user_id (int): ID of the user.
+
+    Returns:
+        Redirect: Redirects to the user's movies on successful deletion.
+        500: If movie deletion fails.
+    """
+    try:
+        if request.form.get("all"):
+            data_manager.delete_user_movies(user_id)
+        else:
+            data_manager.delete_movies(
+                request.form.getlist("movie_ids", type=int), user_id=user_id)
+    except IOError as e:
+        abort(500)
+
+    return redirect(
+        url_for('.get_users_favorite_movies', user_id=user_id))
+
+
+@main.route('/users/<int:user_id>/delete', methods=['POST'])
+def delete_user(user_id: int):
+    """
+    Deletes a user together with their movies.
+
+    Parameter:
+        user_id (int): ID of the user.
+
+    Returns:
+        Redirect: Redirects to the user list on successful deletion.
+        404: If the user does not exist.
+        500: If user deletion fails.
+    """
+    try:
+        if not data_manager.delete_user(user_id):
+            abort(404)
+    except IOError as e:
+        abort(500)
+
+    return redirect(url_for('.list_users'))
 
 
-@app.errorhandler(404)
+@main.app_errorhandler(404)
 def page_not_found(error):
     """
     Renders a custom 404 error page.
@@ -290,7 +1017,7 @@ def page_not_found(error):
     return render_template('404.html'), 404
 
 
-@app.errorhandler(500)
+@main.app_errorhandler(500)
 def page_not_found(error):
     """
     Renders a custom 500 error page.
@@ -310,4 +1037,4 @@ if __name__ == '__main__':
 
     The application is hosted on `0.0.0.0:5000` with debug mode enabled.
     """
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    create_app().run(host="0.0.0.0", port=5000, debug=True)
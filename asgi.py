@@ -0,0 +1,317 @@
+"""
+ASGI entry point of MovieWebApp.
+
+The I/O-heavy routes (home page, user list, user movies and adding a
+movie) are served by an async Quart app backed by AsyncSQLiteDataManager,
+so a request waiting on the database holds no OS thread. Every other route
+is passed through to the Flask app unchanged. Both apps run in one process
+and share the configuration, templates, page cache, enrichment worker and
+metrics. It supports the SQLite backend only.
+
+Usage:
+    hypercorn asgi:application --bind 0.0.0.0:5000
+"""
+
+import asyncio
+import time
+
+from asgiref.wsgi import WsgiToAsgi
+from quart import Blueprint, Quart, abort, g, make_response, redirect, \
+    render_template, request, url_for
+from werkzeug.exceptions import MethodNotAllowed, NotFound
+
+import app as wsgi
+import server
+from datamanager.async_sqlite_data_manager import AsyncSQLiteDataManager
+from datamanager.pagination import Page, make_page, name_key, \
+    parse_page_args
+from models import Movie
+
+flask_app = wsgi.create_app()
+config = flask_app.config
+if config["DATABASE_URL"]:
+    # AsyncSQLiteDataManager would read a different database than the
+    # Flask app writes to.
+    raise RuntimeError("The ASGI app supports SQLite only; serve "
+                       "DATABASE_URL databases with Gunicorn.")
+page_cache = flask_app.extensions["page_cache"]
+enrichment_worker = flask_app.extensions["enrichment_worker"]
+
+async_app = Quart(__name__)
+# Named like the Flask blueprint, so the shared templates' endpoints resolve.
+main = Blueprint("main", __name__)
+
+data_manager = AsyncSQLiteDataManager(
+    config["DATABASE_PATH"],
+    pool_size=config["DB_POOL_SIZE"],
+    max_overflow=config["DB_MAX_OVERFLOW"],
+    pool_timeout=config["DB_POOL_TIMEOUT"],
+    sqlite_profile=config["SQLITE_PROFILE"],
+    slow_query_ms=config["SQL_SLOW_QUERY_MS"])
+data_manager.add_write_listener(page_cache.invalidate)
+data_manager.add_title_listener(flask_app.extensions["title_index"].add)
+
+
+@async_app.before_serving
+async def start_enrichment_worker():
+    """Starts the enrichment worker with the server."""
+    enrichment_worker.start()
+
+
+@async_app.before_serving
+async def warm_title_index():
+    """Loads the title suggestion index before the first request."""
+    await asyncio.to_thread(server.warm_up, flask_app)
+
+
+@async_app.after_serving
+async def close_database():
+    """Closes the async engine's connections."""
+    await data_manager.dispose()
+
+
+@async_app.before_request
+async def start_timer():
+    """Records the start time of the request."""
+    g.request_start = time.perf_counter()
+
+
+@async_app.after_request
+async def record_latency(response):
+    """
+    Records the request's duration in the shared latency histogram.
+
+    Parameter:
+        response: The response about to be sent.
+
+    Returns:
+        Response: The unchanged response.
+    """
+    if "request_start" in g:
+        route = request.url_rule.rule if request.url_rule else "<unmatched>"
+        wsgi.REQUEST_DURATION.observe(time.perf_counter() - g.request_start,
+                                      method=request.method, route=route,
+                                      status=response.status_code)
+    return response
+
+
+def get_page_args() -> tuple[tuple | None, tuple | None, int]:
+    """
+    Reads the keyset pagination arguments of the current request.
+
+    Returns:
+        tuple: The `after` and `before` keys and the page size.
+        400: If a cursor is malformed.
+    """
+    try:
+        return parse_page_args(request.args, config["PAGE_SIZE"],
+                               config["MAX_PAGE_SIZE"])
+    except ValueError:
+        abort(400)
+
+
+async def get_users_page() -> Page:
+    """
+    Fetches the page of users selected by the request's query string.
+
+    Returns:
+        Page: The users of the page with its navigation cursors.
+    """
+    after, before, limit = get_page_args()
+
+    users = await data_manager.get_all_users(after=after, before=before,
+                                             limit=limit + 1)
+
+    return make_page(users, limit, name_key,
+                     after=after, before=before)
+
+
+async def get_page_stats(page: Page) -> dict:
+    """Statistics of the users on a page; see the Flask helper."""
+    return await data_manager.get_user_stats(
+        [user.id for user in page.items])
+
+
+async def cached_page(scope: tuple, render):
+    """
+    Serves a page from the shared page cache, rendering it on a miss, and
+    answers conditional requests with 304 Not Modified; see the Flask
+    helper.
+
+    Parameters:
+        scope (tuple): The page's cache scope.
+        render (Callable[[], Awaitable[str]]): Renders the page.
+
+    Returns:
+        Response: The page, or an empty 304 response.
+    """
+    key = request.full_path
+    generation, modified_at = await data_manager.get_page_generation(scope)
+    page = page_cache.get(scope, key, generation)
+
+    if page is None:
+        page = page_cache.put(scope, key, await render(), generation,
+                              modified_at)
+
+    response = wsgi.set_validators(await make_response(page.body), page)
+    return await response.make_conditional(request)
+
+
+async def render_users(message: str | None = None) -> str:
+    """Renders a page of users; see the Flask helper."""
+    page = await get_users_page()
+    return await render_template('users.html', users=page.items, page=page,
+                                 stats=await get_page_stats(page),
+                                 message=message)
+
+
+async def show_all_users(message: str):
+    try:
+        return await render_users(message)
+    except IOError as e:
+        return "Error getting all users", 500
+
+
+@main.route('/')
+async def index():
+    """
+    Renders the home page.
+
+    Returns:
+        str: Rendered `index.html` template.
+    """
+    return await render_template('index.html')
+
+
+@main.route('/users')
+async def list_users():
+    """
+    Lists one page of users; see the Flask route of the same name.
+
+    Returns:
+        str: Rendered `users.html` template with user data.
+        500: Error page if data retrieval fails.
+    """
+    try:
+        return await cached_page(("users",), render_users)
+    except IOError as e:
+        return "Error getting all users", 500
+
+
+@main.route('/users/<int:user_id>', methods=['GET'])
+async def get_users_favorite_movies(user_id: int):
+    """
+    Displays one page of a user's favorite movies; see the Flask route of
+    the same name.
+
+    Parameter:
+        user_id (int): ID of the user.
+
+    Returns:
+        str: Rendered `user-movies.html` template with user movie data.
+        500: If data retrieval fails.
+    """
+    after, before, limit = get_page_args()
+
+    async def render():
+        result = await data_manager.get_user_movies(
+            user_id, after=after, before=before, limit=limit + 1)
+        page = make_page(result, limit, name_key,
+                         after=after, before=before)
+
+        user = await data_manager.get_user(user_id)
+
+        return await render_template('user-movies.html', result=page.items,
+                                     username=user, page=page)
+
+    try:
+        return await cached_page(("user", user_id), render)
+    except IOError as e:
+        async_app.logger.error("Error getting movies of user %s: %s",
+                               user_id, e)
+        abort(500)
+
+
+@main.route('/users/<int:user_id>/add_movie', methods=['GET', 'POST'])
+async def add_movie(user_id: int):
+    """
+    Adds a movie to a user's favorite list; films missing from the
+    catalogue are saved as pending for the enrichment worker.
+
+    Parameter:
+        user_id (int): ID of the user.
+
+    Returns:
+        str: Rendered `add-movie.html` template for GET request.
+        Redirect: Redirects to the user's movies on successful POST.
+    """
+    if request.method == 'POST':
+        result = wsgi.user_movie_schema.load(await request.form)
+        name = result['name']
+
+        movie = await data_manager.get_catalog_movie(name)
+
+        try:
+            if movie is None:
+                movie = Movie(user_id=user_id, name=name)
+                await data_manager.add_pending_movie(movie)
+                enrichment_worker.wake()
+            else:
+                movie.user_id = user_id
+                movie.name = name
+                await data_manager.add_movie(movie)
+
+            return redirect(
+                url_for('.get_users_favorite_movies', user_id=user_id))
+        except IOError as e:
+            return await show_all_users("False")
+
+    return await render_template('add-movie.html', user_id=user_id)
+
+
+@async_app.errorhandler(404)
+async def page_not_found(error):
+    """
+    Renders the custom 404 error page.
+
+    Returns:
+        Tuple[str, int]: Rendered `404.html` template and status code 404.
+    """
+    return await render_template('404.html'), 404
+
+
+@async_app.errorhandler(500)
+async def server_error(error):
+    """
+    Renders the custom 500 error page.
+
+    Returns:
+        Tuple[str, int]: Rendered `500.html` template and status code 500.
+    """
+    return await render_template('500.html'), 500
+
+
+async_app.register_blueprint(main)
+
+wsgi_application = WsgiToAsgi(flask_app)
+async_routes = async_app.url_map.bind("localhost")
+
+
+async def application(scope, receive, send):
+    """
+    Routes a request to the async app if it serves the path, otherwise to
+    the Flask app.
+
+    Parameters:
+        scope (dict): The ASGI connection scope.
+        receive: The ASGI receive callable.
+        send: The ASGI send callable.
+    """
+    if scope["type"] == "http":
+        try:
+            async_routes.match(scope["path"], method=scope["method"])
+        except (NotFound, MethodNotAllowed):
+            await wsgi_application(scope, receive, send)
+            return
+
+    await async_app(scope, receive, send)
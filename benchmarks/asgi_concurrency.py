@@ -0,0 +1,169 @@
+"""
+Concurrency ceiling of the threaded WSGI server versus the ASGI entry point.
+
+Both servers run in a subprocess against the same seeded database, with
+the OMDB API stubbed locally: `flask run` (Werkzeug, one thread per
+request) and Hypercorn serving `asgi:application`. For every client count
+in `--levels`, client threads hammer the routes the async app serves
+for a fixed duration. Requests per second, latency percentiles and errors
+per server and level are emitted as JSON. The ceiling is the level after
+which throughput stops growing.
+
+Usage:
+    python -m benchmarks.asgi_concurrency --movies 100000
+        [--levels 1,8,32,128] [--seconds 10] [--database PATH]
+        [--output results.json]
+"""
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+from sqlalchemy import create_engine, func, select
+
+from benchmarks.common import ROOT, StubOmdbServer, free_port, \
+    migrate_database, percentiles, report, seed
+from models import User
+
+SERVERS = {
+    "wsgi": lambda port: [sys.executable, "-m", "flask", "--app", "app",
+                          "run", "--port", str(port), "--with-threads"],
+    "asgi": lambda port: [sys.executable, "-m", "hypercorn",
+                          "asgi:application", "--bind",
+                          f"127.0.0.1:{port}"],
+}
+
+ROUTES = (
+    # (weight, method, build path/form from the user count and rng)
+    (4, "GET", lambda users, rng: ("/users", None)),
+    (8, "GET", lambda users, rng: (f"/users/{rng.randrange(users) + 1}",
+                                   None)),
+    (1, "POST", lambda users, rng: (
+        f"/users/{rng.randrange(users) + 1}/add_movie",
+        {"name": f"Load {rng.randrange(10 ** 9)}"})),
+)
+
+
+def start_server(name: str, env: dict) -> tuple[subprocess.Popen, str]:
+    """Starts a server and waits until it answers."""
+    port = free_port()
+    process = subprocess.Popen(SERVERS[name](port), cwd=ROOT, env=env,
+                               stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(base_url + "/", timeout=1)
+            return process, base_url
+        except requests.ConnectionError:
+            time.sleep(0.1)
+
+    process.kill()
+    raise RuntimeError(f"{name} server did not start")
+
+
+def run_level(base_url: str, users: int, clients: int,
+              seconds: float) -> dict:
+    """Runs `clients` client threads for `seconds` and summarizes them."""
+    samples = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def client(seed_value: int):
+        nonlocal errors
+        rng = random.Random(seed_value)
+        session = requests.Session()
+        weights = [route[0] for route in ROUTES]
+        local, failed = [], 0
+
+        while time.perf_counter() < deadline:
+            _, method, build = rng.choices(ROUTES, weights)[0]
+            path, form = build(users, rng)
+            start = time.perf_counter()
+            try:
+                response = session.request(method, base_url + path,
+                                           data=form, allow_redirects=False,
+                                           timeout=30)
+                if response.status_code >= 500:
+                    failed += 1
+            except requests.RequestException:
+                failed += 1
+            local.append(time.perf_counter() - start)
+
+        with lock:
+            samples.extend(local)
+            errors += failed
+
+    threads = [threading.Thread(target=client, args=(i,))
+               for i in range(clients)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return dict(percentiles(samples),
+                requests_per_second=len(samples) / elapsed, errors=errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--levels", default="1,8,32,128")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--database",
+                        help="Seeded database to reuse (created if missing)")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.levels.split(",")]
+
+    with tempfile.TemporaryDirectory() as directory, \
+            StubOmdbServer() as stub:
+        path = args.database or str(Path(directory) / "bench.db")
+        if not Path(path).exists():
+            migrate_database(path)
+            engine = create_engine(f"sqlite:///{path}")
+            seed(engine, args.movies)
+            engine.dispose()
+
+        engine = create_engine(f"sqlite:///{path}")
+        with engine.connect() as connection:
+            users = connection.execute(select(func.max(User.id))).scalar()
+        engine.dispose()
+
+        env = dict(os.environ, FLASK_DATABASE_PATH=path,
+                   FLASK_OMDB_API_URL=stub.url,
+                   FLASK_OMDB_RATE_LIMIT_PER_DAY="null",
+                   FLASK_SQL_SLOW_QUERY_MS="null")
+
+        results = {}
+        for name in SERVERS:
+            process, base_url = start_server(name, env)
+            try:
+                results[name] = {
+                    str(clients): run_level(base_url, users, clients,
+                                            args.seconds)
+                    for clients in levels}
+            finally:
+                process.terminate()
+                process.wait()
+
+    report("asgi_concurrency",
+           {"movies": args.movies, "levels": levels,
+            "seconds": args.seconds},
+           results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Shared helpers of the benchmark scripts: synthetic databases, a local
+stub of the OMDB API, latency summaries and JSON reports.
+"""
+
+import io
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from PIL import Image
+from sqlalchemy import Engine, insert
+
+from models import CatalogMovie, Movie, User
+
+ROOT = Path(__file__).resolve().parent.parent
+
+WORDS = ("star", "night", "dark", "river", "king", "ghost", "city", "blue",
+         "love", "war", "last", "house", "storm", "road", "silent", "iron")
+
+
+def percentiles(samples: list[float]) -> dict:
+    """
+    Summarizes latency samples.
+
+    Parameter:
+        samples (list[float]): Durations in seconds.
+
+    Returns:
+        dict: count, mean, p50, p95, p99 and max, in milliseconds.
+    """
+    if not samples:
+        return {"count": 0}
+
+    ordered = sorted(samples)
+
+    def at(fraction: float) -> float:
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {"count": len(ordered),
+            "mean_ms": sum(ordered) / len(ordered) * 1000,
+            "p50_ms": at(0.50) * 1000,
+            "p95_ms": at(0.95) * 1000,
+            "p99_ms": at(0.99) * 1000,
+            "max_ms": ordered[-1] * 1000}
+
+
+def free_port() -> int:
+    """Returns a TCP port on localhost that is currently free."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def migrate_database(path: str) -> None:
+    """
+    Creates the schema of a new database by running the migrations.
+
+    Parameter:
+        path (str): The SQLite database file.
+    """
+    subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "app", "db", "upgrade"],
+        cwd=ROOT, check=True, capture_output=True,
+        env=dict(os.environ, FLASK_DATABASE_PATH=path))
+
+
+def seed(engine: Engine, movies: int, batch_size: int = 10_000,
+         rng: random.Random | None = None) -> dict:
+    """
+    Fills a migrated database with synthetic users, films and movies.
+
+    One user per 100 movies and one catalogue film per 10 movies are
+    created, so films are shared between users as in production. IDs are
+    left to the database, which numbers the rows of a new database from 1,
+    so sequences, e.g. PostgreSQL's, stay in step.
+
+    Parameters:
+        engine (Engine): Engine of the database to fill.
+        movies (int): Number of user movies to create.
+        batch_size (int): Rows per executemany.
+        rng (random.Random | None): Source of randomness.
+
+    Returns:
+        dict: users, catalog and movies counts.
+    """
+    rng = rng or random.Random(42)
+    users = max(10, movies // 100)
+    catalog = max(10, movies // 10)
+
+    def title() -> str:
+        return " ".join(rng.choice(WORDS).title() for _ in range(3))
+
+    with engine.begin() as connection:
+        connection.execute(insert(User), [
+            {"name": f"user{i:07d}"} for i in range(users)])
+        connection.execute(insert(CatalogMovie), [
+            {"imdb_id": f"tt{i:07d}", "title": title(),
+             "director": f"Director {rng.randrange(catalog // 5 + 1)}",
+             "year": rng.randrange(1950, 2025),
+             "rating": round(rng.uniform(1, 10), 1),
+             "poster": f"https://example.com/{i}.jpg"}
+            for i in range(catalog)])
+
+        for start in range(0, movies, batch_size):
+            connection.execute(insert(Movie), [
+                {"user_id": i % users + 1,
+                 "catalog_movie_id": rng.randrange(catalog) + 1,
+                 "name": title()}
+                for i in range(start, min(start + batch_size, movies))])
+
+    return {"users": users, "catalog": catalog, "movies": movies}
+
+
+class StubOmdbServer:
+    """
+    Local stand-in for the OMDB API, answering every title in `?t=` with a
+    synthetic film (titles starting with 'zz' are unknown). Every path
+    under `poster_url` answers with the same poster image.
+
+    Attributes:
+        url (str): The base URL to configure the client with.
+        poster_url (str): The base URL of the stub's posters.
+        latency (float): Seconds each response is delayed by.
+        requests (int): Title lookups received so far.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        image = io.BytesIO()
+        Image.new("RGB", (300, 444), "steelblue").save(image, "PNG")
+        poster = image.getvalue()
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if self.path.startswith("/posters/"):
+                    self.send_response(200)
+                    self.send_header("Content-Type", "image/png")
+                    self.send_header("Content-Length", str(len(poster)))
+                    self.end_headers()
+                    self.wfile.write(poster)
+                    return
+
+                title = parse_qs(urlparse(self.path).query).get("t", [""])[0]
+                with stub._lock:
+                    stub.requests += 1
+                time.sleep(stub.latency)
+
+                if title.lower().startswith("zz"):
+                    payload = {"Response": "False",
+                               "Error": "Movie not found!"}
+                else:
+                    payload = {"Response": "True", "Title": title,
+                               "Year": "2001", "imdbRating": "7.5",
+                               "Director": "Stub Director",
+                               "Poster": f"{stub.poster_url}stub.png",
+                               "imdbID": f"tt{abs(hash(title.lower()))}"}
+
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_port}/"
+        self.poster_url = f"{self.url}posters/"
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever,
+                         daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def report(name: str, parameters: dict, results: dict,
+           output: str | None = None) -> dict:
+    """
+    Prints a benchmark report as JSON and optionally writes it to a file.
+
+    Parameters:
+        name (str): The benchmark's name.
+        parameters (dict): The benchmark's parameters, e.g. dataset size.
+        results (dict): The measured numbers.
+        output (str | None): File to write the report to.
+
+    Returns:
+        dict: The report.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                                cwd=ROOT, capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    document = {"benchmark": name,
+                "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ",
+                                           time.gmtime()),
+                "commit": commit,
+                "python": platform.python_version(),
+                "parameters": parameters,
+                "results": results}
+
+    text = json.dumps(document, indent=2)
+    print(text)
+    if output:
+        Path(output).write_text(text + "\n")
+
+    return document
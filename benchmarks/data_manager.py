@@ -0,0 +1,164 @@
+"""
+Micro-benchmarks of every data manager method.
+
+A synthetic database is seeded with the given number of movies, the OMDB
+client is pointed at a local stub server, and every method is called
+repeatedly the way a request would call it (session removed after each
+call). Latency percentiles per method are emitted as JSON.
+
+By default SQLiteDataManager runs on a migrated SQLite file. With `--url`
+SQLAlchemyDataManager runs on that database instead, e.g. a throwaway
+PostgreSQL instance; its schema is created and seeded if it has no users.
+Compare the backends by running both with the same `--movies`.
+
+Usage:
+    python -m benchmarks.data_manager --movies 100000 [--iterations 200]
+        [--database PATH | --url URL] [--output results.json]
+"""
+
+import argparse
+import itertools
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+import omdb_client
+from benchmarks.common import (StubOmdbServer, WORDS, migrate_database,
+                               percentiles, report, seed)
+from datamanager.sqlalchemy_data_manager import SQLAlchemyDataManager
+from datamanager.sqlite_data_manager import SQLiteDataManager
+from models import CatalogMovie, Movie, User
+
+
+def measure(data_manager: SQLAlchemyDataManager, call, iterations: int) \
+        -> list[float]:
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        call(i)
+        data_manager.close()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def cases(data_manager: SQLAlchemyDataManager, rng: random.Random) -> dict:
+    """The benchmarked calls, each taking the iteration number."""
+    with data_manager.engine.connect() as connection:
+        users = connection.execute(select(func.max(User.id))).scalar()
+        movies = connection.execute(select(func.max(Movie.id))).scalar()
+        catalog_titles = connection.execute(
+            select(CatalogMovie.title).limit(1000)).scalars().all()
+        catalog_movie_id = connection.execute(
+            select(func.min(CatalogMovie.id))).scalar()
+
+    user_names = (f"user{rng.randrange(users):07d}" for _ in itertools.count())
+    deletable = iter(range(movies, 0, -1))
+    deletable_users = iter(range(users, 0, -1))
+    run = f"{time.time_ns()}"
+
+    return {
+        "get_all_users": lambda i: data_manager.get_all_users(limit=51),
+        "get_all_users_deep_page": lambda i: data_manager.get_all_users(
+            after=(next(user_names), 0), limit=51),
+        "get_user_movies": lambda i: data_manager.get_user_movies(
+            rng.randrange(users) + 1, limit=51),
+        "iter_user_movies": lambda i: sum(
+            1 for _ in data_manager.iter_user_movies(
+                rng.randrange(users) + 1)),
+        "get_user": lambda i: data_manager.get_user(rng.randrange(users) + 1),
+        # As many users as one page of the user list shows.
+        "get_user_stats": lambda i: data_manager.get_user_stats(
+            rng.sample(range(1, users + 1), min(50, users))),
+        "get_movie": lambda i: data_manager.get_movie(
+            rng.randrange(movies) + 1),
+        "get_user_movie_titles": lambda i: data_manager.get_user_movie_titles(
+            rng.randrange(users) + 1),
+        "search": lambda i: data_manager.search(
+            rng.choice(WORDS)[:3], limit=21),
+        "search_users": lambda i: data_manager.search_users(
+            f"user{rng.randrange(users):07d}"[:8]),
+        "get_user_from_api_catalog_hit": lambda i:
+            data_manager.get_user_from_api(rng.choice(catalog_titles)),
+        "get_user_from_api_omdb_stub": lambda i:
+            data_manager.get_user_from_api(f"Uncached {run} {i}"),
+        # Runs after the case above, so the same titles are now cached.
+        "get_user_from_api_cache_hit": lambda i:
+            data_manager.get_user_from_api(f"Uncached {run} {i}"),
+        "add_user": lambda i: data_manager.add_user(
+            User(name=f"bench {run} {i}")),
+        "add_movie": lambda i: data_manager.add_movie(Movie(
+            user_id=rng.randrange(users) + 1,
+            catalog_movie_id=catalog_movie_id, name=f"Added {i}")),
+        "add_movies_100": lambda i: data_manager.add_movies([
+            Movie(user_id=rng.randrange(users) + 1,
+                  catalog_movie_id=catalog_movie_id, name=f"Bulk {i} {j}")
+            for j in range(100)]),
+        "add_pending_movie": lambda i: data_manager.add_pending_movie(Movie(
+            user_id=rng.randrange(users) + 1, name=f"Pending {run} {i}")),
+        # `seed` gives movie n to user (n - 1) % users + 1.
+        "update_movie": lambda i: data_manager.update_movie(Movie(
+            id=(movie_id := rng.randrange(movies) + 1),
+            user_id=(movie_id - 1) % users + 1,
+            name=f"Updated {i}", director="Bench", year=2000, rating=5.0)),
+        "delete_movies": lambda i: data_manager.delete_movies(
+            next(deletable)),
+        "delete_user_movies": lambda i: data_manager.delete_user_movies(
+            rng.randrange(users) + 1),
+        "delete_user": lambda i: data_manager.delete_user(
+            next(deletable_users)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--profile", default="performance")
+    parser.add_argument("--database",
+                        help="Seeded database to reuse (created if missing)")
+    parser.add_argument("--url",
+                        help="SQLAlchemy URL of a database to run on instead")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, \
+            StubOmdbServer() as stub:
+        omdb_client.configure(base_url=stub.url, api_key="bench")
+
+        if args.url:
+            data_manager = SQLAlchemyDataManager(args.url)
+            data_manager.create_schema()
+            with data_manager.engine.connect() as connection:
+                seeded = connection.execute(
+                    select(func.count()).select_from(User)).scalar() > 0
+        else:
+            path = args.database or str(Path(directory) / "bench.db")
+            seeded = Path(path).exists()
+            if not seeded:
+                migrate_database(path)
+            data_manager = SQLiteDataManager(path,
+                                             sqlite_profile=args.profile)
+
+        if not seeded:
+            seed(data_manager.engine, args.movies)
+
+        rng = random.Random(7)
+        results = {name: percentiles(measure(data_manager, call,
+                                             args.iterations))
+                   for name, call in cases(data_manager, rng).items()}
+
+        data_manager.engine.dispose()
+
+    report("data_manager",
+           {"movies": args.movies, "iterations": args.iterations,
+            "backend": type(data_manager).__name__,
+            "dialect": data_manager.engine.dialect.name,
+            "profile": None if args.url else args.profile},
+           results, args.output)
+
+
+if __name__ == "__main__":
+    main()
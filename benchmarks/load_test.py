@@ -0,0 +1,304 @@
+"""
+Load test of the Flask app over HTTP.
+
+The app is served by a threaded Werkzeug server, or with `--workers` by
+preforked Gunicorn workers as in production, against a seeded synthetic
+database, with the OMDB API stubbed locally. Client threads issue a
+weighted mix of requests over every route, reads and writes, for a fixed
+duration.
+Per-route latency percentiles and overall requests per second are
+emitted as JSON.
+
+Usage:
+    python -m benchmarks.load_test --movies 100000 [--seconds 30]
+        [--clients 16] [--workers 4] [--no-page-cache] [--database PATH]
+        [--output results.json]
+"""
+
+import argparse
+import contextlib
+import itertools
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+from sqlalchemy import func, insert, select, update
+from werkzeug.serving import make_server
+
+from app import create_app
+from benchmarks.common import (ROOT, StubOmdbServer, WORDS, free_port,
+                               migrate_database, percentiles, report, seed)
+from models import CatalogMovie, Movie, User
+
+THROWAWAY_USERS = 500
+THROWAWAY_MOVIES = 10
+
+
+def owner(ctx: dict, movie_id: int) -> int:
+    """The user `seed` gave a movie to."""
+    return (movie_id - 1) % ctx["users"] + 1
+
+
+def update_movie(ctx: dict, rng: random.Random) -> tuple:
+    movie_id = rng.randrange(ctx["movies"]) + 1
+    return (f"/users/{owner(ctx, movie_id)}/update_movie/{movie_id}",
+            {"id": movie_id, "name": f"Load {rng.randrange(10 ** 9)}",
+             "director": "Load", "year": 2000, "rating": 5.0})
+
+
+def delete_movie(ctx: dict, rng: random.Random) -> tuple:
+    movie_id = next(ctx["deletable"])
+    return f"/users/{owner(ctx, movie_id)}/delete_movie/{movie_id}", None
+
+
+def delete_movies(ctx: dict, rng: random.Random) -> tuple:
+    """Five of the movies `seed` gave a user, most of them still there."""
+    user_id = rng.randrange(ctx["users"]) + 1
+    per_user = ctx["movies"] // ctx["users"]
+    return (f"/users/{user_id}/delete_movies",
+            {"movie_ids": [user_id + ctx["users"] * rng.randrange(per_user)
+                           for _ in range(5)]})
+
+
+def import_movies(ctx: dict, rng: random.Random) -> tuple:
+    """A CSV upload of five titles, one of them unknown to the stub."""
+    titles = [f"{rng.choice(WORDS)} {rng.randrange(10 ** 9)}"
+              for _ in range(4)] + [f"zz {rng.randrange(10 ** 9)}"]
+    return (f"/users/{rng.randrange(ctx['users']) + 1}/import_movies",
+            {"file": ("titles.csv", "title\n" + "\n".join(titles),
+                      "text/csv")})
+
+
+ROUTES = (
+    # (name, weight, method, build path/form from rng); tuple form values
+    # are uploaded as files.
+    ("index", 1, "GET", lambda ctx, rng: ("/", None)),
+    ("users", 4, "GET", lambda ctx, rng: ("/users", None)),
+    ("users_page", 2, "GET", lambda ctx, rng: (
+        f"/users?after=user{rng.randrange(ctx['users']):07d},0", None)),
+    ("user_movies", 8, "GET", lambda ctx, rng: (
+        f"/users/{rng.randrange(ctx['users']) + 1}", None)),
+    ("update_movie_form", 1, "GET", lambda ctx, rng: (
+        f"/users/1/update_movie/{rng.randrange(ctx['movies']) + 1}", None)),
+    ("update_movie", 1, "POST", update_movie),
+    ("search", 2, "GET", lambda ctx, rng: (
+        f"/search?q={rng.choice(WORDS)[:3]}", None)),
+    ("add_movie", 1, "POST", lambda ctx, rng: (
+        f"/users/{rng.randrange(ctx['users']) + 1}/add_movie",
+        {"name": f"Load {rng.randrange(10 ** 9)}"})),
+    ("add_user_form", 1, "GET", lambda ctx, rng: ("/add_user", None)),
+    ("import_movies", 1, "POST", import_movies),
+    ("export_csv", 1, "GET", lambda ctx, rng: (
+        f"/users/{rng.randrange(ctx['users']) + 1}/export", None)),
+    ("export_jsonl", 1, "GET", lambda ctx, rng: (
+        f"/users/{rng.randrange(ctx['users']) + 1}/export?format=jsonl",
+        None)),
+    # Deletes work down from the highest movie IDs, so the other routes
+    # keep finding most of the movies.
+    ("delete_movie", 1, "GET", delete_movie),
+    ("delete_movies", 1, "POST", delete_movies),
+    # Deletes the users added for it, then answers 404s.
+    ("delete_user", 1, "POST", lambda ctx, rng: (
+        f"/users/{next(ctx['throwaway_users'], 0)}/delete", None)),
+    ("api_users", 2, "GET", lambda ctx, rng: (
+        f"/api/v1/users?limit=50&after="
+        f"user{rng.randrange(ctx['users']):07d},0", None)),
+    ("api_user_movies", 2, "GET", lambda ctx, rng: (
+        f"/api/v1/users/{rng.randrange(ctx['users']) + 1}/movies?limit=50",
+        None)),
+    ("api_suggest", 2, "GET", lambda ctx, rng: (
+        f"/api/v1/suggest?q={rng.choice(WORDS)[:3]}", None)),
+    ("poster", 2, "GET", lambda ctx, rng: (
+        f"/posters/{rng.randrange(ctx['movies']) + 1}", None)),
+    ("metrics", 1, "GET", lambda ctx, rng: ("/metrics", None)),
+)
+
+
+def add_throwaway_users(engine, catalog_movie_id: int, run: str) -> list:
+    """
+    Adds the users the delete_user route deletes, each with a few movies.
+
+    Returns:
+        list[int]: Their IDs.
+    """
+    with engine.begin() as connection:
+        user_ids = connection.execute(
+            insert(User).returning(User.id),
+            [{"name": f"zz throwaway {run} {i}"}
+             for i in range(THROWAWAY_USERS)]).scalars().all()
+        connection.execute(insert(Movie), [
+            {"user_id": user_id, "catalog_movie_id": catalog_movie_id,
+             "name": f"Throwaway {i}"}
+            for user_id in user_ids for i in range(THROWAWAY_MOVIES)])
+    return user_ids
+
+
+@contextlib.contextmanager
+def werkzeug_server(app):
+    """Serves an app with a threaded Werkzeug server; yields its URL."""
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+
+
+@contextlib.contextmanager
+def gunicorn_server(config: dict, workers: int):
+    """
+    Serves the app from gunicorn.conf.py with preforked workers, configured
+    with `config` through `FLASK_` environment variables; yields its URL.
+    """
+    port = free_port()
+    env = dict(os.environ, BIND=f"127.0.0.1:{port}",
+               WEB_CONCURRENCY=str(workers),
+               **{f"FLASK_{key}": json.dumps(value)
+                  for key, value in config.items()})
+    process = subprocess.Popen([sys.executable, "-m", "gunicorn"], cwd=ROOT,
+                               env=env, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+
+    try:
+        deadline = time.perf_counter() + 60
+        while True:
+            try:
+                requests.get(base_url + "/", timeout=1)
+                break
+            except requests.ConnectionError:
+                if time.perf_counter() > deadline \
+                        or process.poll() is not None:
+                    raise RuntimeError("gunicorn did not start")
+                time.sleep(0.05)
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Gunicorn worker processes (default: one "
+                             "Werkzeug process)")
+    parser.add_argument("--no-page-cache", action="store_true")
+    parser.add_argument("--database",
+                        help="Seeded database to reuse (created if missing)")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, \
+            StubOmdbServer() as stub, contextlib.ExitStack() as stack:
+        path = args.database or str(Path(directory) / "bench.db")
+        seeded = Path(path).exists()
+        if not seeded:
+            migrate_database(path)
+
+        config = {"DATABASE_PATH": path, "OMDB_API_URL": stub.url,
+                  "POSTER_CACHE_DIR": str(Path(directory) / "posters"),
+                  "SQL_SLOW_QUERY_MS": None, "OMDB_RATE_LIMIT_PER_DAY": None}
+        if args.no_page_cache:
+            config["PAGE_CACHE_TTL"] = 0
+        app = create_app(config)
+
+        engine = app.extensions["data_manager"].engine
+        if not seeded:
+            seed(engine, args.movies)
+        with engine.begin() as connection:
+            context = {
+                "users": connection.execute(select(func.max(User.id))).scalar(),
+                "movies": connection.execute(
+                    select(func.max(Movie.id))).scalar()}
+            catalog_movie_id = connection.execute(
+                select(func.min(CatalogMovie.id))).scalar()
+            # One poster per film, served by the stub.
+            connection.execute(update(CatalogMovie).values(
+                poster=stub.poster_url + CatalogMovie.imdb_id + ".png"))
+        context["deletable"] = itertools.count(context["movies"], -1)
+        context["throwaway_users"] = iter(add_throwaway_users(
+            engine, catalog_movie_id, f"{time.time_ns()}"))
+
+        if args.workers:
+            server = gunicorn_server(config, args.workers)
+        else:
+            server = werkzeug_server(app)
+        base_url = stack.enter_context(server)
+
+        samples = {name: [] for name, *_ in ROUTES}
+        errors = {name: 0 for name, *_ in ROUTES}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + args.seconds
+
+        def client(seed_value: int):
+            rng = random.Random(seed_value)
+            session = requests.Session()
+            names = [route[0] for route in ROUTES]
+            weights = [route[1] for route in ROUTES]
+            by_name = {route[0]: route for route in ROUTES}
+            local = {name: [] for name in names}
+            failed = {name: 0 for name in names}
+
+            while time.perf_counter() < deadline:
+                name, _, method, build = by_name[
+                    rng.choices(names, weights)[0]]
+                path, form = build(context, rng)
+                form = form or {}
+                files = {key: value for key, value in form.items()
+                         if isinstance(value, tuple)}
+                data = {key: value for key, value in form.items()
+                        if key not in files}
+                start = time.perf_counter()
+                response = session.request(method, base_url + path,
+                                           data=data, files=files,
+                                           allow_redirects=False)
+                local[name].append(time.perf_counter() - start)
+                if response.status_code >= 500:
+                    failed[name] += 1
+
+            with lock:
+                for name in names:
+                    samples[name].extend(local[name])
+                    errors[name] += failed[name]
+
+        threads = [threading.Thread(target=client, args=(i,))
+                   for i in range(args.clients)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        stack.close()
+        engine.dispose()
+
+    total = sum(len(values) for values in samples.values())
+    results = {"requests_per_second": total / elapsed,
+               "requests": total,
+               "errors": sum(errors.values()),
+               "routes": {name: dict(percentiles(values),
+                                     errors=errors[name])
+                          for name, values in samples.items()}}
+
+    report("load_test",
+           {"movies": args.movies, "seconds": args.seconds,
+            "clients": args.clients, "workers": args.workers,
+            "page_cache": not args.no_page_cache},
+           results, args.output)
+
+
+if __name__ == "__main__":
+    main()
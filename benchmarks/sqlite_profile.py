@@ -0,0 +1,107 @@
+"""
+Benchmark: read throughput of SQLiteDataManager during concurrent writes.
+
+For every SQLite profile a fresh database is seeded with one user and a
+library of movies. One thread then keeps adding movies (one commit each)
+while reader threads keep loading the user's profile page query. The
+script prints reads and writes per second for each profile.
+
+Usage:
+    python -m benchmarks.sqlite_profile [--seconds 5] [--readers 4]
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from sqlalchemy import insert
+
+from datamanager.sqlite_data_manager import SQLiteDataManager
+from datamanager.sqlite_profile import SQLITE_PROFILES
+from models import Base, User, Movie, CatalogMovie
+
+
+def seed(data_manager: SQLiteDataManager, movies: int) -> tuple[int, int]:
+    Base.metadata.create_all(data_manager.engine)
+
+    with data_manager.engine.begin() as connection:
+        user_id = connection.execute(
+            insert(User).values(name="bench").returning(User.id)).scalar()
+        catalog_movie_id = connection.execute(
+            insert(CatalogMovie).values(
+                imdb_id="tt0000000", title="Bench", director="Bench",
+                year=2000, rating=5.0, poster="")
+            .returning(CatalogMovie.id)).scalar()
+        connection.execute(insert(Movie), [
+            {"user_id": user_id, "catalog_movie_id": catalog_movie_id,
+             "name": f"Movie {i}"}
+            for i in range(movies)])
+
+    return user_id, catalog_movie_id
+
+
+def run_profile(profile: str, seconds: float, readers: int,
+                movies: int) -> dict:
+    with tempfile.TemporaryDirectory() as directory:
+        data_manager = SQLiteDataManager(
+            str(Path(directory) / "bench.db"), sqlite_profile=profile)
+        user_id, catalog_movie_id = seed(data_manager, movies)
+
+        stop = threading.Event()
+        counts = {"reads": 0, "writes": 0}
+        lock = threading.Lock()
+
+        def read():
+            done = 0
+            while not stop.is_set():
+                data_manager.get_user_movies(user_id)
+                data_manager.close()
+                done += 1
+            with lock:
+                counts["reads"] += done
+
+        def write():
+            done = 0
+            while not stop.is_set():
+                data_manager.add_movie(Movie(
+                    user_id=user_id, catalog_movie_id=catalog_movie_id,
+                    name=f"New {done}"))
+                data_manager.close()
+                done += 1
+            with lock:
+                counts["writes"] += done
+
+        threads = [threading.Thread(target=read) for _ in range(readers)]
+        threads.append(threading.Thread(target=write))
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        data_manager.engine.dispose()
+
+    return {"profile": profile,
+            "reads_per_second": counts["reads"] / seconds,
+            "writes_per_second": counts["writes"] / seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--movies", type=int, default=1000)
+    args = parser.parse_args()
+
+    for profile in SQLITE_PROFILES:
+        result = run_profile(profile, args.seconds, args.readers, args.movies)
+        print(f"{result['profile']:>12}: "
+              f"{result['reads_per_second']:10.1f} reads/s  "
+              f"{result['writes_per_second']:10.1f} writes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Startup cost of the app, with and without template precompilation.
+
+Every run starts a fresh interpreter against a seeded database and
+measures the time to import the app module, to build the app with
+`create_app`, and the latency of the first and second request to a
+rendered page (with the page cache disabled). The gap between the first
+and the second request is the cold-start penalty a freshly forked worker
+would otherwise pay. Finally the preforked Gunicorn server is started
+from gunicorn.conf.py, in its default configuration, and timed until it
+answers.
+
+Usage:
+    python -m benchmarks.startup [--movies 1000] [--runs 5] [--workers 4]
+        [--database PATH] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import requests
+from sqlalchemy import create_engine
+
+from benchmarks.common import ROOT, StubOmdbServer, free_port, \
+    migrate_database, report, seed
+
+CHILD = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+application = app.create_app()
+created = time.perf_counter()
+client = application.test_client()
+timings = []
+for _ in range(2):
+    request_start = time.perf_counter()
+    assert client.get("/users/1").status_code == 200
+    timings.append(time.perf_counter() - request_start)
+print(json.dumps({"import": imported - start, "create_app": created - imported,
+                  "first_request": timings[0], "second_request": timings[1]}))
+"""
+
+
+def measure_process(env: dict) -> dict:
+    """Runs the child script once and returns its timings."""
+    result = subprocess.run([sys.executable, "-c", CHILD], cwd=ROOT, env=env,
+                            capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def measure_server(env: dict, workers: int) -> float:
+    """Seconds until a freshly started Gunicorn server answers."""
+    port = free_port()
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn"], cwd=ROOT,
+        env=dict(env, BIND=f"127.0.0.1:{port}",
+                 WEB_CONCURRENCY=str(workers)),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    try:
+        deadline = start + 60
+        while time.perf_counter() < deadline:
+            try:
+                requests.get(f"http://127.0.0.1:{port}/users/1", timeout=1)
+                return time.perf_counter() - start
+            except requests.ConnectionError:
+                time.sleep(0.01)
+        raise RuntimeError("gunicorn did not start")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def summarize(runs: list[dict]) -> dict:
+    """Median of every timing over the runs, in milliseconds."""
+    return {key: statistics.median(run[key] for run in runs) * 1000
+            for key in runs[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--database",
+                        help="Seeded database to reuse (created if missing)")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory, \
+            StubOmdbServer() as stub:
+        path = args.database or str(Path(directory) / "bench.db")
+        if not Path(path).exists():
+            migrate_database(path)
+            engine = create_engine(f"sqlite:///{path}")
+            seed(engine, args.movies)
+            engine.dispose()
+
+        env = dict(os.environ, FLASK_DATABASE_PATH=path,
+                   FLASK_OMDB_API_URL=stub.url,
+                   FLASK_OMDB_RATE_LIMIT_PER_DAY="null",
+                   FLASK_SQL_SLOW_QUERY_MS="null")
+
+        results = {}
+        for precompile in ("true", "false"):
+            process_env = dict(env, FLASK_PRECOMPILE_TEMPLATES=precompile,
+                               FLASK_PAGE_CACHE_TTL="0")
+            results[f"precompile_{precompile}"] = summarize(
+                [measure_process(process_env) for _ in range(args.runs)])
+
+        results["gunicorn_ready_ms"] = statistics.median(
+            measure_server(env, args.workers)
+            for _ in range(args.runs)) * 1000
+
+    report("startup",
+           {"movies": args.movies, "runs": args.runs,
+            "workers": args.workers},
+           results, args.output)
+
+
+if __name__ == "__main__":
+    main()
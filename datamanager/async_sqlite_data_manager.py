@@ -0,0 +1,179 @@
+"""
+asyncio counterpart of SQLiteDataManager, used by the ASGI entry point.
+
+It covers the reads and writes of the I/O-heavy routes (user list, user
+movies, adding a movie) on an async SQLAlchemy engine over aiosqlite, and
+shares its queries with SQLiteDataManager. Each call opens a short-lived
+AsyncSession, so awaiting the database never blocks the event loop.
+"""
+
+import logging
+import time
+
+from sqlalchemy import AsyncAdaptedQueuePool, Row, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from datamanager.query_metrics import instrument_engine
+from datamanager.read_models import UserRow, user_rows
+from datamanager.sqlalchemy_data_manager import bump_page_generations, \
+    catalog_movie_id_query, page_generation_query, user_movies_query, \
+    users_query, written_scopes
+from datamanager.sqlite_profile import apply_profile
+from datamanager.user_stats import UserStatsSummary, summarize, \
+    top_directors_query, user_stats_query
+from models import EnrichmentJob, Movie, User
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSQLiteDataManager:
+    def __init__(self, db_file_name, pool_size: int = 5,
+                 max_overflow: int = 10, pool_timeout: float = 30,
+                 sqlite_profile: str | dict = "performance",
+                 slow_query_ms: float | None = None):
+        self.engine = create_async_engine(
+            f"sqlite+aiosqlite:///{db_file_name}",
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout)
+        apply_profile(self.engine.sync_engine, sqlite_profile)
+        instrument_engine(self.engine.sync_engine, slow_query_ms)
+
+        self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        self._write_listeners = []
+        self._title_listeners = []
+
+    def add_write_listener(self, listener) -> None:
+        """
+        Registers a callable notified after every committed write with the
+        scope it changed; see `SQLiteDataManager.add_write_listener`.
+        """
+        self._write_listeners.append(listener)
+
+    def add_title_listener(self, listener) -> None:
+        """
+        Registers a callable notified with the titles of added movies; see
+        `SQLAlchemyDataManager.add_title_listener`.
+        """
+        self._title_listeners.append(listener)
+
+    def _notify_titles(self, titles: list[str]) -> None:
+        for listener in self._title_listeners:
+            listener(titles)
+
+    def _notify(self, scopes: list[tuple]) -> None:
+        for scope in scopes:
+            for listener in self._write_listeners:
+                listener(*scope)
+
+    async def get_page_generation(self, scope: tuple) -> tuple[int, float]:
+        """
+        The page generation of a scope and the time of its last write; see
+        `SQLAlchemyDataManager.get_page_generation`.
+        """
+        async with self.Session() as session:
+            row = (await session.execute(page_generation_query(scope))).first()
+        return tuple(row) if row is not None else (0, 0.0)
+
+    async def get_all_users(self, after: tuple[str, int] | None = None,
+                            before: tuple[str, int] | None = None,
+                            limit: int | None = None) -> list[UserRow]:
+        """Users ordered by (name, id); see `users_query`."""
+        async with self.Session() as session:
+            results = user_rows(await session.execute(
+                users_query(after, before, limit)))
+
+        return results[::-1] if before is not None else results
+
+    async def get_user_movies(self, user_id: int,
+                              after: tuple[str, int] | None = None,
+                              before: tuple[str, int] | None = None,
+                              limit: int | None = None) -> list[Row]:
+        """A user's movies; see `user_movies_query`."""
+        async with self.Session() as session:
+            results = (await session.execute(
+                user_movies_query(user_id, after, before, limit))).all()
+
+        return results[::-1] if before is not None else results
+
+    async def get_user(self, user_id: int) -> UserRow | None:
+        async with self.Session() as session:
+            row = (await session.execute(
+                select(User.id, User.name).where(User.id == user_id))).first()
+        return UserRow(*row) if row is not None else None
+
+    async def get_user_stats(self, user_ids: list[int]) \
+            -> dict[int, UserStatsSummary]:
+        """Statistics of some users; see `SQLiteDataManager.get_user_stats`."""
+        if not user_ids:
+            return {}
+
+        async with self.Session() as session:
+            stats = (await session.execute(user_stats_query(user_ids))).all()
+            directors = (await session.execute(
+                top_directors_query(user_ids))).all()
+
+        return summarize(stats, directors)
+
+    async def get_catalog_movie(self, title: str) -> Movie | None:
+        """
+        A new Movie linked to the catalogue's film of that title, None if
+        the film is not in the catalogue.
+        """
+        async with self.Session() as session:
+            catalog_movie_id = (await session.execute(
+                catalog_movie_id_query(title))).scalar()
+
+        if catalog_movie_id is None:
+            return None
+
+        return Movie(catalog_movie_id=catalog_movie_id)
+
+    async def add_movie(self, movie: Movie) -> None:
+        """Inserts a movie linked to a catalogue film."""
+        scopes = written_scopes([("user", movie.user_id)])
+        try:
+            async with self.Session() as session:
+                await session.execute(insert(Movie).values(
+                    user_id=movie.user_id, name=movie.name,
+                    catalog_movie_id=movie.catalog_movie_id))
+                await session.run_sync(bump_page_generations, scopes)
+                await session.commit()
+            logger.info("Added: %s", movie)
+            self._notify(scopes)
+            self._notify_titles([movie.name])
+        except Exception as e:
+            logger.error("Error adding Movie: %s", e)
+
+    async def add_pending_movie(self, movie: Movie) -> None:
+        """
+        Inserts a movie whose film is not known yet together with its
+        enrichment job, in one transaction.
+
+        Raises:
+            IOError: If the insert fails; nothing is written then.
+        """
+        scopes = written_scopes([("user", movie.user_id)])
+        try:
+            async with self.Session() as session:
+                movie.id = (await session.execute(
+                    insert(Movie).values(user_id=movie.user_id,
+                                         name=movie.name, status="pending")
+                )).inserted_primary_key[0]
+                await session.execute(insert(EnrichmentJob).values(
+                    movie_id=movie.id, title=movie.name, status="queued",
+                    attempts=0, run_after=time.time()))
+                await session.run_sync(bump_page_generations, scopes)
+                await session.commit()
+            logger.info("Added pending: %s", movie)
+            self._notify(scopes)
+            self._notify_titles([movie.name])
+        except Exception as e:
+            logger.error("Error adding pending Movie: %s", e)
+            raise IOError(f"Error adding pending Movie: {e}") from e
+
+    async def dispose(self) -> None:
+        """Closes the pooled connections."""
+        await self.engine.dispose()
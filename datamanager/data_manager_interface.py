@@ -1,11 +1,159 @@
+"""
+The operations the routes, the JSON API and the enrichment worker need
+from a storage backend.
+
+Backends:
+- SQLiteDataManager: a SQLite file, with FTS5 search and statistics
+  maintained by triggers (see the migrations).
+- SQLAlchemyDataManager: any database SQLAlchemy can reach through a URL,
+  e.g. PostgreSQL, with a pooled engine.
+
+Listings come back as read models (UserRow, SQLAlchemy Rows), writes take
+Movie and User instances. Writes that fail raise IOError unless noted
+otherwise.
+"""
+
 from abc import ABC, abstractmethod
+from typing import Iterator
+
+from sqlalchemy import Row
+
+from datamanager.read_models import UserRow
+from datamanager.user_stats import UserStatsSummary
+from models import Movie, User
+
 
 class DataManagerInterface(ABC):
 
     @abstractmethod
-    def get_all_users(self):
-        pass
+    def add_write_listener(self, listener) -> None:
+        """
+        Registers a callable notified after every committed write with each
+        scope it changed: `("users",)` or `("user", user_id)`.
+        """
+
+    @abstractmethod
+    def get_page_generation(self, scope: tuple) -> tuple[int, float]:
+        """
+        The write counter of a page cache scope, shared by every process,
+        and the Unix time of its last write; `(0, 0.0)` if never written.
+        """
+
+    @abstractmethod
+    def add_title_listener(self, listener) -> None:
+        """
+        Registers a callable notified after every committed write with the
+        list of titles it added.
+        """
+
+    @abstractmethod
+    def get_all_users(self, after: tuple[str, int] | None = None,
+                      before: tuple[str, int] | None = None,
+                      limit: int | None = None) -> list[UserRow]:
+        """Users ordered by (name, id), optionally one keyset page."""
+
+    @abstractmethod
+    def get_user_movies(self, user_id: int,
+                        after: tuple[str, int] | None = None,
+                        before: tuple[str, int] | None = None,
+                        limit: int | None = None) -> list[Row]:
+        """A user's movies by (name, id) descending, optionally one page."""
+
+    @abstractmethod
+    def iter_user_movies(self, user_id: int,
+                         batch_size: int = 1000) -> Iterator[Row]:
+        """Every movie of a user by (name, id), streamed."""
+
+    @abstractmethod
+    def search(self, query: str, limit: int = 20,
+               offset: int = 0) -> list[Row]:
+        """Movies whose title or director matches the words of a query."""
+
+    @abstractmethod
+    def search_users(self, query: str, limit: int = 20) -> list[UserRow]:
+        """Users whose name starts with the query, by name."""
+
+    @abstractmethod
+    def iter_titles(self) -> Iterator[str]:
+        """Every movie and film title known, streamed."""
+
+    @abstractmethod
+    def get_user_movie_titles(self, user_id: int) -> set[str]:
+        """Normalized titles of every movie in a user's library."""
+
+    @abstractmethod
+    def get_user(self, user_id: int) -> UserRow | None:
+        """A user, None if there is no such user."""
+
+    @abstractmethod
+    def get_user_stats(self, user_ids: list[int]) \
+            -> dict[int, UserStatsSummary]:
+        """Statistics of some users; users without movies are missing."""
+
+    @abstractmethod
+    def rebuild_user_stats(self, check_only: bool = False) -> list[int]:
+        """Repairs stored statistics; returns the users that were wrong."""
+
+    @abstractmethod
+    def get_catalog_movie(self, title: str) -> Movie | None:
+        """A new Movie linked to the catalogue's film of that title."""
+
+    @abstractmethod
+    def get_user_from_api(self, title: str) -> Movie | None:
+        """A new Movie for a title, from the catalogue or the OMDB API."""
+
+    @abstractmethod
+    def get_movie(self, movie_id: int,
+                  user_id: int | None = None) -> Row | None:
+        """A movie, None if there is none; `user_id` is its owner, if known."""
+
+    @abstractmethod
+    def add_user(self, user: User) -> None:
+        """Inserts a user; failures are logged."""
+
+    @abstractmethod
+    def add_movie(self, movie: Movie) -> None:
+        """Inserts a movie whose film is known; failures are logged."""
+
+    @abstractmethod
+    def add_movies(self, movies: list[Movie]) -> None:
+        """Inserts movies whose films are known in one transaction."""
+
+    @abstractmethod
+    def update_movie(self, movie: Movie) -> None:
+        """Saves a user's edits of a movie; failures are logged."""
+
+    @abstractmethod
+    def add_pending_movie(self, movie: Movie) -> None:
+        """Inserts a movie whose film is unknown and its enrichment job."""
+
+    @abstractmethod
+    def claim_enrichment_jobs(self, limit: int, lease: float) -> list[Row]:
+        """Leases up to `limit` due enrichment jobs for `lease` seconds."""
+
+    @abstractmethod
+    def retry_enrichment_job(self, job_id: int, attempts: int,
+                             run_after: float, error: str) -> None:
+        """Puts a job that failed back in the queue until `run_after`."""
+
+    @abstractmethod
+    def complete_enrichment_job(self, job, movie: Movie | None, status: str,
+                                error: str | None = None) -> None:
+        """Finishes an enrichment job with `status`."""
+
+    @abstractmethod
+    def delete_movies(self, movie_ids: int | list[int],
+                      user_id: int | None = None) -> int:
+        """Deletes movies, only those of `user_id` if given."""
+
+    @abstractmethod
+    def delete_user_movies(self, user_id: int) -> int:
+        """Deletes a user's whole library."""
+
+    @abstractmethod
+    def delete_user(self, user_id: int) -> bool:
+        """Deletes a user; False if there was no such user."""
 
     @abstractmethod
-    def get_user_movies(self, user_id):
-        pass
\ No newline at end of file
+    def close(self) -> None:
+        """Releases the calling thread's session."""
@@ -0,0 +1,134 @@
+"""
+Keyset (cursor) pagination helpers.
+
+Listings are ordered on a `(name, id)` key. A cursor is that key of the
+first or last row of a page, rendered as `<name>,<id>`, and the next
+page is selected with a `WHERE` on the key instead of an `OFFSET`, so
+every page costs the same regardless of how deep it is.
+
+Callers fetch `limit + 1` rows; the extra row only tells whether another
+page exists in the direction of travel.
+"""
+
+from typing import Callable, NamedTuple
+
+
+class Page(NamedTuple):
+    """
+    One page of a keyset-paginated listing.
+
+    Attributes:
+        items (list): The rows of the page, in display order.
+        next_cursor (str | None): Cursor for `?after=`, None on the last page.
+        prev_cursor (str | None): Cursor for `?before=`, None on the first page.
+    """
+    items: list
+    next_cursor: str | None
+    prev_cursor: str | None
+
+
+def encode_cursor(key: tuple[str, int]) -> str:
+    """
+    Renders a `(name, id)` key as a cursor string.
+
+    Parameter:
+        key (tuple[str, int]): The sort key of a row.
+
+    Returns:
+        str: The cursor, `<name>,<id>`.
+    """
+    name, row_id = key
+    return f"{name},{row_id}"
+
+
+def decode_cursor(cursor: str | None) -> tuple[str, int] | None:
+    """
+    Parses a cursor string back into a `(name, id)` key.
+
+    Parameter:
+        cursor (str | None): The cursor from the query string.
+
+    Returns:
+        tuple[str, int] | None: The key, or None if no cursor was given.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    if not cursor:
+        return None
+
+    name, separator, row_id = cursor.rpartition(",")
+    if not separator:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+    return name, int(row_id)
+
+
+def name_key(row) -> tuple[str, int]:
+    """
+    Returns the `(name, id)` sort key of a listed user or movie.
+
+    Parameter:
+        row: A row with `name` and `id` attributes.
+
+    Returns:
+        tuple[str, int]: The key.
+    """
+    return row.name, row.id
+
+
+def parse_page_args(args, page_size: int, max_page_size: int) \
+        -> tuple[tuple[str, int] | None, tuple[str, int] | None, int]:
+    """
+    Reads the keyset pagination arguments of a query string: the `after`
+    and `before` cursors and the `limit`, clamped to 1..`max_page_size`.
+
+    Parameters:
+        args (MultiDict): The request's query string arguments.
+        page_size (int): The limit if none (or no number) is given.
+        max_page_size (int): The largest limit allowed.
+
+    Returns:
+        tuple: The `after` and `before` keys and the page size.
+
+    Raises:
+        ValueError: If a cursor is malformed.
+    """
+    after = decode_cursor(args.get("after"))
+    before = decode_cursor(args.get("before"))
+
+    limit = args.get("limit", page_size, type=int)
+    return after, before, max(1, min(limit, max_page_size))
+
+
+def make_page(rows: list, limit: int, key: Callable[[object], tuple],
+              after: tuple | None = None,
+              before: tuple | None = None) -> Page:
+    """
+    Builds a Page from up to `limit + 1` rows fetched with a keyset query.
+
+    Parameters:
+        rows (list): The fetched rows, in display order.
+        limit (int): The page size.
+        key (Callable): Returns the `(name, id)` key of a row.
+        after (tuple | None): The key the rows were fetched after.
+        before (tuple | None): The key the rows were fetched before.
+
+    Returns:
+        Page: The page with its navigation cursors.
+    """
+    has_more = len(rows) > limit
+
+    if before is not None:
+        items = rows[-limit:] if has_more else rows
+        has_prev, has_next = has_more, True
+    else:
+        items = rows[:limit]
+        has_prev, has_next = after is not None, has_more
+
+    if not items:
+        return Page(items, None, None)
+
+    return Page(items,
+                encode_cursor(key(items[-1])) if has_next else None,
+                encode_cursor(key(items[0])) if has_prev else None)
@@ -0,0 +1,129 @@
+"""
+SQL statement instrumentation.
+
+Cursor-execute event hooks time every statement an engine runs, record
+it in the `db_query_duration_seconds` histogram by operation (SELECT,
+INSERT, ...), and log statements slower than a threshold to the
+`moviweb.sql` logger. This replaces echoing every statement to stdout.
+
+`count_queries` counts the statements run in the current context, e.g.
+one request, across every instrumented engine. A count that grows with
+the number of rows on a page gives an N+1 query pattern away.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy import Engine, event
+
+from metrics import Histogram
+
+logger = logging.getLogger("moviweb.sql")
+
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Duration of SQL statements, by operation.",
+    labelnames=("operation",))
+
+
+class QueryCount:
+    """
+    Statements counted so far.
+
+    Attributes:
+        value (int): The number of statements.
+    """
+
+    def __init__(self):
+        self.value = 0
+
+
+_query_count: ContextVar[QueryCount | None] = ContextVar("query_count",
+                                                         default=None)
+
+
+def start_query_count() -> QueryCount:
+    """
+    Starts counting the statements run in the current context, replacing
+    any count in progress.
+
+    Returns:
+        QueryCount: The running count.
+    """
+    count = QueryCount()
+    _query_count.set(count)
+    return count
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryCount]:
+    """
+    Counts the statements run inside the block.
+
+    Returns:
+        QueryCount: The running count, final once the block exits.
+    """
+    count = QueryCount()
+    token = _query_count.set(count)
+    try:
+        yield count
+    finally:
+        _query_count.reset(token)
+
+
+def statement_operation(statement: str) -> str:
+    """
+    Returns the operation of a SQL statement.
+
+    Parameter:
+        statement (str): The SQL text.
+
+    Returns:
+        str: The upper-cased first keyword, e.g. 'SELECT'.
+    """
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+
+def instrument_engine(engine: Engine,
+                      slow_query_ms: float | None = None) -> None:
+    """
+    Times every statement an engine executes.
+
+    Parameters:
+        engine (Engine): The engine to instrument.
+        slow_query_ms (float | None): Statements taking at least this many
+            milliseconds are logged with their parameters; None disables
+            the slow query log.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context,
+                    executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context,
+                   executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        QUERY_DURATION.observe(elapsed,
+                               operation=statement_operation(statement))
+
+        count = _query_count.get()
+        if count is not None:
+            count.value += 1
+
+        if slow_query_ms is not None and elapsed * 1000 >= slow_query_ms:
+            logger.warning("Slow query (%.1f ms): %s %r",
+                           elapsed * 1000, statement,
+                           "executemany" if executemany else parameters)
+
+    @event.listens_for(engine, "handle_error")
+    def discard_timer(context):
+        if context.connection is not None:
+            starts = context.connection.info.get("query_start")
+            if starts:
+                starts.pop()
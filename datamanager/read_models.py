@@ -0,0 +1,32 @@
+"""
+Read models: the shapes the read routes get from the data managers.
+
+Listings select only the columns they show and return plain tuples
+instead of ORM instances, so a page of rows costs no identity map entries,
+instance state or lazy relationship loaders. Users come back as UserRow.
+Movie queries already select the columns of `movie_columns`; their
+SQLAlchemy Rows are tuples too and are returned as they are.
+
+The ORM models stay on the write side. Their relationships raise instead
+of lazy loading, so code that needs one has to load it eagerly, e.g. with
+`selectinload`, rather than issuing one query per row.
+"""
+
+from typing import Iterable, NamedTuple
+
+
+class UserRow(NamedTuple):
+    """
+    A user as listed and linked to.
+
+    Attributes:
+        id (int): The unique identifier for the user.
+        name (str): The name of the user.
+    """
+    id: int
+    name: str
+
+
+def user_rows(rows: Iterable[tuple]) -> list[UserRow]:
+    """Turns `(id, name)` result rows into UserRows."""
+    return [UserRow(*row) for row in rows]
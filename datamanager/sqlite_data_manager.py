@@ -1,102 +1,153 @@
-from typing import Type
-
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy import select, create_engine, ScalarResult, update, desc
-
-from api_util import get_movie_data_from_api
-from datamanager.data_manager_interface import DataManagerInterface
-from models import User, Movie
-
-
-class SQLiteDataManager(DataManagerInterface):
-    def __init__(self, db_file_name):
-        self.engine = create_engine(f"sqlite:///{db_file_name}", echo=True)
-
-        self.Session = sessionmaker(bind=self.engine)
-
-        self.session = self.Session()
-
-    def get_all_users(self) -> ScalarResult[User]:
-
-        results = self.session.execute(select(User)).scalars().all()
-
-        return results
-
-    def get_user_movies(self, user_id: int) -> ScalarResult[tuple]:
-
-        results = self.session.execute(
-            select(User.name, Movie.id, Movie.user_id, Movie.name,
-                   Movie.director,
-                   Movie.year, Movie.rating, Movie.path)
-            .select_from(User)
-            .join(Movie, User.id == Movie.user_id)
-            .where(User.id == user_id)
-            .order_by(desc(Movie.name))
+import logging
+import re
+
+from sqlalchemy import Row, select, insert, text, delete
+
+from datamanager.sqlalchemy_data_manager import SQLAlchemyDataManager, \
+    movie_columns
+from datamanager.sqlite_profile import apply_profile
+from datamanager.user_stats import UserStatsSummary, \
+    expected_director_stats_query, expected_stats_query, summarize, \
+    top_directors_query, user_stats_query
+from models import User, Movie, CatalogMovie, UserDirectorStats, UserStats, \
+    movie_fts
+
+logger = logging.getLogger(__name__)
+
+
+def fts_query(query: str) -> str:
+    """
+    Turns free text into an FTS5 query matching every word as a prefix.
+
+    Parameter:
+        query (str): The search text as typed by the user.
+
+    Returns:
+        str: The MATCH expression, empty if the text has no words.
+    """
+    words = re.findall(r"\w+", query)
+    return " ".join(f'"{word}"*' for word in words)
+
+
+class SQLiteDataManager(SQLAlchemyDataManager):
+    """
+    Data manager of a SQLite database file. Its read `replicas` are
+    database files too, e.g. copies of the primary.
+    """
+
+    def __init__(self, db_file_name, cache_ttl: float = 7 * 24 * 3600,
+                 cache_negative_ttl: float = 3600,
+                 cache_max_entries: int = 1024, pool_size: int = 5,
+                 max_overflow: int = 10, pool_timeout: float = 30,
+                 sqlite_profile: str | dict = "performance",
+                 slow_query_ms: float | None = None,
+                 replicas: list[str] = (), replica_lag: float = 5):
+        self.sqlite_profile = sqlite_profile
+        # A local file needs no liveness ping.
+        super().__init__(f"sqlite:///{db_file_name}",
+                         cache_ttl=cache_ttl,
+                         cache_negative_ttl=cache_negative_ttl,
+                         cache_max_entries=cache_max_entries,
+                         pool_size=pool_size,
+                         max_overflow=max_overflow,
+                         pool_timeout=pool_timeout,
+                         slow_query_ms=slow_query_ms,
+                         replicas=[f"sqlite:///{replica}"
+                                   for replica in replicas],
+                         replica_lag=replica_lag,
+                         pool_pre_ping=False,
+                         connect_args={"check_same_thread": False})
+
+    def _configure_engine(self, engine, replica: bool = False) -> None:
+        apply_profile(engine, self.sqlite_profile, read_only=replica)
+
+    def search(self, query: str, limit: int = 20,
+               offset: int = 0) -> list[Row]:
+        """
+        Movies whose title or director contains words starting with each
+        word of the query, best matches first.
+        """
+        match = fts_query(query)
+        if not match:
+            return []
+
+        return self.session.execute(
+            select(User.name.label("username"), *movie_columns())
+            .select_from(movie_fts)
+            .join(Movie, Movie.id == movie_fts.c.rowid)
+            .join(User, User.id == Movie.user_id)
+            .outerjoin(CatalogMovie,
+                       CatalogMovie.id == Movie.catalog_movie_id)
+            .where(text("movie_fts MATCH :match").bindparams(match=match))
+            .order_by(movie_fts.c.rank)
+            .limit(limit)
+            .offset(offset)
         ).all()
 
-        return results
-
-    def get_user(self, user_id: int) -> Type[User] | None:
-        return self.session.get(User, user_id)
-
-    def get_user_from_api(self, title: str) -> Movie | None:
-        return get_movie_data_from_api(title)
-
-    def get_movie(self, movie_id: int) -> Type[Movie] | None:
-        return self.session.get(Movie, movie_id)
-
-    def add_user(self, user: User) -> None:
-        try:
-            self.session.add(user)
-            self.session.commit()
-            print(f"Added: {user}")
-        except Exception as e:
-            self.session.rollback()
-            print(f"Error adding User: {e}")
-        finally:
-            self.session.close()
-
-    def add_movie(self, movie: Movie) -> None:
-        try:
-            self.session.add(movie)
-            self.session.commit()
-            print(f"Added: {movie}")
-        except Exception as e:
-            self.session.rollback()
-            print(f"Error adding Movie: {e}")
-        finally:
-            self.session.close()
-
-    def update_movie(self, movie: Movie):
-        try:
-            self.session.execute(update(Movie)
-            .where(Movie.id == movie.id)
-            .values(
-                user_id=movie.user_id,
-                name=movie.name,
-                director=movie.director,
-                year=movie.year,
-                rating=movie.rating
-            ))
-            self.session.commit()
-            print(f"Updated: {movie}")
-        except Exception as e:
-            self.session.rollback()
-            print(f"Error updating Movie: {e}")
-        finally:
-            self.session.close()
-
-    def delete_movies(self, movie_id):
+    def get_user_stats(self, user_ids: list[int]) \
+            -> dict[int, UserStatsSummary]:
+        """
+        Movie count, mean rating and top directors of some users, read from
+        the running totals; users without movies are missing.
+        """
+        if not user_ids:
+            return {}
+
+        session = self._reader(("users",), *(("user", user_id)
+                                             for user_id in user_ids))
+        return summarize(
+            session.execute(user_stats_query(user_ids)).all(),
+            session.execute(top_directors_query(user_ids)).all())
+
+    def rebuild_user_stats(self, check_only: bool = False) -> list[int]:
+        """
+        Recomputes the statistics tables from the movies and returns the
+        IDs of the users whose stored totals were wrong. With `check_only`
+        nothing is written.
+        """
         try:
-            movie = self.get_movie(movie_id)
-            self.session.delete(movie)
-            self.session.commit()
-            print(f"Deleted: {movie}")
-        except Exception as e:
+            expected = {row.user_id: row for row in
+                        self.session.execute(expected_stats_query())}
+            stored = {row.user_id: row for row in self.session.execute(
+                select(UserStats.user_id, UserStats.movie_count,
+                       UserStats.rated_count, UserStats.rating_sum))}
+
+            def differs(user_id: int) -> bool:
+                want, have = expected.get(user_id), stored.get(user_id)
+                if want is None or have is None:
+                    return (want or have).movie_count != 0
+                return (want.movie_count != have.movie_count
+                        or want.rated_count != have.rated_count
+                        or abs(want.rating_sum - have.rating_sum) > 1e-6)
+
+            drifted = {user_id for user_id in expected.keys() | stored.keys()
+                       if differs(user_id)}
+
+            expected_directors = set(self.session.execute(
+                expected_director_stats_query()).tuples())
+            stored_directors = set(self.session.execute(
+                select(UserDirectorStats.user_id, UserDirectorStats.director,
+                       UserDirectorStats.movie_count)).tuples())
+            drifted.update(user_id for user_id, *_ in
+                           expected_directors ^ stored_directors)
+
+            if not check_only:
+                self.session.execute(delete(UserStats))
+                self.session.execute(delete(UserDirectorStats))
+                self.session.execute(insert(UserStats).from_select(
+                    ["user_id", "movie_count", "rated_count", "rating_sum"],
+                    expected_stats_query()))
+                self.session.execute(insert(UserDirectorStats).from_select(
+                    ["user_id", "director", "movie_count"],
+                    expected_director_stats_query()))
+                self._commit(("users",))
+                logger.info("Rebuilt user stats, %d users were out of date",
+                            len(drifted))
+        except Exception:
             self.session.rollback()
-            print(f"Error deleting Movie: {e}")
+            raise
         finally:
-            self.session.close()
+            if check_only:
+                self.session.rollback()
 
-    def close(self):
-        self.session.close()
+        return sorted(drifted)
@@ -0,0 +1,58 @@
+"""
+SQLite connection profiles.
+
+A profile is a set of PRAGMA statements applied to every new DBAPI
+connection of an engine through a `connect` event hook:
+- default: stock SQLite behaviour (rollback journal, full sync).
+- performance: WAL journal so readers never block on the writer, NORMAL
+  sync (no fsync per commit, still safe in WAL mode), memory-mapped I/O,
+  a larger page cache, a busy timeout instead of immediate `database is
+  locked` errors and in-memory temp tables.
+
+Every profile enforces foreign keys, which the schema's `ON DELETE
+CASCADE` clauses rely on. Connections to read replicas also refuse writes
+(`query_only`).
+"""
+
+from sqlalchemy import Engine, event
+
+REQUIRED_PRAGMAS = {"foreign_keys": "ON"}
+
+SQLITE_PROFILES = {
+    "default": {},
+    "performance": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64 * 1024,  # negative values are KiB
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+    },
+}
+
+
+def apply_profile(engine: Engine, profile: str | dict,
+                  read_only: bool = False) -> None:
+    """
+    Applies a PRAGMA profile to every connection the engine opens.
+
+    Parameters:
+        engine (Engine): A SQLite engine.
+        profile (str | dict): A key of `SQLITE_PROFILES`, or a mapping of
+            PRAGMA names to values.
+        read_only (bool): Whether the connections refuse writes.
+
+    Raises:
+        KeyError: If the profile name is unknown.
+    """
+    pragmas = dict(REQUIRED_PRAGMAS, **(
+        SQLITE_PROFILES[profile] if isinstance(profile, str) else profile))
+    if read_only:
+        pragmas["query_only"] = "ON"
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
@@ -0,0 +1,116 @@
+"""
+Per-user movie statistics for the user list.
+
+`user_stats` and `user_director_stats` hold running totals that triggers
+on user_movie keep current, so a page of users needs two indexed lookups
+instead of an aggregate over every movie. The `expected_*` queries compute
+the same numbers from user_movie itself, to check and rebuild the totals,
+and serve as the statistics of backends without the triggers.
+"""
+
+from typing import NamedTuple
+
+from sqlalchemy import Select, func, select
+
+from models import CatalogMovie, Movie, UserDirectorStats, UserStats
+
+TOP_DIRECTORS = 3
+
+
+class UserStatsSummary(NamedTuple):
+    """
+    A user's statistics as shown on the user list.
+
+    Attributes:
+        movie_count (int): Number of movies in the user's list.
+        mean_rating (float | None): Mean rating of the rated movies, None if
+            no movie is rated.
+        top_directors (list[str]): The directors with the most movies,
+            most first.
+    """
+    movie_count: int
+    mean_rating: float | None
+    top_directors: list[str]
+
+
+EMPTY_STATS = UserStatsSummary(0, None, [])
+
+
+def user_stats_query(user_ids: list[int]) -> Select:
+    """The stored totals of some users."""
+    return (select(UserStats.user_id, UserStats.movie_count,
+                   UserStats.rated_count, UserStats.rating_sum)
+            .where(UserStats.user_id.in_(user_ids)))
+
+
+def top_directors_query(user_ids: list[int],
+                        limit: int = TOP_DIRECTORS) -> Select:
+    """The `limit` directors with the most movies of each of some users."""
+    return rank_directors(
+        select(UserDirectorStats.user_id, UserDirectorStats.director,
+               UserDirectorStats.movie_count)
+        .where(UserDirectorStats.user_id.in_(user_ids)), limit)
+
+
+def rank_directors(counts: Select, limit: int) -> Select:
+    """
+    The `limit` directors with the most movies of each user, from a query of
+    `(user_id, director, movie_count)` rows.
+    """
+    counts = counts.subquery()
+    rank = (func.row_number()
+            .over(partition_by=counts.c.user_id,
+                  order_by=(counts.c.movie_count.desc(), counts.c.director))
+            .label("rank"))
+    ranked = select(counts.c.user_id, counts.c.director, rank).subquery()
+
+    return (select(ranked.c.user_id, ranked.c.director)
+            .where(ranked.c.rank <= limit)
+            .order_by(ranked.c.user_id, ranked.c.rank))
+
+
+def summarize(stats_rows, director_rows) -> dict[int, UserStatsSummary]:
+    """
+    Combines the rows of `user_stats_query` and `top_directors_query`.
+
+    Returns:
+        dict[int, UserStatsSummary]: Statistics keyed by user ID; users
+        without movies are missing.
+    """
+    directors = {}
+    for user_id, director in director_rows:
+        directors.setdefault(user_id, []).append(director)
+
+    return {row.user_id: UserStatsSummary(
+        row.movie_count,
+        row.rating_sum / row.rated_count if row.rated_count else None,
+        directors.get(row.user_id, []))
+        for row in stats_rows if row.movie_count}
+
+
+def effective_rating():
+    return func.coalesce(Movie.rating, CatalogMovie.rating)
+
+
+def effective_director():
+    return func.coalesce(Movie.director, CatalogMovie.director)
+
+
+def expected_stats_query() -> Select:
+    """Every user's totals, aggregated from user_movie."""
+    return (select(Movie.user_id, func.count().label("movie_count"),
+                   func.count(effective_rating()).label("rated_count"),
+                   func.coalesce(func.sum(effective_rating()), 0.0)
+                   .label("rating_sum"))
+            .outerjoin(CatalogMovie, Movie.catalog_movie_id == CatalogMovie.id)
+            .group_by(Movie.user_id))
+
+
+def expected_director_stats_query() -> Select:
+    """Every user's movie count per director, aggregated from user_movie."""
+    director = effective_director().label("director")
+    return (select(Movie.user_id, director,
+                   func.count().label("movie_count"))
+            .outerjoin(CatalogMovie, Movie.catalog_movie_id == CatalogMovie.id)
+            .where(director.is_not(None))
+            .group_by(Movie.user_id, director))
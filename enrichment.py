@@ -0,0 +1,171 @@
+"""
+Background enrichment of movies saved before their film is known.
+
+Adding a movie that is not in the catalogue stores it as `pending` with a
+job in the `enrichment_job` table, and returns right away. An
+EnrichmentWorker looks the titles up through the OMDB cache on a bounded
+thread pool, then links each movie to its film. Failed lookups are retried
+with exponential backoff up to a maximum number of attempts. Lookups
+refused by the OMDB client's circuit breaker or rate limiter are deferred
+until it lets calls through again (at least `backoff` seconds), without
+using up an attempt.
+
+Jobs are leased rather than locked. A claimed job becomes due again when
+its lease expires, so jobs held by a process that died are picked up by
+the next worker, and several processes can share one queue.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock, Thread
+
+from api_util import MovieNotFoundError
+from metrics import Counter
+from resilience import CircuitOpenError, RateLimitedError
+
+logger = logging.getLogger(__name__)
+
+JOBS = Counter(
+    "enrichment_jobs_total",
+    "Finished enrichment attempts, by outcome "
+    "(ready, not_found, retry, deferred, failed).",
+    labelnames=("outcome",))
+
+
+class EnrichmentWorker:
+    """
+    Thread pool processing the enrichment job queue.
+
+    Attributes:
+        data_manager: The data manager owning the queue.
+        max_workers (int): Lookups running at the same time.
+        max_attempts (int): Attempts before a job is marked failed.
+        backoff (float): Seconds before the first retry, doubled each time.
+        poll_interval (float): Seconds between checks for due jobs.
+        lease (float): Seconds a claimed job is reserved for this worker.
+    """
+
+    def __init__(self, data_manager, max_workers: int = 4,
+                 max_attempts: int = 5, backoff: float = 2.0,
+                 poll_interval: float = 5.0, lease: float = 60.0):
+        self.data_manager = data_manager
+        self.max_workers = max_workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.poll_interval = poll_interval
+        self.lease = lease
+
+        self._wake = Event()
+        self._stopping = Event()
+        self._lock = Lock()
+        self._in_flight = 0
+        self._thread = None
+
+    def start(self) -> None:
+        """Starts the dispatcher thread, unless it is already running."""
+        if self._thread is not None:
+            return
+
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stopping.clear()
+            self._thread = Thread(target=self._run, name="enrichment",
+                                  daemon=True)
+            self._thread.start()
+
+    def wake(self) -> None:
+        """Checks for due jobs now instead of at the next poll."""
+        self._wake.set()
+
+    def stop(self, timeout: float | None = None) -> None:
+        """
+        Stops claiming jobs and waits for the running lookups.
+
+        Parameter:
+            timeout (float | None): Seconds to wait for the dispatcher.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+
+        self._stopping.set()
+        self._wake.set()
+        thread.join(timeout)
+
+    def _run(self) -> None:
+        with ThreadPoolExecutor(self.max_workers,
+                                thread_name_prefix="enrichment") as executor:
+            while not self._stopping.is_set():
+                self._wake.clear()
+
+                with self._lock:
+                    free = self.max_workers - self._in_flight
+
+                jobs = []
+                if free > 0:
+                    try:
+                        jobs = self.data_manager.claim_enrichment_jobs(
+                            free, self.lease)
+                    except Exception as e:
+                        logger.error("Error claiming enrichment jobs: %s", e)
+                    finally:
+                        self.data_manager.close()
+
+                for job in jobs:
+                    if self._stopping.is_set():
+                        break
+                    with self._lock:
+                        self._in_flight += 1
+                    try:
+                        executor.submit(self._process, job)
+                    except RuntimeError:
+                        # The interpreter is exiting and the pool takes no
+                        # more work; the unsubmitted jobs' leases expire.
+                        with self._lock:
+                            self._in_flight -= 1
+                        return
+
+                self._wake.wait(self.poll_interval)
+
+    def _process(self, job) -> None:
+        try:
+            self._enrich(job)
+        except Exception as e:
+            # The lease expires and the job is retried.
+            logger.error("Error finishing enrichment job %s: %s", job.id, e)
+        finally:
+            self.data_manager.close()
+            with self._lock:
+                self._in_flight -= 1
+            self._wake.set()
+
+    def _enrich(self, job) -> None:
+        try:
+            movie = self.data_manager.get_user_from_api(job.title)
+        except MovieNotFoundError:
+            self.data_manager.complete_enrichment_job(job, None, "not_found")
+            JOBS.inc(outcome="not_found")
+        except (CircuitOpenError, RateLimitedError) as e:
+            self.data_manager.retry_enrichment_job(
+                job.id, job.attempts,
+                time.time() + max(self.backoff, e.retry_after),
+                type(e).__name__)
+            JOBS.inc(outcome="deferred")
+        except Exception as e:
+            attempts = job.attempts + 1
+            if attempts >= self.max_attempts:
+                self.data_manager.complete_enrichment_job(
+                    job, None, "failed", error=type(e).__name__)
+                JOBS.inc(outcome="failed")
+            else:
+                self.data_manager.retry_enrichment_job(
+                    job.id, attempts,
+                    time.time() + self.backoff * 2 ** (attempts - 1),
+                    type(e).__name__)
+                JOBS.inc(outcome="retry")
+        else:
+            self.data_manager.complete_enrichment_job(job, movie, "ready")
+            JOBS.inc(outcome="ready")
@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration of MovieWebApp; see server.py.
+
+The worker count follows `WEB_CONCURRENCY` (default: two per CPU plus
+one), the threads per worker `GUNICORN_THREADS` and the address `BIND`.
+"""
+
+import multiprocessing
+import os
+
+# Gunicorn reads its server hooks from this module's globals.
+from server import post_fork, when_ready
+
+wsgi_app = "app:create_app()"
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY",
+                             multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 4))
+preload_app = True
@@ -0,0 +1,213 @@
+"""
+Minimal Prometheus-style metrics.
+
+Counters, histograms and callback gauges register themselves in a
+Registry (the module-level `REGISTRY` by default), which renders them in
+the Prometheus text exposition format for the `/metrics` endpoint.
+"""
+
+import math
+from bisect import bisect_left
+from threading import Lock
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+
+
+class Registry:
+    """A set of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics = []
+        self._lock = Lock()
+
+    def register(self, metric) -> None:
+        """
+        Adds a metric to the registry.
+
+        Parameter:
+            metric: A Counter, Histogram or CallbackGauge.
+        """
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        """
+        Renders every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition, one sample per line.
+        """
+        with self._lock:
+            metrics = list(self._metrics)
+
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def format_labels(names: tuple, values: tuple) -> str:
+    """
+    Renders a label set, e.g. `{method="GET",status="200"}`.
+
+    Parameters:
+        names (tuple): The label names.
+        values (tuple): The label values, in the same order.
+
+    Returns:
+        str: The label set, empty if there are no labels.
+    """
+    if not names:
+        return ""
+
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace("\\", "\\\\").replace('"', '\\"') \
+            .replace("\n", "\\n")
+        pairs.append(f'{name}="{value}"')
+
+    return "{" + ",".join(pairs) + "}"
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Counter:
+    """
+    A monotonically increasing count, per label set.
+
+    Attributes:
+        name (str): The metric name.
+        documentation (str): The HELP text.
+        labelnames (tuple): The label names.
+    """
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: tuple = (), registry: Registry = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = Lock()
+        registry.register(self)
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """
+        Increases the count of a label set.
+
+        Parameters:
+            amount (float): The increment.
+            **labels: A value for every label name.
+        """
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+
+        return [f"{self.name}{format_labels(self.labelnames, key)} "
+                f"{format_value(value)}"
+                for key, value in sorted(values.items())]
+
+
+class Histogram:
+    """
+    Distribution of observed values in cumulative buckets, per label set.
+
+    Attributes:
+        name (str): The metric name.
+        documentation (str): The HELP text.
+        labelnames (tuple): The label names.
+        buckets (tuple): The upper bounds of the buckets.
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str,
+                 labelnames: tuple = (), buckets: tuple = DEFAULT_BUCKETS,
+                 registry: Registry = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._values = {}
+        self._lock = Lock()
+        registry.register(self)
+
+    def observe(self, value: float, **labels) -> None:
+        """
+        Records one observation.
+
+        Parameters:
+            value (float): The observed value, e.g. a duration in seconds.
+            **labels: A value for every label name.
+        """
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+
+        with self._lock:
+            counts, total = self._values.get(
+                key, ([0] * len(self.buckets), 0.0))
+            counts[index] += 1
+            self._values[key] = counts, total + value
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            values = {key: (list(counts), total)
+                      for key, (counts, total) in self._values.items()}
+
+        lines = []
+        for key, (counts, total) in sorted(values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = format_labels(self.labelnames + ("le",),
+                                       key + (format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+
+        return lines
+
+
+class CallbackGauge:
+    """
+    A gauge whose values are read from a callback at render time.
+
+    Attributes:
+        name (str): The metric name.
+        documentation (str): The HELP text.
+        labelname (str): The label distinguishing the callback's values.
+    """
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, callback,
+                 labelname: str = "name", registry: Registry = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.callback = callback
+        self.labelname = labelname
+        registry.register(self)
+
+    def samples(self) -> list[str]:
+        return [f"{self.name}{format_labels((self.labelname,), (key,))} "
+                f"{format_value(value)}"
+                for key, value in sorted(self.callback().items())]
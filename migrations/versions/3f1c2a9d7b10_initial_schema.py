@@ -0,0 +1,62 @@
+"""initial schema
+
+Revision ID: 3f1c2a9d7b10
+Revises: 
+Create Date: 2026-10-18 17:40:00.000000
+
+Creates the tables that predate migrations. Tables that already exist
+are left untouched, so databases created before Flask-Migrate was wired
+up can be upgraded in place.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = sa.inspect(op.get_bind()).get_table_names()
+
+    if 'user' not in existing:
+        op.create_table(
+            'user',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('name')
+        )
+
+    if 'movie' not in existing:
+        op.create_table(
+            'movie',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('director', sa.String(), nullable=False),
+            sa.Column('year', sa.Integer(), nullable=False),
+            sa.Column('rating', sa.Float(), nullable=False),
+            sa.Column('path', sa.String(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'omdb_cache' not in existing:
+        op.create_table(
+            'omdb_cache',
+            sa.Column('title_key', sa.String(), nullable=False),
+            sa.Column('payload', sa.String(), nullable=False),
+            sa.Column('found', sa.Boolean(), nullable=False),
+            sa.Column('fetched_at', sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint('title_key')
+        )
+
+
+def downgrade():
+    op.drop_table('omdb_cache')
+    op.drop_table('movie')
+    op.drop_table('user')
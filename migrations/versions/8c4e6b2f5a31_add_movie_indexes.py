@@ -0,0 +1,29 @@
+"""add movie indexes
+
+Revision ID: 8c4e6b2f5a31
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-18 17:45:00.000000
+
+- ix_movie_user_id_name serves the profile page: rows are found by
+  user_id and already come out ordered by name, so there is no sort step.
+- ix_movie_name_lower serves case-insensitive title lookups.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e6b2f5a31'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_movie_user_id_name', 'movie', ['user_id', 'name'])
+    op.create_index('ix_movie_name_lower', 'movie', [sa.text('lower(name)')])
+
+
+def downgrade():
+    op.drop_index('ix_movie_name_lower', table_name='movie')
+    op.drop_index('ix_movie_user_id_name', table_name='movie')
@@ -0,0 +1,67 @@
+"""cascade deletes
+
+Revision ID: a4e8b1c7d350
+Revises: f7c2d94e1a63
+Create Date: 2026-10-18 22:40:00.000000
+
+Rows that belong to a user or to a user's movie are deleted with it by
+the database (`ON DELETE CASCADE`): a user's movies and statistics, and
+a movie's enrichment job. Deleting a user or a library is then a single
+statement. The app enables `PRAGMA foreign_keys` on every connection.
+
+SQLite cannot alter a foreign key, so the tables are rebuilt. The
+triggers on user_movie are saved and recreated around the rebuild.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4e8b1c7d350'
+down_revision = 'f7c2d94e1a63'
+branch_labels = None
+depends_on = None
+
+# Names for the reflected, unnamed foreign keys, so they can be dropped.
+NAMING_CONVENTION = {
+    "fk": "fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s"}
+
+FOREIGN_KEYS = (
+    # (table, column, referred table)
+    ("user_movie", "user_id", "user"),
+    ("enrichment_job", "movie_id", "user_movie"),
+    ("user_stats", "user_id", "user"),
+    ("user_director_stats", "user_id", "user"),
+)
+
+
+def user_movie_triggers():
+    return op.get_bind().execute(sa.text(
+        "SELECT sql FROM sqlite_master "
+        "WHERE type = 'trigger' AND tbl_name = 'user_movie'")).scalars().all()
+
+
+def set_ondelete(ondelete):
+    triggers = user_movie_triggers()
+
+    for table, column, referred_table in FOREIGN_KEYS:
+        name = NAMING_CONVENTION["fk"] % {"table_name": table,
+                                          "column_0_name": column,
+                                          "referred_table_name": referred_table}
+        with op.batch_alter_table(
+                table, recreate='always',
+                naming_convention=NAMING_CONVENTION) as batch_op:
+            batch_op.drop_constraint(name, type_='foreignkey')
+            batch_op.create_foreign_key(name, referred_table, [column], ['id'],
+                                        ondelete=ondelete)
+
+    for sql in triggers:
+        op.execute(sql)
+
+
+def upgrade():
+    set_ondelete('CASCADE')
+
+
+def downgrade():
+    set_ondelete(None)
@@ -0,0 +1,118 @@
+"""shared movie catalogue
+
+Revision ID: b7d91e4c2f08
+Revises: 8c4e6b2f5a31
+Create Date: 2026-10-18 18:30:00.000000
+
+Splits `movie` into a shared `catalog_movie` table, holding each film
+once, and a slim `user_movie` table linking users to films.
+
+Existing rows are deduplicated on (lower(name), director, year). Rows
+created before the catalogue have no IMDb ID, so each deduplicated film
+gets a placeholder `legacy-<id>` key. A user's rating is kept on the
+user_movie row only where it differs from the catalogue's. Movie IDs are
+preserved so existing URLs keep working.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d91e4c2f08'
+down_revision = '8c4e6b2f5a31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'catalog_movie',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('imdb_id', sa.String(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('director', sa.String(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.Float(), nullable=False),
+        sa.Column('poster', sa.String(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('imdb_id')
+    )
+    op.create_index('ix_catalog_movie_title_lower', 'catalog_movie',
+                    [sa.text('lower(title)')])
+
+    op.create_table(
+        'user_movie',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('catalog_movie_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('director', sa.String(), nullable=True),
+        sa.Column('year', sa.Integer(), nullable=True),
+        sa.Column('rating', sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.ForeignKeyConstraint(['catalog_movie_id'], ['catalog_movie.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_user_movie_user_id_name', 'user_movie',
+                    ['user_id', 'name'])
+
+    op.execute("""
+        INSERT INTO catalog_movie (imdb_id, title, director, year, rating,
+                                   poster)
+        SELECT 'legacy-' || m.id, m.name, m.director, m.year, m.rating,
+               m.path
+        FROM movie m
+        WHERE m.id IN (SELECT min(id) FROM movie
+                       GROUP BY lower(name), director, year)
+    """)
+
+    op.execute("""
+        INSERT INTO user_movie (id, user_id, catalog_movie_id, name,
+                                rating)
+        SELECT m.id, m.user_id, c.id, m.name,
+               CASE WHEN m.rating <> c.rating THEN m.rating END
+        FROM movie m
+        JOIN catalog_movie c
+          ON c.imdb_id = 'legacy-' || (
+              SELECT min(x.id) FROM movie x
+              WHERE lower(x.name) = lower(m.name)
+                AND x.director = m.director
+                AND x.year = m.year)
+    """)
+
+    op.drop_index('ix_movie_name_lower', table_name='movie')
+    op.drop_index('ix_movie_user_id_name', table_name='movie')
+    op.drop_table('movie')
+
+
+def downgrade():
+    op.create_table(
+        'movie',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('director', sa.String(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.Float(), nullable=False),
+        sa.Column('path', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_movie_user_id_name', 'movie', ['user_id', 'name'])
+    op.create_index('ix_movie_name_lower', 'movie', [sa.text('lower(name)')])
+
+    op.execute("""
+        INSERT INTO movie (id, user_id, name, director, year, rating, path)
+        SELECT um.id, um.user_id, um.name,
+               coalesce(um.director, c.director),
+               coalesce(um.year, c.year),
+               coalesce(um.rating, c.rating),
+               c.poster
+        FROM user_movie um
+        JOIN catalog_movie c ON c.id = um.catalog_movie_id
+    """)
+
+    op.drop_index('ix_user_movie_user_id_name', table_name='user_movie')
+    op.drop_table('user_movie')
+    op.drop_index('ix_catalog_movie_title_lower', table_name='catalog_movie')
+    op.drop_table('catalog_movie')
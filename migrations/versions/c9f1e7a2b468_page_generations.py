@@ -0,0 +1,34 @@
+"""page generations
+
+Revision ID: c9f1e7a2b468
+Revises: a4e8b1c7d350
+Create Date: 2026-10-18 23:10:00.000000
+
+Adds `page_generation`, a write counter per page cache scope (`users`,
+`user:<id>`). The data manager increases it in the transaction of every
+write, and each process checks its cached pages against it, so a write
+served by one Gunicorn worker invalidates the pages cached by all of them.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9f1e7a2b468'
+down_revision = 'a4e8b1c7d350'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'page_generation',
+        sa.Column('scope', sa.String(), nullable=False),
+        sa.Column('generation', sa.Integer(), nullable=False),
+        sa.Column('modified_at', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('scope')
+    )
+
+
+def downgrade():
+    op.drop_table('page_generation')
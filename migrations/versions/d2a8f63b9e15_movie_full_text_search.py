@@ -0,0 +1,69 @@
+"""movie full-text search
+
+Revision ID: d2a8f63b9e15
+Revises: b7d91e4c2f08
+Create Date: 2026-10-18 19:10:00.000000
+
+Adds the FTS5 table `movie_fts` over each user movie's title and
+effective director. Its rowid is the user_movie id. Triggers on
+user_movie keep it in sync for every write path.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a8f63b9e15'
+down_revision = 'b7d91e4c2f08'
+branch_labels = None
+depends_on = None
+
+EFFECTIVE_DIRECTOR = """coalesce(new.director, (SELECT director
+                              FROM catalog_movie
+                              WHERE id = new.catalog_movie_id))"""
+
+
+def upgrade():
+    op.execute("""
+        CREATE VIRTUAL TABLE movie_fts USING fts5(
+            name, director,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+
+    op.execute(f"""
+        CREATE TRIGGER user_movie_fts_insert AFTER INSERT ON user_movie
+        BEGIN
+            INSERT INTO movie_fts (rowid, name, director)
+            VALUES (new.id, new.name, {EFFECTIVE_DIRECTOR});
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER user_movie_fts_update
+        AFTER UPDATE OF name, director, catalog_movie_id ON user_movie
+        BEGIN
+            DELETE FROM movie_fts WHERE rowid = old.id;
+            INSERT INTO movie_fts (rowid, name, director)
+            VALUES (new.id, new.name, {EFFECTIVE_DIRECTOR});
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER user_movie_fts_delete AFTER DELETE ON user_movie
+        BEGIN
+            DELETE FROM movie_fts WHERE rowid = old.id;
+        END
+    """)
+
+    op.execute("""
+        INSERT INTO movie_fts (rowid, name, director)
+        SELECT um.id, um.name, coalesce(um.director, c.director)
+        FROM user_movie um
+        JOIN catalog_movie c ON c.id = um.catalog_movie_id
+    """)
+
+
+def downgrade():
+    op.execute("DROP TRIGGER user_movie_fts_delete")
+    op.execute("DROP TRIGGER user_movie_fts_update")
+    op.execute("DROP TRIGGER user_movie_fts_insert")
+    op.execute("DROP TABLE movie_fts")
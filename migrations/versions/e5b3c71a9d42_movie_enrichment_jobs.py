@@ -0,0 +1,92 @@
+"""movie enrichment jobs
+
+Revision ID: e5b3c71a9d42
+Revises: d2a8f63b9e15
+Create Date: 2026-10-18 20:05:00.000000
+
+Movies can be saved before their film is known. `user_movie` gets a
+`status` (ready, pending, not_found, failed) and a nullable
+`catalog_movie_id`. `enrichment_job` durably queues the OMDB lookups that
+fill them in.
+
+SQLite cannot relax NOT NULL in place, so user_movie is rebuilt. That
+drops its triggers, and the full-text search triggers are recreated.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b3c71a9d42'
+down_revision = 'd2a8f63b9e15'
+branch_labels = None
+depends_on = None
+
+EFFECTIVE_DIRECTOR = """coalesce(new.director, (SELECT director
+                              FROM catalog_movie
+                              WHERE id = new.catalog_movie_id))"""
+
+
+def create_fts_triggers():
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS user_movie_fts_insert
+        AFTER INSERT ON user_movie
+        BEGIN
+            INSERT INTO movie_fts (rowid, name, director)
+            VALUES (new.id, new.name, {EFFECTIVE_DIRECTOR});
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS user_movie_fts_update
+        AFTER UPDATE OF name, director, catalog_movie_id ON user_movie
+        BEGIN
+            DELETE FROM movie_fts WHERE rowid = old.id;
+            INSERT INTO movie_fts (rowid, name, director)
+            VALUES (new.id, new.name, {EFFECTIVE_DIRECTOR});
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER IF NOT EXISTS user_movie_fts_delete
+        AFTER DELETE ON user_movie
+        BEGIN
+            DELETE FROM movie_fts WHERE rowid = old.id;
+        END
+    """)
+
+
+def upgrade():
+    with op.batch_alter_table('user_movie', recreate='always') as batch_op:
+        batch_op.alter_column('catalog_movie_id', existing_type=sa.Integer(),
+                              nullable=True)
+        batch_op.add_column(sa.Column('status', sa.String(), nullable=False,
+                                      server_default='ready'))
+    create_fts_triggers()
+
+    op.create_table(
+        'enrichment_job',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('run_after', sa.Float(), nullable=False),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['movie_id'], ['user_movie.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('movie_id')
+    )
+    op.create_index('ix_enrichment_job_status_run_after', 'enrichment_job',
+                    ['status', 'run_after'])
+
+
+def downgrade():
+    op.drop_index('ix_enrichment_job_status_run_after',
+                  table_name='enrichment_job')
+    op.drop_table('enrichment_job')
+
+    op.execute("DELETE FROM user_movie WHERE catalog_movie_id IS NULL")
+    with op.batch_alter_table('user_movie', recreate='always') as batch_op:
+        batch_op.drop_column('status')
+        batch_op.alter_column('catalog_movie_id', existing_type=sa.Integer(),
+                              nullable=False)
+    create_fts_triggers()
@@ -0,0 +1,142 @@
+"""user stats
+
+Revision ID: f7c2d94e1a63
+Revises: e5b3c71a9d42
+Create Date: 2026-10-18 21:30:00.000000
+
+Adds `user_stats` (movie count, rated movie count and rating sum per
+user) and `user_director_stats` (movie count per user and effective
+director). Triggers on user_movie apply every insert, update and delete
+to them as a delta, so the user list never aggregates user_movie. The
+tables are filled from the existing movies.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7c2d94e1a63'
+down_revision = 'e5b3c71a9d42'
+branch_labels = None
+depends_on = None
+
+
+def effective(column, row):
+    """The user's value of a column, falling back to the catalogue's."""
+    return f"""coalesce({row}.{column}, (SELECT {column}
+                                FROM catalog_movie
+                                WHERE id = {row}.catalog_movie_id))"""
+
+
+def add_movie(row):
+    """Statements adding the movie `row` (new or old) to the stats."""
+    rating = effective("rating", row)
+    director = effective("director", row)
+    return f"""
+            INSERT INTO user_stats (user_id, movie_count, rated_count,
+                                    rating_sum)
+            VALUES ({row}.user_id, 1, {rating} IS NOT NULL,
+                    coalesce({rating}, 0))
+            ON CONFLICT (user_id) DO UPDATE
+            SET movie_count = movie_count + 1,
+                rated_count = rated_count + excluded.rated_count,
+                rating_sum = rating_sum + excluded.rating_sum;
+            INSERT INTO user_director_stats (user_id, director, movie_count)
+            SELECT {row}.user_id, director, 1
+            FROM (SELECT {director} AS director)
+            WHERE director IS NOT NULL
+            ON CONFLICT (user_id, director) DO UPDATE
+            SET movie_count = movie_count + 1;"""
+
+
+def remove_movie(row):
+    """Statements removing the movie `row` (new or old) from the stats."""
+    rating = effective("rating", row)
+    director = effective("director", row)
+    return f"""
+            UPDATE user_stats
+            SET movie_count = movie_count - 1,
+                rated_count = rated_count - ({rating} IS NOT NULL),
+                rating_sum = rating_sum - coalesce({rating}, 0)
+            WHERE user_id = {row}.user_id;
+            UPDATE user_director_stats
+            SET movie_count = movie_count - 1
+            WHERE user_id = {row}.user_id AND director = {director};
+            DELETE FROM user_director_stats
+            WHERE user_id = {row}.user_id AND movie_count <= 0;"""
+
+
+def create_stats_triggers():
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS user_movie_stats_insert
+        AFTER INSERT ON user_movie
+        BEGIN{add_movie("new")}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS user_movie_stats_update
+        AFTER UPDATE OF user_id, director, rating, catalog_movie_id
+        ON user_movie
+        BEGIN{remove_movie("old")}{add_movie("new")}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS user_movie_stats_delete
+        AFTER DELETE ON user_movie
+        BEGIN{remove_movie("old")}
+        END
+    """)
+
+
+def upgrade():
+    op.create_table(
+        'user_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('movie_count', sa.Integer(), nullable=False),
+        sa.Column('rated_count', sa.Integer(), nullable=False),
+        sa.Column('rating_sum', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+    op.create_table(
+        'user_director_stats',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('director', sa.String(), nullable=False),
+        sa.Column('movie_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+        sa.PrimaryKeyConstraint('user_id', 'director')
+    )
+
+    op.execute("""
+        INSERT INTO user_stats (user_id, movie_count, rated_count, rating_sum)
+        SELECT user_movie.user_id, count(*),
+               count(coalesce(user_movie.rating, catalog_movie.rating)),
+               coalesce(sum(coalesce(user_movie.rating,
+                                     catalog_movie.rating)), 0)
+        FROM user_movie
+        LEFT JOIN catalog_movie
+            ON catalog_movie.id = user_movie.catalog_movie_id
+        GROUP BY user_movie.user_id
+    """)
+    op.execute("""
+        INSERT INTO user_director_stats (user_id, director, movie_count)
+        SELECT user_movie.user_id,
+               coalesce(user_movie.director, catalog_movie.director)
+                   AS effective_director,
+               count(*)
+        FROM user_movie
+        LEFT JOIN catalog_movie
+            ON catalog_movie.id = user_movie.catalog_movie_id
+        WHERE effective_director IS NOT NULL
+        GROUP BY user_movie.user_id, effective_director
+    """)
+
+    create_stats_triggers()
+
+
+def downgrade():
+    op.execute("DROP TRIGGER user_movie_stats_delete")
+    op.execute("DROP TRIGGER user_movie_stats_update")
+    op.execute("DROP TRIGGER user_movie_stats_insert")
+    op.drop_table('user_director_stats')
+    op.drop_table('user_stats')
@@ -1,5 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index, func, table, column
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, \
     relationship
 """
@@ -7,7 +7,16 @@ Database models for the MovieWebApp.
 
 This module defines the SQLAlchemy models for the application, including:
 - User: Represents a user with a list of favorite movies.
-- Movie: Represents a movie with details such as director, year, and rating.
+- CatalogMovie: Represents a film in the shared catalogue, with details
+  such as director, year, and rating.
+- Movie: Represents a movie in a user's favorite list.
+- OmdbCacheEntry: Persistent tier of the OMDB title lookup cache.
+- EnrichmentJob: Queued OMDB lookup of a movie saved before its film is known.
+- PageGeneration: Write counter of a page cache scope, shared by the
+  processes serving the app.
+- UserStats, UserDirectorStats: Per-user movie statistics, maintained by
+  triggers.
+- movie_fts: FTS5 index over user movies' titles and directors.
 
 """
 
@@ -34,8 +43,11 @@ class User(db.Model):
     """
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(unique=True)
-    movies = relationship('Movie', backref='User',
-                          cascade='all, delete')
+    # The database deletes a user's movies (ON DELETE CASCADE), so the ORM
+    # does not load them to delete them one by one. Reads must load them
+    # eagerly; a lazy load, one query per user, raises instead.
+    movies = relationship('Movie', backref='User', lazy='raise',
+                          cascade='all, delete', passive_deletes=True)
 
     def __repr__(self):
         return (f"User(id = {self.id}, "
@@ -48,32 +60,99 @@ class User(db.Model):
                 )
 
 
+class CatalogMovie(db.Model):
+    """
+    Represents a film in the shared catalogue, stored once however many
+    users have it in their favorite list.
+
+    Attributes:
+        id (int): The unique identifier for the film.
+        imdb_id (str): The IMDb ID reported by the OMDB API.
+        title (str): The title of the film.
+        director (str): The name of the film's director.
+        year (int): The release year of the film.
+        rating (float): The IMDb rating of the film.
+        poster (str): The URL of the film's poster.
+
+    Methods:
+        __repr__: Provides a developer-friendly string representation of the object.
+        __str__: Provides a user-friendly string representation of the object.
+    """
+    __tablename__ = "catalog_movie"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    imdb_id: Mapped[str] = mapped_column(unique=True)
+    title: Mapped[str]
+    director: Mapped[str]
+    year: Mapped[int]
+    rating: Mapped[float]
+    poster: Mapped[str]
+
+    def __repr__(self):
+        return (f"CatalogMovie(id = {self.id}, "
+                f"imdb_id = {self.imdb_id}, "
+                f"title = {self.title}, "
+                f"director = {self.director}, "
+                f"year = {self.year}, "
+                f"rating = {self.rating})"
+                )
+
+    def __str__(self):
+        return (f"CatalogMovie(id = {self.id}, "
+                f"title = {self.title}, "
+                f"year = {self.year})"
+                )
+
+
+Index("ix_catalog_movie_title_lower", func.lower(CatalogMovie.title))
+
+
 class Movie(db.Model):
     """
-    Represents a movie in the application.
+    Represents a movie in a user's favorite list.
+
+    The film itself lives in the shared catalogue; a user's row only keeps
+    the title as the user entered it and the fields the user edited.
 
     Attributes:
         id (int): The unique identifier for the movie.
         user_id (int): The ID of the associated user.
+        catalog_movie_id (int | None): The ID of the film in the catalogue,
+            None until a pending movie is enriched.
         name (str): The title of the movie.
-        director (str): The name of the movie's director.
-        year (int): The release year of the movie.
-        rating (float): The rating of the movie.
+        director (str | None): The user's director, None to use the catalogue's.
+        year (int | None): The user's year, None to use the catalogue's.
+        rating (float | None): The user's rating, None to use the catalogue's.
+        status (str): ready, or pending, not_found or failed while the film
+            is unknown.
+        catalog (CatalogMovie): The film in the catalogue.
 
     Methods:
         __repr__: Provides a developer-friendly string representation of the object.
         __str__: Provides a user-friendly string representation of the object.
     """
+    __tablename__ = "user_movie"
+    __table_args__ = (
+        Index("ix_user_movie_user_id_name", "user_id", "name"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey("user.id"))
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"))
+    catalog_movie_id: Mapped[int | None] = mapped_column(
+        ForeignKey("catalog_movie.id"))
     name: Mapped[str] = mapped_column(unique=False)
-    director: Mapped[str]
-    year: Mapped[int]
-    rating: Mapped[float]
-    path: Mapped[str]
+    director: Mapped[str | None]
+    year: Mapped[int | None]
+    rating: Mapped[float | None]
+    status: Mapped[str] = mapped_column(default="ready",
+                                        server_default="ready")
+    catalog = relationship(CatalogMovie, lazy='raise')
 
     def __repr__(self):
         return (f"Movie(id = {self.id}, "
+                f"user_id = {self.user_id}, "
+                f"catalog_movie_id = {self.catalog_movie_id}, "
                 f"name = {self.name}, "
                 f"director = {self.director}, "
                 f"year = {self.year}, "
@@ -87,3 +166,145 @@ class Movie(db.Model):
                 f"year = {self.year}, "
                 f"rating = {self.rating})"
                 )
+
+
+# FTS5 virtual table over user_movie (rowid = user_movie.id), created and
+# kept in sync by triggers in migration d2a8f63b9e15.
+movie_fts = table("movie_fts", column("rowid"), column("name"),
+                  column("director"), column("rank"))
+
+
+class OmdbCacheEntry(db.Model):
+    """
+    Represents a cached OMDB API response for a normalized movie title.
+
+    Attributes:
+        title_key (str): The normalized title used as cache key.
+        payload (str): The raw JSON body returned by the API.
+        found (bool): False when the API answered with `Response: False`.
+        fetched_at (float): Unix timestamp of the API call.
+    """
+    __tablename__ = "omdb_cache"
+
+    title_key: Mapped[str] = mapped_column(primary_key=True)
+    payload: Mapped[str]
+    found: Mapped[bool]
+    fetched_at: Mapped[float]
+
+    def __repr__(self):
+        return (f"OmdbCacheEntry(title_key = {self.title_key}, "
+                f"found = {self.found}, "
+                f"fetched_at = {self.fetched_at})"
+                )
+
+
+class EnrichmentJob(db.Model):
+    """
+    Represents a queued OMDB lookup for a movie saved before its film was
+    known.
+
+    Attributes:
+        id (int): The unique identifier for the job.
+        movie_id (int): The ID of the pending movie.
+        title (str): The title to look up.
+        status (str): queued, running (leased to a worker) or failed.
+        attempts (int): Failed attempts so far.
+        run_after (float): Unix timestamp the job is due at; for a running
+            job, when its lease expires.
+        last_error (str | None): Type of the last error.
+    """
+    __tablename__ = "enrichment_job"
+    __table_args__ = (
+        Index("ix_enrichment_job_status_run_after", "status", "run_after"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    movie_id: Mapped[int] = mapped_column(
+        ForeignKey("user_movie.id", ondelete="CASCADE"), unique=True)
+    title: Mapped[str]
+    status: Mapped[str] = mapped_column(default="queued")
+    attempts: Mapped[int] = mapped_column(default=0)
+    run_after: Mapped[float]
+    last_error: Mapped[str | None]
+
+    def __repr__(self):
+        return (f"EnrichmentJob(id = {self.id}, "
+                f"movie_id = {self.movie_id}, "
+                f"status = {self.status}, "
+                f"attempts = {self.attempts})"
+                )
+
+
+class PageGeneration(db.Model):
+    """
+    Represents the write counter of a page cache scope, increased in the
+    transaction of every write to the scope, so every process serving the
+    app sees which of its cached pages are out of date.
+
+    Attributes:
+        scope (str): The scope, e.g. `users` or `user:3`.
+        generation (int): Number of writes to the scope.
+        modified_at (float): Unix timestamp of the last write.
+    """
+    __tablename__ = "page_generation"
+
+    scope: Mapped[str] = mapped_column(primary_key=True)
+    generation: Mapped[int]
+    modified_at: Mapped[float]
+
+    def __repr__(self):
+        return (f"PageGeneration(scope = {self.scope}, "
+                f"generation = {self.generation}, "
+                f"modified_at = {self.modified_at})"
+                )
+
+
+class UserStats(db.Model):
+    """
+    Represents the running totals of a user's movies, kept up to date by
+    triggers on user_movie (migration f7c2d94e1a63).
+
+    Attributes:
+        user_id (int): The ID of the user.
+        movie_count (int): Number of movies in the user's list.
+        rated_count (int): Number of those movies with a rating.
+        rating_sum (float): Sum of their effective ratings.
+    """
+    __tablename__ = "user_stats"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    movie_count: Mapped[int] = mapped_column(default=0)
+    rated_count: Mapped[int] = mapped_column(default=0)
+    rating_sum: Mapped[float] = mapped_column(default=0.0)
+
+    def __repr__(self):
+        return (f"UserStats(user_id = {self.user_id}, "
+                f"movie_count = {self.movie_count}, "
+                f"rated_count = {self.rated_count}, "
+                f"rating_sum = {self.rating_sum})"
+                )
+
+
+class UserDirectorStats(db.Model):
+    """
+    Represents how many of a user's movies are by one director, kept up to
+    date by triggers on user_movie (migration f7c2d94e1a63).
+
+    Attributes:
+        user_id (int): The ID of the user.
+        director (str): The effective director of the movies.
+        movie_count (int): Number of the user's movies by the director.
+    """
+    __tablename__ = "user_director_stats"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    director: Mapped[str] = mapped_column(primary_key=True)
+    movie_count: Mapped[int]
+
+    def __repr__(self):
+        return (f"UserDirectorStats(user_id = {self.user_id}, "
+                f"director = {self.director}, "
+                f"movie_count = {self.movie_count})"
+                )
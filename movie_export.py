@@ -0,0 +1,69 @@
+"""
+Export of a user's library as CSV or JSON lines.
+
+Rows are encoded one batch at a time as they come off the data manager's
+streaming cursor, so exporting a library of any size uses constant memory.
+"""
+
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+
+EXPORT_FIELDS = ("id", "name", "director", "year", "rating", "path")
+
+ROWS_PER_CHUNK = 500
+
+
+def export_csv(rows: Iterable) -> Iterator[str]:
+    """
+    Encodes movies as CSV with a header line.
+
+    Parameter:
+        rows (Iterable): Movie rows with the `EXPORT_FIELDS` columns.
+
+    Returns:
+        Iterator[str]: Chunks of CSV text.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+
+    for count, row in enumerate(rows, 1):
+        mapping = row._mapping
+        writer.writerow([mapping[field] for field in EXPORT_FIELDS])
+        if count % ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def export_jsonl(rows: Iterable) -> Iterator[str]:
+    """
+    Encodes movies as JSON lines, one object per movie.
+
+    Parameter:
+        rows (Iterable): Movie rows with the `EXPORT_FIELDS` columns.
+
+    Returns:
+        Iterator[str]: Chunks of JSON lines.
+    """
+    lines = []
+    for row in rows:
+        mapping = row._mapping
+        lines.append(json.dumps({field: mapping[field]
+                                 for field in EXPORT_FIELDS}) + "\n")
+        if len(lines) == ROWS_PER_CHUNK:
+            yield "".join(lines)
+            lines.clear()
+
+    yield "".join(lines)
+
+
+# format: (encoder, mimetype)
+EXPORT_FORMATS = {
+    "csv": (export_csv, "text/csv"),
+    "jsonl": (export_jsonl, "application/x-ndjson"),
+}
@@ -0,0 +1,163 @@
+"""
+Bulk import of movie titles into a user's library.
+
+Titles are read from a JSON or CSV document, deduplicated on their
+normalized form (within the batch and against the user's library),
+resolved concurrently through a bounded worker pool, and written with
+one batched insert in a single transaction. Titles the OMDB client's rate
+limiter or circuit breaker refuses are saved as pending movies instead,
+for the enrichment worker to look up later.
+"""
+
+import csv
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+
+from api_util import MovieNotFoundError
+from models import Movie
+from omdb_client import normalize_title
+from resilience import CircuitOpenError, RateLimitedError
+
+
+class ImportResult(NamedTuple):
+    """
+    Outcome of importing one title.
+
+    Attributes:
+        title (str): The title as given in the import document.
+        status (str): added, queued, duplicate, exists, not_found or error.
+        detail (str): Extra information, e.g. the error type.
+    """
+    title: str
+    status: str
+    detail: str = ""
+
+
+def parse_titles(content: str, filename: str) -> list[str]:
+    """
+    Extracts movie titles from an import document.
+
+    JSON documents are a list of titles or of objects with a `title` or
+    `name` key. CSV documents use the `title` or `name` column, or the
+    first column if there is no such header.
+
+    Parameters:
+        content (str): The document text.
+        filename (str): The document name; `.json` selects JSON, anything
+            else is read as CSV.
+
+    Returns:
+        list[str]: The non-blank titles, in document order.
+
+    Raises:
+        ValueError: If the document cannot be parsed.
+    """
+    if filename.lower().endswith(".json"):
+        items = json.loads(content)
+        if not isinstance(items, list):
+            raise ValueError("JSON import must be a list")
+        titles = [item.get("title") or item.get("name")
+                  if isinstance(item, dict) else item for item in items]
+    else:
+        rows = list(csv.reader(io.StringIO(content)))
+        column = 0
+        if rows:
+            header = [cell.strip().lower() for cell in rows[0]]
+            for name in ("title", "name"):
+                if name in header:
+                    column = header.index(name)
+                    rows = rows[1:]
+                    break
+        titles = [row[column] for row in rows if len(row) > column]
+
+    return [title.strip() for title in titles
+            if isinstance(title, str) and title.strip()]
+
+
+def queue_title(data_manager, user_id: int, title: str,
+                error: Exception) -> ImportResult:
+    """
+    Saves a title whose lookup was refused as a pending movie.
+
+    Parameters:
+        data_manager: The data manager to store the movie with.
+        user_id (int): ID of the user.
+        title (str): The title as given in the import document.
+        error (Exception): Why the lookup was refused.
+
+    Returns:
+        ImportResult: queued, with the refusal, or error.
+    """
+    try:
+        data_manager.add_pending_movie(Movie(user_id=user_id, name=title))
+    except IOError as e:
+        return ImportResult(title, "error", str(e))
+    return ImportResult(title, "queued", type(error).__name__)
+
+
+def import_titles(data_manager, user_id: int, titles: list[str],
+                  max_workers: int = 8) -> list[ImportResult]:
+    """
+    Imports titles into a user's library.
+
+    Parameters:
+        data_manager: The data manager to resolve and store movies with.
+        user_id (int): ID of the user.
+        titles (list[str]): The titles to import.
+        max_workers (int): Maximum number of concurrent API lookups.
+
+    Returns:
+        list[ImportResult]: One result per given title, in input order.
+    """
+    existing = data_manager.get_user_movie_titles(user_id)
+
+    results = {}
+    pending = []
+    seen = set()
+    for index, title in enumerate(titles):
+        key = normalize_title(title)
+        if key in existing:
+            results[index] = ImportResult(title, "exists")
+        elif key in seen:
+            results[index] = ImportResult(title, "duplicate")
+        else:
+            seen.add(key)
+            pending.append(index)
+
+    def resolve(index: int):
+        try:
+            return index, data_manager.get_user_from_api(titles[index]), None
+        except Exception as e:
+            return index, None, e
+
+    movies = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for index, movie, error in executor.map(resolve, pending):
+            if isinstance(error, MovieNotFoundError):
+                results[index] = ImportResult(titles[index], "not_found")
+                continue
+            if isinstance(error, (CircuitOpenError, RateLimitedError)):
+                results[index] = queue_title(data_manager, user_id,
+                                             titles[index], error)
+                continue
+            if movie is None:
+                # The message of a failed request can carry the API key.
+                results[index] = ImportResult(titles[index], "error",
+                                              type(error).__name__)
+                continue
+
+            movie.user_id = user_id
+            movie.name = titles[index]
+            movies.append((index, movie))
+
+    try:
+        data_manager.add_movies([movie for _, movie in movies])
+        for index, movie in movies:
+            results[index] = ImportResult(titles[index], "added")
+    except IOError as e:
+        for index, movie in movies:
+            results[index] = ImportResult(titles[index], "error", str(e))
+
+    return [results[index] for index in range(len(titles))]
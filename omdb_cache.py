@@ -0,0 +1,200 @@
+"""
+Two-tier cache in front of the OMDB API.
+
+Lookups are keyed on the normalized movie title and go through:
+- an in-process LRU holding the most recently used responses, and
+- the persistent `omdb_cache` table (created by the migrations), shared
+  by every process using the same database.
+
+Both successful responses and `Response: False` answers are cached, each
+with its own time-to-live. Network errors are never cached; when the API
+fails, e.g. because its circuit is open, an expired entry is served
+instead if there is one.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Iterator
+
+from requests import RequestException
+from sqlalchemy import Engine, delete, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from api_util import fetch_movie_payload, movie_from_payload, \
+    MovieNotFoundError
+from models import Movie, OmdbCacheEntry
+from omdb_client import normalize_title
+
+
+class OmdbCache:
+    """
+    LRU plus persistent cache of OMDB API responses.
+
+    Attributes:
+        ttl (float): Seconds a found movie stays fresh.
+        negative_ttl (float): Seconds a `Response: False` answer stays fresh.
+        max_entries (int): Capacity of the in-process LRU.
+    """
+
+    def __init__(self, engine: Engine, ttl: float = 7 * 24 * 3600,
+                 negative_ttl: float = 3600, max_entries: int = 1024,
+                 fetch=fetch_movie_payload):
+        self.engine = engine
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.fetch = fetch
+
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._counters = {"hits": 0, "persistent_hits": 0, "misses": 0,
+                          "evictions": 0, "expirations": 0, "stale_hits": 0}
+
+    def get_movie(self, title: str) -> Movie:
+        """
+        Returns the movie for a title, calling the API only on a cache miss.
+
+        Parameter:
+            title (str): The title of the movie to search for.
+
+        Returns:
+            Movie: A new, transient Movie object built from the response.
+
+        Raises:
+            RequestException: If the API request fails and the title is not
+                cached, not even expired.
+            ValueError: If the API response cannot be decoded.
+            MovieNotFoundError: If the API does not know the title.
+        """
+        payload = self.lookup(title)
+
+        if payload.get("Response") != 'True':
+            raise MovieNotFoundError("Response is False")
+
+        return movie_from_payload(payload)
+
+    def lookup(self, title: str) -> dict:
+        """
+        Returns the raw API response for a title.
+
+        Parameter:
+            title (str): The title of the movie to search for.
+
+        Returns:
+            dict: The decoded JSON body, fresh from either cache tier or
+            from the API, or stale if the API request failed.
+        """
+        key = normalize_title(title)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._is_fresh(entry, now):
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return entry[0]
+                del self._entries[key]
+                self._counters["expirations"] += 1
+
+        stale = entry
+        entry = self._load(key)
+        if entry is not None and self._is_fresh(entry, now):
+            with self._lock:
+                self._counters["persistent_hits"] += 1
+                self._remember(key, entry)
+            return entry[0]
+
+        with self._lock:
+            self._counters["misses"] += 1
+
+        try:
+            payload = self.fetch(title)
+        except RequestException:
+            stale = entry or stale
+            if stale is None:
+                raise
+            with self._lock:
+                self._counters["stale_hits"] += 1
+            return stale[0]
+        entry = (payload, payload.get("Response") == 'True', time.time())
+
+        self._store(key, entry)
+        with self._lock:
+            self._remember(key, entry)
+
+        return payload
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: hits, persistent_hits, misses, evictions, expirations,
+            stale_hits and the current LRU size.
+        """
+        with self._lock:
+            return dict(self._counters, size=len(self._entries))
+
+    def titles(self) -> Iterator[str]:
+        """Titles of the films found by the cached lookups, streamed."""
+        with self.engine.connect() as connection:
+            for payload in connection.execution_options(
+                    yield_per=1000).execute(
+                    select(OmdbCacheEntry.payload)
+                    .where(OmdbCacheEntry.found)).scalars():
+                yield json.loads(payload)["Title"]
+
+    def clear(self) -> None:
+        """Drops every entry from both cache tiers."""
+        with self._lock:
+            self._entries.clear()
+
+        with self.engine.begin() as connection:
+            connection.execute(delete(OmdbCacheEntry))
+
+    def _is_fresh(self, entry: tuple, now: float) -> bool:
+        payload, found, fetched_at = entry
+        ttl = self.ttl if found else self.negative_ttl
+        return now - fetched_at < ttl
+
+    def _remember(self, key: str, entry: tuple) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _load(self, key: str) -> tuple | None:
+        with self.engine.connect() as connection:
+            row = connection.execute(
+                select(OmdbCacheEntry.payload, OmdbCacheEntry.found,
+                       OmdbCacheEntry.fetched_at)
+                .where(OmdbCacheEntry.title_key == key)
+            ).first()
+
+        if row is None:
+            return None
+
+        return json.loads(row.payload), row.found, row.fetched_at
+
+    def _store(self, key: str, entry: tuple) -> None:
+        payload, found, fetched_at = entry
+
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(delete(OmdbCacheEntry)
+                                   .where(OmdbCacheEntry.title_key == key))
+                connection.execute(insert(OmdbCacheEntry).values(
+                    title_key=key,
+                    payload=json.dumps(payload),
+                    found=found,
+                    fetched_at=fetched_at
+                ))
+        except IntegrityError:
+            # Another process stored the title between our DELETE and
+            # INSERT; its entry is as fresh as ours.
+            pass
@@ -0,0 +1,316 @@
+"""
+Reusable client for the OMDB API.
+
+- OmdbClient keeps one `requests.Session` with a keep-alive connection
+  pool, loads the API key once, and decodes each response body once.
+- Concurrent lookups of the same title are coalesced (single-flight):
+  the first caller performs the request and every other caller waits for
+  and shares its result.
+- Requests can be rate limited with a token bucket sized to the API
+  key's daily quota, and go through a circuit breaker that fails fast
+  with CircuitOpenError while the API keeps failing, so a slow or down
+  API cannot tie up every worker for the full timeout.
+- AsyncOmdbClient offers the same API to asyncio code, running the
+  pooled blocking request in a worker thread.
+
+The module-level default client is used by `api_util`; `configure`
+replaces it, e.g. to point the app at a local stub server.
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import Future
+from threading import Lock
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+
+from metrics import CallbackGauge, Counter, Histogram
+from resilience import CircuitBreaker, CircuitOpenError, RateLimitedError, \
+    TokenBucket, CLOSED, OPEN, HALF_OPEN
+
+MOVIE_API_URL = "https://www.omdbapi.com/"
+
+REQUEST_DURATION = Histogram(
+    "omdb_request_duration_seconds",
+    "Duration of OMDB API requests.")
+REQUESTS = Counter(
+    "omdb_requests_total",
+    "OMDB API requests, by outcome "
+    "(found, not_found, error, circuit_open, rate_limited).",
+    labelnames=("outcome",))
+COALESCED = Counter(
+    "omdb_coalesced_requests_total",
+    "Lookups that shared an in-flight request for the same title.")
+
+
+def load_api_key() -> str:
+    """
+    Retrieves the API key from the environment variables.
+
+    Returns:
+        str: The API key for accessing the OMDB API.
+    """
+    load_dotenv()
+
+    return os.getenv('key')
+
+
+def normalize_title(title: str) -> str:
+    """
+    Normalizes a movie title into a lookup key.
+
+    Parameter:
+        title (str): The title as entered by the user.
+
+    Returns:
+        str: The title with collapsed whitespace, casefolded.
+    """
+    return " ".join(title.split()).casefold()
+
+
+class OmdbClient:
+    """
+    Thread-safe OMDB API client with connection reuse and request coalescing.
+
+    Attributes:
+        base_url (str): The API endpoint.
+        timeout (float): Seconds to wait for a response, and at most for
+            a rate limit token.
+        rate_limiter (TokenBucket | None): Limits the request rate; None
+            when `rate_limit_per_day` is None.
+        breaker (CircuitBreaker): Fails requests fast after
+            `breaker_threshold` consecutive errors, for
+            `breaker_reset_timeout` seconds.
+    """
+
+    def __init__(self, api_key: str | None = None,
+                 base_url: str = MOVIE_API_URL, timeout: float = 5,
+                 pool_maxsize: int = 10,
+                 rate_limit_per_day: float | None = None,
+                 rate_burst: float = 10, breaker_threshold: int = 5,
+                 breaker_reset_timeout: float = 30):
+        self.base_url = base_url
+        self.timeout = timeout
+        self._api_key = api_key
+
+        self.rate_limiter = (
+            TokenBucket(rate_limit_per_day / 86400, rate_burst)
+            if rate_limit_per_day is not None else None)
+        self.breaker = CircuitBreaker(breaker_threshold,
+                                      breaker_reset_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._in_flight = {}
+        self._lock = Lock()
+
+    @property
+    def api_key(self) -> str:
+        if self._api_key is None:
+            self._api_key = load_api_key()
+        return self._api_key
+
+    def fetch(self, movie_title: str) -> dict:
+        """
+        Fetches the raw API response for a movie title.
+
+        Callers asking for a title that is already being fetched wait for
+        that request instead of issuing their own.
+
+        Parameter:
+            movie_title (str): The title of the movie to search for.
+
+        Returns:
+            dict: The decoded JSON body returned by the API.
+
+        Raises:
+            RequestException: If the request fails or returns a bad status.
+            ValueError: If the JSON response cannot be decoded.
+        """
+        key = normalize_title(movie_title)
+
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+
+        if not leader:
+            COALESCED.inc()
+            return future.result()
+
+        try:
+            payload = self.request(movie_title)
+            future.set_result(payload)
+            return payload
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def request(self, movie_title: str) -> dict:
+        """
+        Performs one API request, without coalescing.
+
+        Parameter:
+            movie_title (str): The title of the movie to search for.
+
+        Returns:
+            dict: The decoded JSON body returned by the API.
+
+        Raises:
+            CircuitOpenError: If the circuit breaker is open.
+            RateLimitedError: If no rate limit token came within `timeout`.
+            Both carry `retry_after`, the seconds until a call may go
+            through.
+        """
+        if not self.breaker.allow():
+            REQUESTS.inc(outcome="circuit_open")
+            raise CircuitOpenError("OMDB API circuit is open",
+                                   retry_after=self.breaker.retry_after())
+
+        if self.rate_limiter is not None \
+                and not self.rate_limiter.acquire(self.timeout):
+            self.breaker.release()
+            REQUESTS.inc(outcome="rate_limited")
+            raise RateLimitedError("OMDB API rate limit reached",
+                                   retry_after=self.rate_limiter.wait_time())
+
+        start = time.perf_counter()
+        try:
+            response = self.session.get(
+                self.base_url,
+                params={"t": movie_title, "apikey": self.api_key},
+                verify=True,  # verify SSL Certificates
+                timeout=self.timeout)
+
+            response.raise_for_status()  # Raises HTTPError for bad responses
+
+            payload = response.json()
+        except Exception:
+            self.breaker.record_failure()
+            REQUESTS.inc(outcome="error")
+            raise
+        finally:
+            REQUEST_DURATION.observe(time.perf_counter() - start)
+
+        self.breaker.record_success()
+        REQUESTS.inc(outcome="found" if payload.get("Response") == 'True'
+                     else "not_found")
+        return payload
+
+    def close(self) -> None:
+        """Closes the pooled connections."""
+        self.session.close()
+
+
+class AsyncOmdbClient:
+    """
+    asyncio front end of an OmdbClient, with per-event-loop coalescing.
+
+    Attributes:
+        client (OmdbClient): The pooled client performing the requests.
+    """
+
+    def __init__(self, client: OmdbClient | None = None):
+        self.client = client or OmdbClient()
+        self._in_flight = {}
+
+    async def fetch(self, movie_title: str) -> dict:
+        """
+        Fetches the raw API response for a movie title.
+
+        Parameter:
+            movie_title (str): The title of the movie to search for.
+
+        Returns:
+            dict: The decoded JSON body returned by the API.
+        """
+        key = normalize_title(movie_title)
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                asyncio.to_thread(self.client.request, movie_title))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        return await asyncio.shield(task)
+
+    async def close(self) -> None:
+        """Closes the pooled connections."""
+        await asyncio.to_thread(self.client.close)
+
+
+_default_client = OmdbClient()
+
+
+def get_default_client() -> OmdbClient:
+    """
+    Returns the shared client used by `api_util`.
+
+    Returns:
+        OmdbClient: The default client.
+    """
+    return _default_client
+
+
+def configure(**kwargs) -> OmdbClient:
+    """
+    Replaces the shared client with one built from the given arguments.
+
+    Parameter:
+        **kwargs: Keyword arguments of OmdbClient.
+
+    Returns:
+        OmdbClient: The new default client.
+    """
+    global _default_client
+
+    old_client = _default_client
+    _default_client = OmdbClient(**kwargs)
+    old_client.close()
+
+    return _default_client
+
+
+def circuit_state() -> dict:
+    """
+    Returns the default client's circuit state as one-hot values.
+
+    Returns:
+        dict: 1 for the current state, 0 for the others.
+    """
+    state = _default_client.breaker.state
+    return {name: int(name == state) for name in (CLOSED, OPEN, HALF_OPEN)}
+
+
+def resilience_stats() -> dict:
+    """
+    Returns the default client's circuit breaker and rate limiter counters.
+
+    Returns:
+        dict: The breaker's stats, plus the available rate limit tokens
+        when rate limiting is enabled.
+    """
+    stats = _default_client.breaker.stats()
+    if _default_client.rate_limiter is not None:
+        stats["rate_limit_tokens"] = _default_client.rate_limiter.tokens()
+    return stats
+
+
+CallbackGauge("omdb_circuit_state",
+              "Current state of the OMDB API circuit breaker.",
+              circuit_state, labelname="state")
+CallbackGauge("omdb_resilience_events",
+              "OMDB circuit breaker counters and available rate limit tokens.",
+              resilience_stats, labelname="event")
@@ -0,0 +1,158 @@
+"""
+In-process cache of rendered pages.
+
+Pages are grouped in scopes, e.g. `("users",)` for the user list or
+`("user", 3)` for one profile, and cached per request path within their
+scope. Each page is stored with its scope's generation, a write counter
+the data manager keeps in the database (`get_page_generation`), and is
+served only while the generation is unchanged. A write served by any
+process thus invalidates the pages cached by every process. The data
+manager's write listener also drops the scope's pages right away with
+`invalidate`.
+
+Each page carries an ETag (hash of the body) and a Last-Modified time (the
+last write to its scope), so routes can answer conditional requests with
+304 Not Modified.
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from threading import Lock
+from typing import NamedTuple
+
+
+class CachedPage(NamedTuple):
+    """
+    A rendered page.
+
+    Attributes:
+        body (str): The rendered HTML.
+        etag (str): Strong validator derived from the body.
+        last_modified (datetime): Time of the last write to the page's scope.
+        created_at (float): Monotonic time the page was rendered.
+        generation (int): The scope's generation the page was rendered at.
+    """
+    body: str
+    etag: str
+    last_modified: datetime
+    created_at: float
+    generation: int
+
+
+class PageCache:
+    """
+    LRU cache of rendered pages with per-scope invalidation.
+
+    Attributes:
+        max_entries (int): Maximum number of cached pages.
+        ttl (float): Seconds a page is served before it is rendered again,
+            e.g. after writes that bypassed the data manager.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+
+        self._pages = OrderedDict()
+        self._keys_by_scope = {}
+        # The newest generation seen per scope.
+        self._generations = {}
+        self._started = datetime.now(timezone.utc).replace(microsecond=0)
+        self._lock = Lock()
+        self._counters = {"hits": 0, "misses": 0, "invalidations": 0,
+                          "evictions": 0}
+
+    def get(self, scope: tuple, key: str,
+            generation: int) -> CachedPage | None:
+        """
+        Returns a cached page, if it was rendered at the scope's current
+        generation.
+
+        Parameters:
+            scope (tuple): The page's scope.
+            key (str): The page's request path, including the query string.
+            generation (int): The scope's current generation.
+
+        Returns:
+            CachedPage | None: The page, or None if it is not cached.
+        """
+        with self._lock:
+            if generation > self._generations.get(scope, 0):
+                self._generations[scope] = generation
+            page = self._pages.get((scope, key))
+
+            if page is not None and page.generation == generation \
+                    and time.monotonic() - page.created_at < self.ttl:
+                self._pages.move_to_end((scope, key))
+                self._counters["hits"] += 1
+                return page
+
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, scope: tuple, key: str, body: str, generation: int,
+            modified_at: float, store: bool = True) -> CachedPage:
+        """
+        Caches a rendered page, unless its scope was written while rendering:
+        a newer generation has been seen since.
+
+        Parameters:
+            scope (tuple): The page's scope.
+            key (str): The page's request path, including the query string.
+            body (str): The rendered HTML.
+            generation (int): The scope's generation before rendering.
+            modified_at (float): Unix time of the scope's last write, 0 if
+                it was never written.
+            store (bool): False to only compute the page's validators, e.g.
+                for a page that may miss the last write.
+
+        Returns:
+            CachedPage: The page with its validators.
+        """
+        last_modified = (datetime.fromtimestamp(int(modified_at),
+                                                timezone.utc)
+                         if modified_at else self._started)
+        page = CachedPage(body, hashlib.sha1(body.encode()).hexdigest(),
+                          last_modified, time.monotonic(), generation)
+
+        with self._lock:
+            if not store or generation < self._generations.get(scope, 0):
+                return page
+
+            self._pages[(scope, key)] = page
+            self._pages.move_to_end((scope, key))
+            self._keys_by_scope.setdefault(scope, set()).add(key)
+
+            while len(self._pages) > self.max_entries:
+                (old_scope, old_key), _ = self._pages.popitem(last=False)
+                self._keys_by_scope[old_scope].discard(old_key)
+                self._counters["evictions"] += 1
+
+            return page
+
+    def invalidate(self, *scope) -> None:
+        """
+        Drops every cached page of a scope, after a write in this process.
+
+        Parameter:
+            *scope: The scope, e.g. `invalidate("user", 3)`.
+        """
+        with self._lock:
+            for key in self._keys_by_scope.pop(scope, ()):
+                self._pages.pop((scope, key), None)
+            # The write increased the scope's generation past the newest
+            # seen, so pages still being rendered are not cached.
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+            self._counters["invalidations"] += 1
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: hits, misses, invalidations, evictions and the current size.
+        """
+        with self._lock:
+            return dict(self._counters, size=len(self._pages))
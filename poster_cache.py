@@ -0,0 +1,242 @@
+"""
+On-disk cache of poster thumbnails.
+
+Posters are fetched from their remote URL once, resized to `width` pixels
+and stored content-addressed: a thumbnail's file name is the SHA-256 of
+its bytes, which also serves as its ETag. A small reference file per
+source URL points at the thumbnail, so posters shared by several URLs are
+stored once.
+
+The cache is bounded to `max_bytes`; the least recently served
+thumbnails are evicted first. A reference whose thumbnail was evicted is
+fetched again on its next use. Files are written atomically, so several
+processes can share one directory.
+
+Resizing needs Pillow. Without it the original images are cached as they
+are.
+"""
+
+import hashlib
+import io
+import os
+import re
+import tempfile
+from concurrent.futures import Future
+from pathlib import Path
+from threading import Lock
+from typing import NamedTuple
+
+import requests
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+MAX_SOURCE_BYTES = 10 * 1024 * 1024
+
+
+class Poster(NamedTuple):
+    """
+    A cached thumbnail.
+
+    Attributes:
+        path (Path): The thumbnail file.
+        digest (str): SHA-256 of the file's bytes.
+        mimetype (str): The image's content type.
+    """
+    path: Path
+    digest: str
+    mimetype: str
+
+
+class PosterCache:
+    """
+    Size-bounded, content-addressed thumbnail cache.
+
+    Attributes:
+        directory (Path): Where thumbnails and references are stored.
+        max_bytes (int): Total size of the thumbnails kept.
+        width (int): Width of the thumbnails in pixels.
+        timeout (float): Seconds to wait for a remote poster.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024,
+                 width: int = 160, timeout: float = 5):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.width = width
+        self.timeout = timeout
+
+        (self.directory / "images").mkdir(parents=True, exist_ok=True)
+        (self.directory / "refs").mkdir(exist_ok=True)
+
+        self.session = requests.Session()
+
+        self._in_flight = {}
+        self._lock = Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0}
+        self._size = sum(path.stat().st_size
+                         for path in self._image_files())
+
+    def get(self, url: str) -> Poster:
+        """
+        Returns the thumbnail of a poster, fetching it on a cache miss.
+        Concurrent misses for one URL share a single fetch.
+
+        Parameter:
+            url (str): The remote poster URL.
+
+        Returns:
+            Poster: The cached thumbnail.
+
+        Raises:
+            RequestException: If the poster cannot be fetched.
+            ValueError: If the response is not an image.
+            OSError: If Pillow cannot decode the image.
+        """
+        poster = self._lookup(url)
+        if poster is not None:
+            with self._lock:
+                self._counters["hits"] += 1
+            return poster
+
+        with self._lock:
+            future = self._in_flight.get(url)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[url] = future
+                self._counters["misses"] += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            poster = self._store(url, *self._fetch(url))
+            future.set_result(poster)
+            return poster
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[url]
+
+    def stats(self) -> dict:
+        """
+        Returns the cache counters.
+
+        Returns:
+            dict: hits, misses, evictions and the current size in bytes.
+        """
+        with self._lock:
+            return dict(self._counters, bytes=self._size)
+
+    def close(self) -> None:
+        """Closes the pooled connections."""
+        self.session.close()
+
+    def _ref_path(self, url: str) -> Path:
+        return self.directory / "refs" / hashlib.sha256(
+            url.encode()).hexdigest()
+
+    def _image_path(self, digest: str, extension: str) -> Path:
+        return self.directory / "images" / f"{digest}.{extension}"
+
+    def _image_files(self):
+        return (path for path in (self.directory / "images").iterdir()
+                if not path.name.startswith("."))
+
+    def _lookup(self, url: str) -> Poster | None:
+        try:
+            name = self._ref_path(url).read_text()
+        except FileNotFoundError:
+            return None
+
+        path = self.directory / "images" / name
+        try:
+            # The modification time orders evictions: least recently
+            # served first.
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+
+        digest, extension = name.split(".")
+        return Poster(path, digest, f"image/{extension}")
+
+    def _fetch(self, url: str) -> tuple[bytes, str]:
+        """Downloads a poster; returns its bytes and image subtype."""
+        with self.session.get(url, timeout=self.timeout,
+                              stream=True) as response:
+            response.raise_for_status()
+            kind = re.fullmatch(r"image/(\w+)", response.headers.get(
+                "Content-Type", "").split(";")[0].strip())
+            if kind is None:
+                raise ValueError(f"Not an image: {url}")
+
+            body = io.BytesIO()
+            for chunk in response.iter_content(64 * 1024):
+                body.write(chunk)
+                if body.tell() > MAX_SOURCE_BYTES:
+                    raise ValueError(f"Poster too large: {url}")
+
+        return body.getvalue(), kind.group(1)
+
+    def _thumbnail(self, data: bytes, kind: str) -> tuple[bytes, str]:
+        """Resizes an image to `width`; returns its bytes and subtype."""
+        if Image is None:
+            return data, kind
+
+        with Image.open(io.BytesIO(data)) as image:
+            image.thumbnail((self.width, self.width * 2))
+            output = io.BytesIO()
+            image.convert("RGB").save(output, "JPEG", quality=85,
+                                      optimize=True)
+            return output.getvalue(), "jpeg"
+
+    def _store(self, url: str, data: bytes, kind: str) -> Poster:
+        thumbnail, extension = self._thumbnail(data, kind)
+        digest = hashlib.sha256(thumbnail).hexdigest()
+        path = self._image_path(digest, extension)
+
+        if not path.exists():
+            self._write(path, thumbnail)
+            with self._lock:
+                self._size += len(thumbnail)
+        self._write(self._ref_path(url), path.name.encode())
+
+        self._evict(keep=path)
+
+        return Poster(path, digest, f"image/{extension}")
+
+    def _write(self, path: Path, data: bytes) -> None:
+        fd, temp = tempfile.mkstemp(dir=path.parent, prefix=".")
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(temp, path)
+
+    def _evict(self, keep: Path) -> None:
+        with self._lock:
+            if self._size <= self.max_bytes:
+                return
+
+            # Rescan, other processes may have added or evicted files.
+            files = []
+            for path in self._image_files():
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+            files.sort(key=lambda entry: entry[0])
+            self._size = sum(size for _, size, _ in files)
+
+            for _, size, path in files:
+                if self._size <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                path.unlink(missing_ok=True)
+                self._size -= size
+                self._counters["evictions"] += 1
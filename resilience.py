@@ -0,0 +1,208 @@
+"""
+Guards for calls to an unreliable upstream service.
+
+- TokenBucket limits the request rate, e.g. to an API key's quota, while
+  allowing short bursts.
+- CircuitBreaker fails fast once the upstream keeps failing: after
+  `failure_threshold` consecutive failures it opens and rejects calls for
+  `reset_timeout` seconds, then lets a single probe through (half-open)
+  and closes again when the probe succeeds.
+
+Both refusals carry `retry_after`, the seconds until a call may go
+through again, so callers can defer work instead of polling.
+"""
+
+import time
+from threading import Condition, Lock
+
+from requests import RequestException
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class RetryLaterError(RequestException):
+    """
+    Raised when a guard refuses a call that may go through later.
+
+    Attributes:
+        retry_after (float): Seconds until a call may go through again.
+    """
+
+    def __init__(self, *args, retry_after: float = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(RetryLaterError):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class RateLimitedError(RetryLaterError):
+    """Raised when no request token becomes available in time."""
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum tokens, i.e. the largest burst.
+        clock (Callable[[], float]): Monotonic time in seconds.
+    """
+
+    def __init__(self, rate: float, capacity: float,
+                 clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._condition = Condition(Lock())
+
+    def acquire(self, timeout: float = 0) -> bool:
+        """
+        Takes one token, waiting for it at most `timeout` seconds.
+
+        Parameter:
+            timeout (float): Seconds to wait for a token.
+
+        Returns:
+            bool: True if a token was taken, False if none came in time.
+        """
+        deadline = self.clock() + timeout
+
+        with self._condition:
+            while True:
+                now = self.clock()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+
+                wait = (1 - self._tokens) / self.rate
+                if now + wait > deadline:
+                    return False
+                self._condition.wait(wait)
+
+    def tokens(self) -> float:
+        """Returns the tokens currently available."""
+        with self._condition:
+            self._refill(self.clock())
+            return self._tokens
+
+    def wait_time(self) -> float:
+        """Returns the seconds until a token is available, 0 if one is."""
+        with self._condition:
+            self._refill(self.clock())
+            return max(0.0, (1 - self._tokens) / self.rate)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity,
+                           self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker counting consecutive failures.
+
+    Attributes:
+        failure_threshold (int): Consecutive failures that open the circuit.
+        reset_timeout (float): Seconds the circuit stays open before a
+            probe is let through.
+        clock (Callable[[], float]): Monotonic time in seconds.
+    """
+
+    def __init__(self, failure_threshold: int = 5,
+                 reset_timeout: float = 30, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = Lock()
+        self._counters = {"opened": 0, "rejected": 0, "probes": 0}
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state(self.clock())
+
+    def allow(self) -> bool:
+        """
+        Asks whether a call may go through. A caller allowed in while the
+        circuit is half-open is the probe and must report its outcome.
+
+        Returns:
+            bool: False if the call must fail fast.
+        """
+        with self._lock:
+            state = self._current_state(self.clock())
+
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probing:
+                self._state = HALF_OPEN
+                self._probing = True
+                self._counters["probes"] += 1
+                return True
+
+            self._counters["rejected"] += 1
+            return False
+
+    def retry_after(self) -> float:
+        """
+        Returns the seconds until an open circuit lets a probe through, 0
+        if it is not open.
+        """
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.reset_timeout
+                       - self.clock())
+
+    def release(self) -> None:
+        """Gives up an allowed call without a result, e.g. rate limited."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        """Reports a successful call; closes a half-open circuit."""
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Reports a failed call; may open the circuit."""
+        with self._lock:
+            self._failures += 1
+            if (self._state == HALF_OPEN
+                    or self._failures >= self.failure_threshold):
+                if self._state != OPEN:
+                    self._counters["opened"] += 1
+                self._state = OPEN
+                self._opened_at = self.clock()
+            self._probing = False
+
+    def stats(self) -> dict:
+        """
+        Returns the breaker's counters.
+
+        Returns:
+            dict: opened, rejected and probes counts and the current
+            consecutive failures.
+        """
+        with self._lock:
+            return dict(self._counters, consecutive_failures=self._failures)
+
+    def _current_state(self, now: float) -> str:
+        if self._state == OPEN and now - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
@@ -0,0 +1,98 @@
+"""
+Preforked production server of MovieWebApp.
+
+Gunicorn builds the app once in the master process (`preload_app`), so
+configuration, imports and template compilation are paid for once and
+shared copy-on-write by the forked workers. The master also loads the
+title suggestion index before it forks them. After the fork every worker
+drops the connections it inherited:
+
+- the database connection pools, whose connections must not be shared
+  between processes, and
+- the keep-alive connections of the OMDB client and the poster cache.
+
+The enrichment worker starts with each worker's first request, so every
+process polls the job queue; jobs are leased, so no job runs twice. The
+page cache and the in-memory OMDB cache are per process. Cached pages are
+checked against write counters kept in the database, so a write served by
+one worker invalidates the pages cached by every worker.
+
+Usage:
+    gunicorn                  (reads gunicorn.conf.py)
+    flask --app app serve [--bind 0.0.0.0:5000] [--workers 4]
+"""
+
+import logging
+
+from flask import Flask
+
+import omdb_client
+
+logger = logging.getLogger(__name__)
+
+
+def reset_after_fork(app: Flask) -> None:
+    """
+    Drops the connections a forked worker inherited from the master.
+
+    Parameter:
+        app (Flask): The preloaded application.
+    """
+    # close=False leaves the parent's connections open for the parent and
+    # only forgets them here, as SQLAlchemy recommends for forked children.
+    app.extensions["data_manager"].dispose(close=False)
+    omdb_client.get_default_client().close()
+    app.extensions["poster_cache"].close()
+
+
+def warm_up(app: Flask) -> None:
+    """
+    Loads the title suggestion index, so the workers forked afterwards
+    share it instead of each loading it on its first suggestion.
+
+    Parameter:
+        app (Flask): The preloaded application.
+    """
+    try:
+        app.extensions["title_index"].warm()
+    except Exception as e:
+        # The index is then loaded by each worker's first suggestion.
+        logger.warning("Could not load the title index: %s", e)
+
+
+def when_ready(server) -> None:
+    """Gunicorn hook run in the master before it forks the workers."""
+    warm_up(server.app.wsgi())
+
+
+def post_fork(server, worker) -> None:
+    """Gunicorn hook run in every worker right after it was forked."""
+    reset_after_fork(worker.app.wsgi())
+    logger.info("Worker %s ready", worker.pid)
+
+
+def serve(app: Flask, bind: str, workers: int, threads: int) -> None:
+    """
+    Serves an application with preforked Gunicorn workers.
+
+    Parameters:
+        app (Flask): The application, built in this (the master) process.
+        bind (str): The address to listen on, e.g. `0.0.0.0:5000`.
+        workers (int): Number of worker processes.
+        threads (int): Threads per worker process.
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class PreforkedServer(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", bind)
+            self.cfg.set("workers", workers)
+            self.cfg.set("threads", threads)
+            self.cfg.set("preload_app", True)
+            self.cfg.set("when_ready", when_ready)
+            self.cfg.set("post_fork", post_fork)
+
+        def load(self):
+            return app
+
+    PreforkedServer().run()
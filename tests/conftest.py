@@ -0,0 +1,75 @@
+"""
+Shared fixtures: a migrated SQLite database per test and an app on it.
+
+The migrations run once per session, in a subprocess like
+`flask db upgrade`; every test gets its own copy of the result.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(scope="session")
+def migrated_database(tmp_path_factory) -> Path:
+    """An empty database with every migration applied."""
+    path = tmp_path_factory.mktemp("template") / "moviwebapp.db"
+    subprocess.run(
+        [sys.executable, "-m", "flask", "--app", "app", "db", "upgrade"],
+        cwd=ROOT, check=True, capture_output=True,
+        env=dict(os.environ, FLASK_DATABASE_PATH=str(path)))
+    return path
+
+
+@pytest.fixture
+def database(migrated_database, tmp_path) -> str:
+    """A migrated database file of the test's own."""
+    path = tmp_path / "moviwebapp.db"
+    shutil.copy(migrated_database, path)
+    return str(path)
+
+
+@pytest.fixture
+def make_app(database, tmp_path):
+    """
+    Builds apps on the test's database, with the OMDB API unreachable; two
+    of them stand for two worker processes.
+    """
+    from app import create_app
+
+    apps = []
+
+    def make_app(**config):
+        app = create_app({"TESTING": True,
+                          "DATABASE_PATH": database,
+                          "POSTER_CACHE_DIR": str(tmp_path / "posters"),
+                          "OMDB_API_URL": "http://127.0.0.1:9/",
+                          "PRECOMPILE_TEMPLATES": False,
+                          **config})
+        apps.append(app)
+        return app
+
+    yield make_app
+
+    for app in apps:
+        app.extensions["enrichment_worker"].stop(timeout=5)
+        app.extensions["data_manager"].close()
+        app.extensions["data_manager"].dispose()
+
+
+@pytest.fixture
+def app(make_app):
+    """The app on the test's database, with the OMDB API unreachable."""
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,229 @@
+"""
+Behaviour every data manager must share, run against each backend:
+- sqlite: SQLiteDataManager on a migrated database, with FTS search and
+  statistics kept by triggers;
+- sqlalchemy: SQLAlchemyDataManager on a SQLite URL, schema created by
+  `create_schema`;
+- postgresql: SQLAlchemyDataManager on the database of
+  `TEST_POSTGRESQL_URL`, e.g. a throwaway container; skipped if unset.
+  Every table of the schema is dropped afterwards.
+"""
+
+import os
+import zlib
+
+import pytest
+
+from datamanager.sqlalchemy_data_manager import SQLAlchemyDataManager
+from datamanager.sqlite_data_manager import SQLiteDataManager
+from models import Movie, User, db
+
+POSTGRESQL_URL = os.environ.get("TEST_POSTGRESQL_URL")
+
+
+def omdb_payload(title: str) -> dict:
+    return {"Response": "True", "Title": title, "Year": "1995",
+            "imdbRating": "8.0", "Director": f"Director of {title}",
+            "Poster": "N/A", "imdbID": f"tt{zlib.crc32(title.encode())}"}
+
+
+@pytest.fixture(params=[
+    "sqlite",
+    "sqlalchemy",
+    pytest.param("postgresql", marks=pytest.mark.skipif(
+        not POSTGRESQL_URL, reason="TEST_POSTGRESQL_URL is not set")),
+])
+def data_manager(request, database, tmp_path):
+    if request.param == "sqlite":
+        data_manager = SQLiteDataManager(database)
+    elif request.param == "sqlalchemy":
+        data_manager = SQLAlchemyDataManager(
+            f"sqlite:///{tmp_path / 'generic.db'}")
+        data_manager.create_schema()
+    else:
+        data_manager = SQLAlchemyDataManager(POSTGRESQL_URL)
+        db.metadata.drop_all(data_manager.engine)
+        data_manager.create_schema()
+
+    data_manager.omdb_cache.fetch = omdb_payload
+    yield data_manager
+
+    data_manager.close()
+    if request.param == "postgresql":
+        db.metadata.drop_all(data_manager.engine)
+    data_manager.dispose()
+
+
+def add_user(data_manager, name: str) -> int:
+    data_manager.add_user(User(name=name))
+    return data_manager.search_users(name)[0].id
+
+
+def add_movie(data_manager, user_id: int, title: str, **edits) -> int:
+    """Adds a movie found through the OMDB stub, then saves `edits`."""
+    movie = data_manager.get_user_from_api(title)
+    movie.user_id = user_id
+    movie.name = title
+    data_manager.add_movie(movie)
+    movie_id = next(row.id for row in data_manager.iter_user_movies(user_id)
+                    if row.name == title)
+
+    if edits:
+        row = data_manager.get_movie(movie_id)
+        values = {"director": row.director, "year": row.year,
+                  "rating": row.rating, **edits}
+        data_manager.update_movie(Movie(id=movie_id, user_id=user_id,
+                                        name=title, **values))
+    return movie_id
+
+
+def test_users_are_paged_by_name(data_manager):
+    # Capitalized alike, so any collation sorts them the same.
+    for name in ("Carol", "Alice", "Bob", "Dave", "Erin"):
+        add_user(data_manager, name)
+
+    names = [user.name for user in data_manager.get_all_users()]
+    first = data_manager.get_all_users(limit=2)
+    after = data_manager.get_all_users(
+        after=(first[-1].name, first[-1].id), limit=2)
+    before = data_manager.get_all_users(
+        before=(after[0].name, after[0].id), limit=2)
+
+    assert names == sorted(names)
+    assert [user.name for user in first + after] == names[:4]
+    assert before == first
+
+
+def test_user_movies_are_paged_and_streamed(data_manager):
+    user_id = add_user(data_manager, "Alice")
+    other_id = add_user(data_manager, "Bob")
+    for title in ("Ran", "Heat", "Alien", "Brazil", "Fargo"):
+        add_movie(data_manager, user_id, title)
+    add_movie(data_manager, other_id, "Heat")
+
+    movies = data_manager.get_user_movies(user_id)
+    first = data_manager.get_user_movies(user_id, limit=3)
+    rest = data_manager.get_user_movies(
+        user_id, after=(first[-1].name, first[-1].id))
+
+    assert [movie.name for movie in movies] == \
+        ["Ran", "Heat", "Fargo", "Brazil", "Alien"]
+    assert first + rest == movies
+    assert [movie.id for movie in data_manager.iter_user_movies(
+        user_id, batch_size=2)] == [movie.id for movie in movies[::-1]]
+    assert data_manager.get_user_movie_titles(user_id) == \
+        {"alien", "brazil", "fargo", "heat", "ran"}
+
+
+def test_movies_show_user_edits_over_the_catalogue(data_manager):
+    user_id = add_user(data_manager, "Alice")
+    movie_id = add_movie(data_manager, user_id, "Heat", rating=9.5)
+
+    movie = data_manager.get_movie(movie_id)
+
+    assert (movie.name, movie.director, movie.year, movie.rating) == \
+        ("Heat", "Director of Heat", 1995, 9.5)
+    assert data_manager.get_catalog_movie("heat") is not None
+    assert data_manager.get_movie(movie_id + 1000) is None
+
+
+def test_update_movie_keeps_owner(data_manager):
+    owner_id = add_user(data_manager, "Alice")
+    other_id = add_user(data_manager, "Bob")
+    movie_id = add_movie(data_manager, owner_id, "Heat")
+
+    data_manager.update_movie(Movie(id=movie_id, user_id=owner_id,
+                                    name="Heat (1995)", director="Mann",
+                                    year=1995, rating=7.0))
+    data_manager.update_movie(Movie(id=movie_id, user_id=other_id,
+                                    name="Stolen", director="Nobody",
+                                    year=2000, rating=1.0))
+
+    movie = data_manager.get_movie(movie_id)
+    assert (movie.user_id, movie.name, movie.director, movie.rating) == \
+        (owner_id, "Heat (1995)", "Mann", 7.0)
+
+
+def test_search(data_manager):
+    user_id = add_user(data_manager, "Alice")
+    add_movie(data_manager, user_id, "The Dark Knight")
+    add_movie(data_manager, user_id, "Heat")
+    add_user(data_manager, "Alfred")
+
+    assert [row.name for row in data_manager.search("dark kni")] == \
+        ["The Dark Knight"]
+    assert [row.username for row in data_manager.search("director heat")] \
+        == ["Alice"]
+    assert data_manager.search("!!") == []
+    assert [user.name for user in data_manager.search_users("Al")] == \
+        ["Alfred", "Alice"]
+
+
+def test_user_stats_follow_writes(data_manager):
+    user_id = add_user(data_manager, "Alice")
+    empty_id = add_user(data_manager, "Bob")
+    add_movie(data_manager, user_id, "Heat", rating=9.0)
+    add_movie(data_manager, user_id, "Ran", rating=7.0,
+              director="Director of Heat")
+    movie_id = add_movie(data_manager, user_id, "Alien", rating=2.0)
+    data_manager.delete_movies(movie_id)
+
+    stats = data_manager.get_user_stats([user_id, empty_id])
+
+    assert list(stats) == [user_id]
+    assert stats[user_id].movie_count == 2
+    assert stats[user_id].mean_rating == pytest.approx(8.0)
+    assert stats[user_id].top_directors[0] == "Director of Heat"
+    assert data_manager.rebuild_user_stats(check_only=True) == []
+
+
+def test_enrichment_jobs(data_manager):
+    user_id = add_user(data_manager, "Alice")
+    data_manager.add_pending_movie(Movie(user_id=user_id, name="Brazil"))
+
+    jobs = data_manager.claim_enrichment_jobs(10, lease=60)
+    assert [job.title for job in jobs] == ["Brazil"]
+    assert data_manager.claim_enrichment_jobs(10, lease=60) == []
+
+    data_manager.complete_enrichment_job(
+        jobs[0], data_manager.get_user_from_api("Brazil"), "ready")
+
+    movie = data_manager.get_user_movies(user_id)[0]
+    assert (movie.status, movie.director) == ("ready", "Director of Brazil")
+    assert "Brazil" in set(data_manager.iter_titles())
+
+
+def test_deletes(data_manager):
+    user_id = add_user(data_manager, "Alice")
+    other_id = add_user(data_manager, "Bob")
+    movie_ids = [add_movie(data_manager, user_id, title)
+                 for title in ("Alien", "Brazil", "Fargo")]
+    other_movie_id = add_movie(data_manager, other_id, "Heat")
+    data_manager.add_pending_movie(Movie(user_id=user_id, name="Ran"))
+
+    assert data_manager.delete_movies([movie_ids[0], other_movie_id],
+                                      user_id=user_id) == 1
+    assert data_manager.get_movie(other_movie_id) is not None
+    assert data_manager.delete_user_movies(other_id) == 1
+
+    assert data_manager.delete_user(user_id) is True
+    assert data_manager.delete_user(user_id) is False
+    assert data_manager.get_user(user_id) is None
+    # The user's movies and enrichment jobs go with the user.
+    assert data_manager.get_movie(movie_ids[1]) is None
+    assert data_manager.claim_enrichment_jobs(10, lease=60) == []
+    assert data_manager.get_user_stats([user_id]) == {}
+
+
+def test_writes_notify_listeners(data_manager):
+    scopes, titles = [], []
+    data_manager.add_write_listener(lambda *scope: scopes.append(scope))
+    data_manager.add_title_listener(titles.extend)
+
+    user_id = add_user(data_manager, "Alice")
+    add_movie(data_manager, user_id, "Heat")
+    data_manager.delete_user(user_id)
+
+    assert ("users",) in scopes
+    assert ("user", user_id) in scopes
+    assert "Heat" in titles
@@ -0,0 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import enrichment
+from enrichment import EnrichmentWorker
+
+
+class ClosedExecutor(ThreadPoolExecutor):
+    """An executor refusing work like one at interpreter exit."""
+
+    def submit(self, fn, /, *args, **kwargs):
+        raise RuntimeError("cannot schedule new futures after interpreter "
+                           "shutdown")
+
+
+class QueueStub:
+    def claim_enrichment_jobs(self, limit, lease):
+        return [SimpleNamespace(id=1, title="Heat", attempts=0)]
+
+    def close(self):
+        pass
+
+
+def test_dispatcher_exits_when_executor_refuses_jobs(monkeypatch):
+    monkeypatch.setattr(enrichment, "ThreadPoolExecutor", ClosedExecutor)
+    worker = EnrichmentWorker(QueueStub(), poll_interval=0.01)
+
+    worker._run()
+
+    assert worker._in_flight == 0
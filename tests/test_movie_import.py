@@ -0,0 +1,44 @@
+from models import Movie
+from movie_import import ImportResult, import_titles
+from resilience import CircuitOpenError, RateLimitedError
+
+
+class DataManagerStub:
+    """Finds every title except those the OMDB client would refuse."""
+
+    def __init__(self):
+        self.added = []
+        self.pending = []
+
+    def get_user_movie_titles(self, user_id):
+        return set()
+
+    def get_user_from_api(self, title):
+        if title == "Broken":
+            raise CircuitOpenError("omdb circuit is open")
+        if title.startswith("Extra"):
+            raise RateLimitedError("omdb rate limit reached")
+        return Movie(catalog_movie_id=1)
+
+    def add_movies(self, movies):
+        self.added.extend(movies)
+
+    def add_pending_movie(self, movie):
+        self.pending.append(movie)
+
+
+def test_refused_lookups_are_queued():
+    data_manager = DataManagerStub()
+    titles = ["Heat", "Ran", "Extra 1", "Extra 2", "Broken"]
+
+    results = import_titles(data_manager, 7, titles, max_workers=2)
+
+    assert results == [
+        ImportResult("Heat", "added"),
+        ImportResult("Ran", "added"),
+        ImportResult("Extra 1", "queued", "RateLimitedError"),
+        ImportResult("Extra 2", "queued", "RateLimitedError"),
+        ImportResult("Broken", "queued", "CircuitOpenError"),
+    ]
+    assert [(movie.user_id, movie.name) for movie in data_manager.pending] \
+        == [(7, "Extra 1"), (7, "Extra 2"), (7, "Broken")]
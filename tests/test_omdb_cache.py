@@ -0,0 +1,137 @@
+import pytest
+import requests
+import sqlalchemy
+from sqlalchemy import create_engine, false, select
+
+import omdb_cache
+from api_util import MovieNotFoundError
+from models import OmdbCacheEntry
+from omdb_cache import OmdbCache
+
+HEAT = {"Response": "True", "Title": "Heat", "Director": "Michael Mann"}
+NOT_FOUND = {"Response": "False", "Error": "Movie not found!"}
+
+
+class FetchStub:
+    """Answers titles starting with 'zz' as unknown, or fails if told to."""
+
+    def __init__(self):
+        self.titles = []
+        self.failing = False
+
+    def __call__(self, title):
+        self.titles.append(title)
+        if self.failing:
+            raise requests.ConnectionError("OMDB API is unreachable")
+        if title.startswith("zz"):
+            return NOT_FOUND
+        return dict(HEAT, Title=title)
+
+
+@pytest.fixture
+def engine(database):
+    engine = create_engine(f"sqlite:///{database}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """The cache's wall clock, moved forward by adding to `now[0]`."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(omdb_cache.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def fetch():
+    return FetchStub()
+
+
+def test_entries_expire_after_their_ttl(engine, clock, fetch):
+    cache = OmdbCache(engine, ttl=100, fetch=fetch)
+
+    cache.lookup("Heat")
+    clock[0] += 99
+    cache.lookup("heat")
+    clock[0] += 1
+    cache.lookup("Heat")
+
+    assert fetch.titles == ["Heat", "Heat"]
+    assert cache.stats() == dict(hits=1, persistent_hits=0, misses=2,
+                                 evictions=0, expirations=1, stale_hits=0,
+                                 size=1)
+
+
+def test_unknown_titles_are_cached_for_the_negative_ttl(engine, clock,
+                                                        fetch):
+    cache = OmdbCache(engine, ttl=100, negative_ttl=10, fetch=fetch)
+
+    for _ in range(2):
+        with pytest.raises(MovieNotFoundError):
+            cache.get_movie("zz top")
+    assert fetch.titles == ["zz top"]
+
+    clock[0] += 10
+    assert cache.lookup("zz top") == NOT_FOUND
+    assert fetch.titles == ["zz top", "zz top"]
+    assert cache.stats()["expirations"] == 1
+    # Found titles are not in the negative cache.
+    assert list(cache.titles()) == []
+
+
+def test_least_recently_used_entries_are_evicted(engine, clock, fetch):
+    cache = OmdbCache(engine, max_entries=2, fetch=fetch)
+
+    for title in ("Heat", "Ran", "Heat", "Alien"):
+        cache.lookup(title)
+    assert cache.stats()["evictions"] == 1
+
+    # Ran was evicted from the LRU, but is still in the table.
+    cache.lookup("Ran")
+    cache.lookup("Alien")
+
+    assert fetch.titles == ["Heat", "Ran", "Alien"]
+    assert cache.stats() == dict(hits=2, persistent_hits=1, misses=3,
+                                 evictions=2, expirations=0, stale_hits=0,
+                                 size=2)
+
+
+def test_expired_entries_are_served_when_the_api_fails(engine, clock, fetch):
+    OmdbCache(engine, ttl=100, fetch=fetch).lookup("Heat")
+    clock[0] += 1000
+    fetch.failing = True
+
+    # A new process, whose only copy is the expired row in the table.
+    cache = OmdbCache(engine, ttl=100, fetch=fetch)
+    assert cache.lookup("Heat")["Title"] == "Heat"
+    with pytest.raises(requests.ConnectionError):
+        cache.lookup("Ran")
+
+    assert cache.stats()["stale_hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+    # Failures are not cached; the next lookup tries the API again.
+    fetch.failing = False
+    cache.lookup("Ran")
+    assert fetch.titles == ["Heat", "Heat", "Ran", "Ran"]
+
+
+def test_store_tolerates_concurrent_store(database, monkeypatch):
+    engine = create_engine(f"sqlite:///{database}")
+    try:
+        OmdbCache(engine, fetch=lambda title: HEAT).lookup("Heat")
+
+        # Another process inserting the key between the DELETE and the
+        # INSERT looks like a DELETE that found nothing.
+        monkeypatch.setattr(omdb_cache, "delete", lambda table: (
+            sqlalchemy.delete(table).where(false())))
+        payload = OmdbCache(engine, fetch=lambda title: HEAT, ttl=0) \
+            .lookup("Heat")
+
+        assert payload == HEAT
+        with engine.connect() as connection:
+            assert connection.execute(
+                select(OmdbCacheEntry.title_key)).scalars().all() == ["heat"]
+    finally:
+        engine.dispose()
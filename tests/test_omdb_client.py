@@ -0,0 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
+
+import omdb_client
+from benchmarks.common import StubOmdbServer
+from omdb_client import OmdbClient, normalize_title
+
+LOOKUPS = 8
+
+
+def test_concurrent_lookups_of_a_title_share_one_request():
+    # The latency keeps the first request in flight until every thread
+    # has asked for the title.
+    with StubOmdbServer(latency=0.5) as stub:
+        client = OmdbClient(api_key="test", base_url=stub.url)
+        coalesced = omdb_client.COALESCED.value()
+        barrier = Barrier(LOOKUPS)
+
+        def lookup(title):
+            barrier.wait()
+            return client.fetch(title)
+
+        with ThreadPoolExecutor(LOOKUPS) as executor:
+            payloads = list(executor.map(
+                lookup, ["Heat", "heat", " HEAT "] * 2 + ["Heat"] * 2))
+
+    assert stub.requests == 1
+    assert all(payload == payloads[0] for payload in payloads)
+    assert normalize_title(payloads[0]["Title"]) == "heat"
+    assert omdb_client.COALESCED.value() - coalesced == LOOKUPS - 1
+    assert client._in_flight == {}
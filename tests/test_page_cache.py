@@ -0,0 +1,140 @@
+"""
+Page cache invalidation, validators and the generation check. Two apps on
+one database stand for two Gunicorn workers.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app import cached_page
+from models import CatalogMovie, Movie, User
+from page_cache import PageCache
+
+# The cached pages of the `cached` fixture, by scope.
+PAGES = {("users",): "/users", ("user", 1): "/users/1",
+         ("user", 2): "/users/2"}
+
+
+def test_writes_invalidate_the_pages_cached_by_other_workers(make_app):
+    worker_a, worker_b = make_app(), make_app()
+    data_manager = worker_a.extensions["data_manager"]
+    data_manager.add_user(User(name="Alice"))
+    reader = worker_b.test_client()
+
+    assert b"Alice" in reader.get("/users").data
+    assert b"Heat" not in reader.get("/users/1").data
+
+    worker_a.test_client().post("/users/1/add_movie", data={"name": "Heat"})
+
+    assert b"Heat" in reader.get("/users/1").data
+    assert worker_b.extensions["page_cache"].stats()["hits"] == 0
+
+
+def test_enrichment_in_another_worker_ends_the_pending_page(make_app):
+    worker_a, worker_b = make_app(), make_app()
+    data_manager = worker_a.extensions["data_manager"]
+    data_manager.add_user(User(name="Alice"))
+    movie = Movie(user_id=1, name="Heat")
+    data_manager.add_pending_movie(movie)
+    reader = worker_b.test_client()
+    assert b'http-equiv="refresh"' in reader.get("/users/1").data
+
+    # As worker A's enrichment worker would; OMDB is unreachable here.
+    data_manager.complete_enrichment_job(
+        SimpleNamespace(id=1, movie_id=movie.id, attempts=0), None,
+        "not_found")
+
+    assert b'http-equiv="refresh"' not in reader.get("/users/1").data
+
+
+def add_film(data_manager) -> None:
+    data_manager.session.add(CatalogMovie(
+        imdb_id="tt0113277", title="Heat", director="Michael Mann",
+        year=1995, rating=8.3, poster="N/A"))
+    data_manager.session.commit()
+
+
+@pytest.fixture
+def cached(app, client):
+    """Alice (1) with Heat (1), Bob (2), and their pages cached."""
+    data_manager = app.extensions["data_manager"]
+    add_film(data_manager)
+    for name in ("Alice", "Bob"):
+        data_manager.add_user(User(name=name))
+    client.post("/users/1/add_movie", data={"name": "Heat"})
+    for path in PAGES.values():
+        client.get(path)
+    return data_manager
+
+
+@pytest.mark.parametrize("method, path, form, written", [
+    ("POST", "/add_user", {"name": "Carol"}, [("users",)]),
+    ("POST", "/users/1/add_movie", {"name": "Heat"},
+     [("users",), ("user", 1)]),
+    ("POST", "/users/1/update_movie/1",
+     {"id": 1, "name": "Heat", "director": "Mann", "year": 1995,
+      "rating": 9}, [("users",), ("user", 1)]),
+    ("GET", "/users/1/delete_movie/1", None, [("users",), ("user", 1)]),
+    ("POST", "/users/1/delete_movies", {"all": "1"},
+     [("users",), ("user", 1)]),
+    ("POST", "/users/2/delete", None, [("users",), ("user", 2)]),
+])
+def test_writes_invalidate_exactly_their_scopes(app, client, cached, method,
+                                                path, form, written):
+    before = {scope: cached.get_page_generation(scope) for scope in PAGES}
+    bodies = {scope: client.get(page).data for scope, page in PAGES.items()}
+    hits = app.extensions["page_cache"].stats()["hits"]
+
+    client.open(path, method=method, data=form)
+
+    assert [scope for scope in PAGES
+            if cached.get_page_generation(scope) != before[scope]] == written
+    for scope, page in PAGES.items():
+        if scope not in written:
+            assert client.get(page).data == bodies[scope]
+    assert app.extensions["page_cache"].stats()["hits"] == \
+        hits + len(PAGES) - len(written)
+
+
+def test_pages_are_not_modified_until_the_next_write(app, client, cached):
+    etag = client.get("/users/1").headers["ETag"]
+
+    assert client.get("/users/1", headers={
+        "If-None-Match": etag}).status_code == 304
+    client.post("/users/2/add_movie", data={"name": "Heat"})
+    assert client.get("/users/1", headers={
+        "If-None-Match": etag}).status_code == 304
+
+    client.post("/users/1/add_movie", data={"name": "Heat"})
+    response = client.get("/users/1", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+def test_pages_rendered_during_a_write_are_not_stored(app, cached):
+    page_cache = app.extensions["page_cache"]
+    page_cache.invalidate("user", 1)  # so the page is rendered
+
+    def render():
+        cached.add_movie(Movie(user_id=1, name="Heat",
+                               catalog_movie_id=1))
+        return "rendered before the write"
+
+    with app.test_request_context("/users/1"):
+        response = cached_page(("user", 1), render)
+
+    assert response.get_data() == b"rendered before the write"
+    generation, _ = cached.get_page_generation(("user", 1))
+    assert page_cache.get(("user", 1), "/users/1?", generation) is None
+    # Only Bob's page is left; the write dropped the user list's.
+    assert page_cache.stats()["size"] == 1
+
+
+def test_pages_are_not_stored_under_a_newer_generation_seen():
+    page_cache = PageCache()
+    assert page_cache.get(("users",), "/users?", 2) is None
+
+    page_cache.put(("users",), "/users?", "old", 1, 0)
+
+    assert page_cache.stats()["size"] == 0
@@ -0,0 +1,26 @@
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from datamanager.pagination import parse_page_args
+
+
+def test_parse_page_args_defaults():
+    assert parse_page_args(MultiDict(), 50, 200) == (None, None, 50)
+
+
+def test_parse_page_args_reads_cursors():
+    args = MultiDict({"after": "Heat, The,42", "before": "Ran,7"})
+    assert parse_page_args(args, 50, 200) == (("Heat, The", 42), ("Ran", 7),
+                                              50)
+
+
+@pytest.mark.parametrize("limit, expected", [
+    ("10", 10), ("0", 1), ("-5", 1), ("1000", 200), ("many", 50)])
+def test_parse_page_args_clamps_limit(limit, expected):
+    assert parse_page_args(MultiDict({"limit": limit}), 50, 200)[2] \
+        == expected
+
+
+def test_parse_page_args_rejects_malformed_cursor():
+    with pytest.raises(ValueError):
+        parse_page_args(MultiDict({"after": "Heat"}), 50, 200)
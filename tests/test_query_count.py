@@ -0,0 +1,58 @@
+"""
+The listing pages must run the same number of SQL statements however many
+rows they show; a count growing with the rows is an N+1 query pattern.
+"""
+
+import pytest
+
+from datamanager.query_metrics import count_queries
+from models import CatalogMovie, Movie, User
+
+
+def add_rows(data_manager, users: int, movies_per_user: int) -> None:
+    """Adds users, and movies to each user, linked to one catalogue film."""
+    film = data_manager.get_catalog_movie("Heat")
+    if film is None:
+        data_manager.session.add(CatalogMovie(
+            imdb_id="tt0113277", title="Heat", director="Michael Mann",
+            year=1995, rating=8.3, poster="N/A"))
+        data_manager.session.commit()
+        film = data_manager.get_catalog_movie("Heat")
+
+    for i in range(users):
+        data_manager.add_user(User(name=f"user {i} of {users}"))
+    for user in data_manager.get_all_users():
+        data_manager.add_movies([
+            Movie(user_id=user.id, catalog_movie_id=film.catalog_movie_id,
+                  name=f"Movie {j} of {movies_per_user}",
+                  director=f"Director {j}")
+            for j in range(movies_per_user)])
+    data_manager.close()
+
+
+def statements(app, path: str, endpoint: str, **view_args) -> int:
+    """Renders a page outside the page cache and counts its statements."""
+    app.extensions["page_cache"].ttl = 0
+    with app.test_request_context(path), count_queries() as count:
+        response = app.view_functions[endpoint](**view_args)
+    assert response.status_code == 200
+    app.extensions["data_manager"].close()
+    return count.value
+
+
+@pytest.mark.parametrize("path, endpoint, view_args", [
+    ("/users", "main.list_users", {}),
+    ("/users/1", "main.get_users_favorite_movies", {"user_id": 1}),
+])
+def test_page_statements_do_not_grow_with_rows(app, path, endpoint,
+                                               view_args):
+    data_manager = app.extensions["data_manager"]
+
+    add_rows(data_manager, users=1, movies_per_user=1)
+    one_row = statements(app, path, endpoint, **view_args)
+
+    add_rows(data_manager, users=29, movies_per_user=20)
+    many_rows = statements(app, path, endpoint, **view_args)
+
+    assert one_row > 0
+    assert many_rows == one_row
@@ -0,0 +1,33 @@
+"""
+The listing queries must be answered from their indexes: a user's movies
+from ix_user_movie_user_id_name, in index order, without sorting.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+
+from datamanager.sqlalchemy_data_manager import user_movies_query
+
+
+def query_plan(database: str, query) -> str:
+    engine = create_engine(f"sqlite:///{database}")
+    statement = query.compile(engine, compile_kwargs={"literal_binds": True})
+    try:
+        with engine.connect() as connection:
+            rows = connection.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}").all()
+    finally:
+        engine.dispose()
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.parametrize("page", [
+    {},
+    {"after": ("Heat", 42)},
+    {"before": ("Heat", 42)},
+])
+def test_user_movies_query_uses_index(database, page):
+    plan = query_plan(database, user_movies_query(1, limit=51, **page))
+
+    assert "USING INDEX ix_user_movie_user_id_name" in plan
+    assert "TEMP B-TREE" not in plan
@@ -0,0 +1,69 @@
+"""
+Read-your-writes with a read replica: a file copy of the primary that is
+never updated, so every read shows whether it went to the replica. Two
+apps on one database stand for two Gunicorn workers.
+"""
+
+import sqlite3
+import time
+
+import pytest
+
+from app import PRIMARY_COOKIE
+from models import Movie, User
+
+LAG = 1
+
+
+@pytest.fixture
+def workers(make_app, database, tmp_path):
+    """A writing and a reading worker, sharing the primary and a replica."""
+    primary = make_app()
+    data_manager = primary.extensions["data_manager"]
+    data_manager.add_user(User(name="Alice"))
+    data_manager.add_pending_movie(Movie(user_id=1, name="Heat"))
+
+    replica = str(tmp_path / "replica.db")
+    with sqlite3.connect(database) as source, \
+            sqlite3.connect(replica) as target:
+        source.backup(target)
+
+    config = {"DATABASE_REPLICAS": [replica], "DATABASE_REPLICA_LAG": LAG}
+    return make_app(**config), make_app(**config)
+
+
+def test_writer_reads_its_writes_until_the_lag_passed(workers):
+    writing, reading = workers
+    writer = writing.test_client()
+    reader = reading.test_client()
+
+    writer.post("/add_user", data={"name": "Bob"})
+    cookie = writer.get_cookie(PRIMARY_COOKIE)
+    assert float(cookie.value) > time.time()
+
+    # Another client reads the stale replica, whichever worker serves it.
+    assert b"Bob" not in reader.get("/users").data
+    # The writer reads the primary, on the other worker too.
+    writer_on_reading = reading.test_client()
+    writer_on_reading.set_cookie(PRIMARY_COOKIE, cookie.value)
+    assert b"Bob" in writer_on_reading.get("/users").data
+    assert b"Bob" in writer_on_reading.get("/users/2").data
+
+    time.sleep(LAG + 0.1)
+
+    assert b"Bob" not in writer_on_reading.get("/users").data
+
+
+def test_movie_reads_follow_the_process_writes(workers):
+    writing, reading = workers
+    data_manager = writing.extensions["data_manager"]
+
+    data_manager.update_movie(Movie(id=1, user_id=1, name="Heat (1995)",
+                                    director="Michael Mann", year=1995,
+                                    rating=8.3))
+    # A later request of another client, e.g. for the edit form or poster.
+    data_manager.close()
+
+    assert data_manager.get_movie(1, user_id=1).name == "Heat (1995)"
+    assert data_manager.get_movie(1).name == "Heat (1995)"
+    assert reading.extensions["data_manager"].get_movie(1).name == "Heat"
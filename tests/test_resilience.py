@@ -0,0 +1,113 @@
+from types import SimpleNamespace
+
+import pytest
+
+from enrichment import EnrichmentWorker
+from omdb_client import OmdbClient
+from resilience import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker,
+                        CircuitOpenError, RateLimitedError, TokenBucket)
+
+
+class FakeClock:
+    """A monotonic clock that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def test_token_bucket_refills_at_its_rate():
+    clock = FakeClock()
+    # 1000 requests a day, in bursts of two.
+    bucket = TokenBucket(rate=1000 / 86400, capacity=2, clock=clock)
+
+    assert bucket.acquire() and bucket.acquire()
+    assert not bucket.acquire()
+    assert bucket.wait_time() == pytest.approx(86.4)
+
+    clock.advance(80)
+    assert not bucket.acquire()
+    assert bucket.wait_time() == pytest.approx(6.4)
+
+    clock.advance(6.4)
+    assert bucket.wait_time() == 0
+    assert bucket.acquire()
+
+
+def test_circuit_breaker_opens_then_lets_one_probe_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30,
+                             clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.retry_after() == 0
+    breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow()
+    assert breaker.retry_after() == 30
+
+    clock.advance(20)
+    assert breaker.retry_after() == 10
+
+    clock.advance(10)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.allow()
+
+
+def test_client_refusals_carry_the_time_until_calls_go_through():
+    clock = FakeClock()
+    client = OmdbClient(api_key="test", timeout=0)
+    client.rate_limiter = TokenBucket(rate=0.5, capacity=1, clock=clock)
+    client.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30,
+                                    clock=clock)
+
+    client.rate_limiter.acquire()
+    with pytest.raises(RateLimitedError) as limited:
+        client.request("Heat")
+    client.breaker.record_failure()
+    clock.advance(5)
+    with pytest.raises(CircuitOpenError) as open_circuit:
+        client.request("Heat")
+
+    assert limited.value.retry_after == pytest.approx(2)
+    assert open_circuit.value.retry_after == pytest.approx(25)
+
+
+class RefusingDataManager:
+    """Refuses every lookup, recording how the job is rescheduled."""
+
+    def __init__(self, error):
+        self.error = error
+        self.retries = []
+
+    def get_user_from_api(self, title):
+        raise self.error
+
+    def retry_enrichment_job(self, job_id, attempts, run_after, error):
+        self.retries.append((job_id, attempts, run_after, error))
+
+
+@pytest.mark.parametrize("error, delay", [
+    (RateLimitedError("rate limited", retry_after=86.4), 86.4),
+    (CircuitOpenError("circuit open", retry_after=25), 25),
+    # A probe is already in flight; check again after the backoff.
+    (CircuitOpenError("circuit open", retry_after=0), 2),
+])
+def test_refused_jobs_are_deferred_until_calls_go_through(monkeypatch, error,
+                                                          delay):
+    monkeypatch.setattr("enrichment.time.time", lambda: 5000.0)
+    data_manager = RefusingDataManager(error)
+    worker = EnrichmentWorker(data_manager, backoff=2)
+
+    worker._enrich(SimpleNamespace(id=1, title="Heat", attempts=3))
+
+    assert data_manager.retries == [
+        (1, 3, pytest.approx(5000 + delay), type(error).__name__)]
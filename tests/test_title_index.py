@@ -0,0 +1,75 @@
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event
+from types import SimpleNamespace
+
+import pytest
+
+import server
+import title_index
+from title_index import TitleIndex
+
+
+def test_warm_loads_once_before_the_first_lookup():
+    loads = []
+    index = TitleIndex(lambda: loads.append(1) or ["Heat", "Heathers"])
+
+    index.warm()
+    index.warm()
+
+    assert index.suggest("hea") == ["Heat", "Heathers"]
+    assert len(loads) == 1
+
+
+def test_warm_up_leaves_a_failed_load_to_the_first_lookup():
+    def load():
+        if not attempts:
+            attempts.append(1)
+            raise OSError("database is unavailable")
+        return ["Heat"]
+
+    attempts = []
+    app = SimpleNamespace(extensions={"title_index": TitleIndex(load)})
+
+    server.warm_up(app)
+
+    assert app.extensions["title_index"].suggest("he") == ["Heat"]
+
+
+def test_titles_are_kept_aside_only_while_a_load_runs():
+    def load():
+        index.add(["Heathers"])
+        raise OSError("database is unavailable")
+
+    index = TitleIndex(load)
+    index.add(["Heat"] * 100)
+    assert index._pending == []
+
+    for _ in range(3):
+        with pytest.raises(OSError):
+            index.suggest("hea")
+    assert index._pending == []
+
+
+def test_a_stale_index_is_reloaded_once(monkeypatch):
+    loads = []
+    reloading, release = Event(), Event()
+
+    def load():
+        loads.append(1)
+        if len(loads) > 1:
+            reloading.set()
+            release.wait(5)
+        return ["Heat"]
+
+    index = TitleIndex(load, max_age=60)
+    index.warm()
+    monkeypatch.setattr(title_index.time, "monotonic",
+                        lambda: index._loaded_at + 61)
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(index.suggest, ["he"] * 32))
+    assert reloading.wait(5)
+    release.set()
+
+    assert results == [["Heat"]] * 32
+    assert len(loads) == 2
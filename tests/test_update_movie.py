@@ -0,0 +1,23 @@
+"""
+Editing a movie through another user's URL must not move it to that user.
+"""
+
+from models import Movie, User
+
+
+def test_update_movie_keeps_owner(app, client):
+    data_manager = app.extensions["data_manager"]
+    data_manager.add_user(User(name="Alice"))
+    data_manager.add_user(User(name="Bob"))
+    data_manager.add_pending_movie(Movie(user_id=1, name="Heat"))
+    movie_id = data_manager.get_user_movies(1)[0].id
+
+    response = client.post(f"/users/2/update_movie/{movie_id}", data={
+        "id": movie_id, "name": "Stolen", "director": "Nobody",
+        "year": "2000", "rating": "1"})
+
+    assert response.status_code == 302
+    movie = data_manager.get_movie(movie_id)
+    assert movie.user_id == 1
+    assert movie.name == "Heat"
+    assert data_manager.get_user_movies(2) == []
@@ -0,0 +1,159 @@
+"""
+In-process prefix index of movie titles for autocompletion.
+
+Titles are kept in one list of `(key, title)` pairs sorted by key, the
+normalized title (see `normalize_title`). A lookup bisects to the first
+key at or after the typed prefix and reads on while keys start with it,
+so answering costs O(log n) plus the suggestions returned, without a
+database query or an OMDB call.
+
+The index is loaded on its first use from `load`, e.g. every title the
+database knows, or ahead of it by `warm`, and kept current by `add` as
+titles are written. It is per process; to pick up titles written by other
+processes it is reloaded in the background once it is older than `max_age`
+seconds, while the old index keeps answering.
+"""
+
+import time
+from bisect import bisect_left, insort
+from threading import Lock, Thread
+from typing import Callable, Iterable
+
+from omdb_client import normalize_title
+
+
+class TitleIndex:
+    """
+    Sorted-array prefix index of titles.
+
+    Attributes:
+        load (Callable[[], Iterable[str]]): Returns every title to index.
+        max_age (float | None): Seconds after which the index is reloaded;
+            None never reloads it.
+    """
+
+    def __init__(self, load: Callable[[], Iterable[str]],
+                 max_age: float | None = 300):
+        self.load = load
+        self.max_age = max_age
+
+        self._entries = []
+        self._loaded_at = None
+        self._reloading = False
+        self._loading = False
+        # Titles added while a load runs, merged into its result.
+        self._pending = []
+        self._lock = Lock()
+        self._load_lock = Lock()
+        self._counters = {"lookups": 0, "loads": 0}
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[str]:
+        """
+        Returns indexed titles starting with a prefix, in key order. The
+        first call loads the index.
+
+        Parameters:
+            prefix (str): The text typed so far.
+            limit (int): Maximum number of titles.
+
+        Returns:
+            list[str]: The matching titles, as first seen.
+        """
+        if self._loaded_at is None:
+            self._load()
+        elif self.max_age is not None:
+            with self._lock:
+                reload = (not self._reloading and time.monotonic()
+                          - self._loaded_at > self.max_age)
+                if reload:
+                    self._reloading = True
+            if reload:
+                Thread(target=self._load, daemon=True).start()
+
+        key = normalize_title(prefix)
+        if not key:
+            return []
+
+        with self._lock:
+            self._counters["lookups"] += 1
+            start = bisect_left(self._entries, (key,))
+            candidates = self._entries[start:start + limit]
+
+        titles = []
+        for entry_key, title in candidates:
+            if not entry_key.startswith(key):
+                break
+            titles.append(title)
+        return titles
+
+    def warm(self) -> None:
+        """
+        Loads the index now unless it is loaded already, so the first
+        lookup does not wait for it.
+        """
+        if self._loaded_at is None:
+            self._load()
+
+    def add(self, titles: Iterable[str]) -> None:
+        """
+        Indexes titles; titles already indexed under the same key are kept
+        as they are.
+
+        Parameter:
+            titles (Iterable[str]): The titles to add.
+        """
+        with self._lock:
+            for title in titles:
+                if self._loading:
+                    self._pending.append(title)
+                if self._loaded_at is not None:
+                    self._insert(self._entries, title)
+
+    def stats(self) -> dict:
+        """
+        Returns the index counters.
+
+        Returns:
+            dict: lookups, loads and the number of titles.
+        """
+        with self._lock:
+            return dict(self._counters, titles=len(self._entries))
+
+    def _insert(self, entries: list, title: str) -> None:
+        key = normalize_title(title)
+        if not key:
+            return
+
+        index = bisect_left(entries, (key,))
+        if index == len(entries) or entries[index][0] != key:
+            insort(entries, (key, title), lo=index, hi=index)
+
+    def _load(self) -> None:
+        with self._load_lock:
+            if self._loaded_at is not None and not self._reloading:
+                return
+
+            # Titles written before this point are read by `load`, those
+            # written after it are collected in `_pending`.
+            with self._lock:
+                self._loading = True
+            try:
+                by_key = {}
+                for title in self.load():
+                    key = normalize_title(title)
+                    if key:
+                        by_key.setdefault(key, title)
+                entries = sorted(by_key.items())
+
+                with self._lock:
+                    for title in self._pending:
+                        self._insert(entries, title)
+                    self._entries = entries
+                    self._loaded_at = time.monotonic()
+                    self._counters["loads"] += 1
+            finally:
+                # After a failed load the next one reads the titles anew.
+                with self._lock:
+                    self._loading = False
+                    self._reloading = False
+                    self._pending = []